@@ -0,0 +1,133 @@
+import pickle
+import sqlite3
+from threading import Lock
+
+
+class BackingStore:
+    """Protocol for the slow store that a read-through cache sits in front of.
+    get() returns None for missing keys, get_many() returns a dict
+    containing only the keys that were found.
+    """
+    def get(self, key):
+        """Returns value of key if key is in store, else None"""
+        raise NotImplementedError
+
+    def get_many(self, keys) -> dict:
+        """Returns {key: value} for all keys that are in store"""
+        raise NotImplementedError
+
+    def put(self, key, value):
+        """Upserts key:value into store"""
+        raise NotImplementedError
+
+    def put_many(self, items: dict):
+        """Upserts all key:value pairs of items into store"""
+        raise NotImplementedError
+
+
+class DictStore(BackingStore):
+    """Implements BackingStore on top of a plain (in-memory) dict"""
+    def __init__(self, data=None):
+        self.data = data if data is not None else {}
+
+    def get(self, key):
+        return self.data.get(key, None)
+
+    def get_many(self, keys) -> dict:
+        data = self.data
+        return {key: data[key] for key in keys if key in data}
+
+    def put(self, key, value):
+        self.data[key] = value
+
+    def put_many(self, items: dict):
+        self.data.update(items)
+
+
+class SqliteStore(BackingStore):
+    """Implements BackingStore on top of a single SQLite table.
+    Keys and values are pickled, so anything picklable can be stored.
+    Unlike DictStore, keys are matched by their pickled bytes, so keys that
+    compare equal but differ in type (e.g. 1, 1.0 and True) are separate
+    rows. Use keys of a single type to swap this in for a DictStore.
+    Bulk writes run as a single transaction, bulk reads as one query per
+    MAX_VARIABLES keys (SQLite's default limit on bound parameters).
+    The connection is shared across threads and guarded by a lock, so the
+    store can sit behind a ConcurrentLruCache.
+    """
+    MAX_VARIABLES = 999
+
+    def __init__(self, path=':memory:', table='store'):
+        self.table = table
+        self.lock = Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(f'CREATE TABLE IF NOT EXISTS {table} '
+                                f'(key BLOB PRIMARY KEY, value BLOB)')
+        self.connection.commit()
+
+    def get(self, key):
+        with self.lock:
+            row = self.connection.execute(
+                f'SELECT value FROM {self.table} WHERE key = ?',
+                (self._dump(key),)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def get_many(self, keys) -> dict:
+        dumped = [self._dump(key) for key in keys]
+        found = {}
+        for i in range(0, len(dumped), self.MAX_VARIABLES):
+            chunk = dumped[i:i + self.MAX_VARIABLES]
+            placeholders = ', '.join('?' for _ in chunk)
+            with self.lock:
+                rows = self.connection.execute(
+                    f'SELECT key, value FROM {self.table} '
+                    f'WHERE key IN ({placeholders})', chunk).fetchall()
+            found.update((pickle.loads(k), pickle.loads(v)) for k, v in rows)
+        return found
+
+    def put(self, key, value):
+        self.put_many({key: value})
+
+    def put_many(self, items: dict):
+        rows = [(self._dump(k), self._dump(v)) for k, v in items.items()]
+        with self.lock, self.connection:
+            self.connection.executemany(
+                f'INSERT OR REPLACE INTO {self.table} (key, value) '
+                f'VALUES (?, ?)', rows)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def _dump(self, obj) -> bytes:
+        # Protocol is pinned so that equal keys always pickle to equal bytes
+        return pickle.dumps(obj, protocol=4)
+
+
+if __name__ == '__main__':
+    test_items = {'a': 1, 'b': [2, '3'], ('c', 4): {'d': 5}}
+
+    for store in [DictStore(), SqliteStore()]:
+        # .get() and .get_many() should work if store is empty
+        assert store.get('a') is None
+        assert store.get_many(test_items.keys()) == {}
+
+        # .put() and .get() should work
+        store.put('a', 1)
+        assert store.get('a') == 1
+
+        # .put_many() and .get_many() should work, ignoring missing keys
+        store.put_many(test_items)
+        assert store.get_many(list(test_items.keys()) + ['x']) == test_items
+        for key, value in test_items.items():
+            assert store.get(key) == value
+
+        # subsequent puts should override previous puts
+        store.put('a', 2)
+        assert store.get('a') == 2
+
+        # .get_many() should work for batches of any size
+        store.put_many({i: -i for i in range(2500)})
+        assert store.get_many(range(-10, 2600)) == {i: -i
+                                                    for i in range(2500)}
+        print(f'{type(store).__name__} assertions successful')
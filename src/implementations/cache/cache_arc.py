@@ -0,0 +1,141 @@
+from collections import OrderedDict
+
+from src.implementations.cache.backing_store import BackingStore, DictStore
+from src.implementations.cache.cache_policy import CachePolicy, MISSING
+
+
+class ArcCache(CachePolicy):
+    """Implements
+    https://en.wikipedia.org/wiki/Adaptive_replacement_cache
+    t1 holds keys seen once recently, t2 keys seen at least twice.
+    b1/b2 are ghost lists remembering keys (not values) recently evicted
+    from t1/t2. Hits in the ghost lists adapt the target size p of t1,
+    balancing recency against frequency, which makes ARC scan-resistant.
+    All lists are ordered dicts (LRU first, MRU last): get() and set() are
+    O(1).
+    """
+    def __init__(self, size=10, store: BackingStore = None):
+        super().__init__(size=size, store=store)
+        self.p = 0  # Target size of t1
+        self.t1, self.t2 = OrderedDict(), OrderedDict()
+        self.b1, self.b2 = OrderedDict(), OrderedDict()
+
+    def __str__(self):
+        return (f'p: {self.p} | t1: {list(self.t1)} | t2: {list(self.t2)} | '
+                f'b1: {list(self.b1)} | b2: {list(self.b2)}')
+
+    @property
+    def load(self) -> int:
+        return len(self.t1) + len(self.t2)
+
+    def _cache_get(self, key):
+        # Any hit in t1 or t2 moves key to the MRU end of t2
+        if key in self.t1:
+            self.t2[key] = self.t1.pop(key)
+            return self.t2[key]
+        if key in self.t2:
+            self.t2.move_to_end(key)
+            return self.t2[key]
+        return MISSING
+
+    def _cache_put(self, key, value):
+        size = self.size
+        # Case 1: key is cached -> Update it like a hit
+        if key in self.t1 or key in self.t2:
+            self._cache_get(key)
+            self.t2[key] = value
+        # Case 2: key was recently evicted from t1 -> Favor recency
+        elif key in self.b1:
+            self.p = min(size, self.p + max(len(self.b2) // len(self.b1), 1))
+            self._replace(key)
+            del self.b1[key]
+            self.t2[key] = value
+        # Case 3: key was recently evicted from t2 -> Favor frequency
+        elif key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            self._replace(key)
+            del self.b2[key]
+            self.t2[key] = value
+        # Case 4: key is new
+        else:
+            l1 = len(self.t1) + len(self.b1)
+            total = l1 + len(self.t2) + len(self.b2)
+            if l1 >= size:
+                if len(self.t1) < size:
+                    self.b1.popitem(last=False)
+                    self._replace(key)
+                else:
+                    self.t1.popitem(last=False)
+            elif total >= size:
+                if total >= 2 * size:
+                    self.b2.popitem(last=False)
+                self._replace(key)
+            self.t1[key] = value
+
+    def _replace(self, key):
+        # Evicts the LRU item of t1 or t2 into the corresponding ghost list,
+        # depending on whether t1 exceeds its target size p
+        if self.load < self.size:
+            return
+        if self.t1 and (len(self.t1) > self.p or not self.t2
+                        or (key in self.b2 and len(self.t1) == self.p)):
+            evicted_key, _ = self.t1.popitem(last=False)
+            self.b1[evicted_key] = None
+        else:
+            evicted_key, _ = self.t2.popitem(last=False)
+            self.b2[evicted_key] = None
+
+
+if __name__ == '__main__':
+    store = DictStore({i: i * 10 for i in range(1000)})
+    ARC = ArcCache(size=4, store=store)
+
+    # .get_value() should read through into t1, second hit moves into t2
+    assert ARC.get_value(1) == 10
+    assert 1 in ARC.t1
+    assert ARC.get_value(1) == 10
+    assert 1 in ARC.t2 and 1 not in ARC.t1
+    assert ARC.get_value(-1) == -1
+
+    # A scan should not flush keys that were seen twice
+    for key in [2, 3]:
+        ARC.get_value(key)
+        ARC.get_value(key)
+    for key in range(100, 200):
+        ARC.get_value(key)
+        assert ARC.load <= ARC.size
+        assert len(ARC.t1) + len(ARC.b1) <= ARC.size
+        assert ARC.load + len(ARC.b1) + len(ARC.b2) <= 2 * ARC.size
+    assert {1, 2, 3} <= set(ARC.t2)
+    print(ARC)
+
+    # A hit in ghost list b1 should increase p
+    ghost = next(iter(ARC.b1))
+    p = ARC.p
+    ARC.get_value(ghost)
+    assert ARC.p > p and ghost in ARC.t2
+
+    # A hit in ghost list b2 should decrease p
+    for key in range(200, 210):
+        ARC.get_value(key)
+        ARC.get_value(key)
+    ghost = next(iter(ARC.b2))
+    p = ARC.p
+    ARC.get_value(ghost)
+    assert ARC.p < p or p == 0
+    assert ghost in ARC.t2 and ARC.load <= ARC.size
+
+    # .set_value() and .get_many() should work
+    ARC.set_value(1, 'one')
+    assert ARC.get_value(1) == 'one' and store.data[1] == 'one'
+    assert ARC.get_many([1, 500, 500, -1]) == ['one', 5000, 5000, -1]
+
+    # Cache invariants should hold under random access
+    from random import randint
+    for _ in range(10000):
+        ARC.get_value(randint(0, 50))
+        assert ARC.load <= ARC.size
+        assert 0 <= ARC.p <= ARC.size
+        assert ARC.load + len(ARC.b1) + len(ARC.b2) <= 2 * ARC.size
+        assert not set(ARC.t1) & set(ARC.t2)
+    print('Assertions successful')
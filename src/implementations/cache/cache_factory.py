@@ -0,0 +1,48 @@
+from src.implementations.cache.backing_store import BackingStore, DictStore
+from src.implementations.cache.cache_arc import ArcCache
+from src.implementations.cache.cache_lru import LruCache
+from src.implementations.cache.cache_slru import SegmentedLruCache
+from src.implementations.cache.cache_tinylfu import WTinyLfuCache
+
+CACHE_POLICIES = {
+    'lru': LruCache,
+    'slru': SegmentedLruCache,
+    'arc': ArcCache,
+    'w-tinylfu': WTinyLfuCache,
+}
+
+
+def make_cache(policy='lru', size=10, store: BackingStore = None):
+    """Returns a cache of the given replacement policy (one of
+    CACHE_POLICIES). All of them share the get_value/get_many/set_value/
+    set_many interface of LruCache.
+    """
+    if policy not in CACHE_POLICIES:
+        raise ValueError(f'Unknown cache policy "{policy}", '
+                         f'choose one of {list(CACHE_POLICIES)}')
+    return CACHE_POLICIES[policy](size=size, store=store)
+
+
+if __name__ == '__main__':
+    store = DictStore({i: i for i in range(100)})
+
+    # Every policy should work through the common interface
+    for policy in CACHE_POLICIES:
+        cache = make_cache(policy, size=10, store=store)
+        assert cache.get_value(1) == 1
+        assert cache.get_value(-1) == -1
+        assert cache.get_many([1, 2, 3]) == [1, 2, 3]
+        cache.set_value(200, 'x')
+        cache.set_many({201: 'y'})
+        assert cache.get_many([200, 201]) == ['x', 'y']
+        for i in range(100):
+            cache.get_value(i)
+        assert cache.load <= 10
+
+    # Unknown policies should raise
+    try:
+        make_cache('mru')
+        assert False
+    except ValueError:
+        pass
+    print('Assertions successful')
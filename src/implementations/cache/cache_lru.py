@@ -1,3 +1,11 @@
+import sys
+from time import monotonic, perf_counter
+
+from src.implementations.cache.backing_store import (
+    BackingStore, DictStore
+)
+from src.implementations.cache.cache_stats import CacheStats
+
 DATABASE = {
     'test1': 123,
     'test2': '456',
@@ -9,24 +17,69 @@ DATABASE = {
 
 
 class DoublyLinkedListNode:
-    def __init__(self, key, value, prev=None, next=None):
+    # __slots__ avoids a per-node __dict__, which dominates memory per item
+    __slots__ = ('key', 'value', 'prev', 'next', 'expires_at', 'weight')
+
+    def __init__(self, key, value, prev=None, next=None, expires_at=None,
+                 weight=0):
         self.key = key  # redundant?
         self.value = value
         self.prev = prev
         self.next = next
+        self.expires_at = expires_at  # None means the node never expires
+        self.weight = weight  # Only used by size-aware caches
 
 
 class LruCache:
     """Implements
     https://en.wikipedia.org/wiki/Cache_replacement_policies#Least_recently_used_(LRU)
-    Both get() and set() are O(1)
+    Both get() and set() are O(1).
+    Reads and writes go through store (any BackingStore, defaults to
+    DATABASE). get_many() fetches all cache misses in one bulk call.
+    Entries optionally expire after a time-to-live in seconds (ttl is the
+    default, set_value() accepts a per-entry ttl). Expired entries are purged
+    lazily on access and proactively by a sweep that checks SWEEP_STEPS
+    nodes per operation, i.e. it never walks the whole list at once.
+    Passing capacity makes the cache size-aware: it then also holds at most
+    capacity bytes, as measured by weigher(key, value) (defaults to the
+    shallow sys.getsizeof of key and value), evicting LRU items until a new
+    item fits. size=None removes the limit on the number of items.
+    With write_back=True, writes are write-behind instead of write-through:
+    they only mark keys dirty (repeated writes to a key coalesce) and are
+    flushed to store in one batch on flush(), when a dirty item gets
+    evicted, when flush_size keys are dirty, or when a write happens
+    flush_interval seconds after the last flush.
+    With stats=True, hits, misses, evictions and store load latencies are
+    counted in self.stats (a CacheStats), see get_stats(). When disabled,
+    instrumentation costs one attribute check per operation.
+    on_evict(key, value) is called for every evicted or expired item.
     """
-    def __init__(self, size=10):
-        self.size = size
+    SWEEP_STEPS = 2
+
+    def __init__(self, size=10, store: BackingStore = None, ttl=None,
+                 capacity=None, weigher=None,
+                 write_back=False, flush_size=None, flush_interval=None,
+                 stats=False, on_evict=None):
+        self.size = size if size is not None else float('inf')
         self.load = 0
+        self.capacity = capacity
+        self.weigher = weigher or _default_weigher
+        self.weight = 0  # Total weight of all cached items
+        self.store = store if store is not None else DictStore(DATABASE)
+        self.ttl = ttl
+        self.clock = monotonic
         self.cache_map = {}  # Hash map for O(1) lookup
         self.mru: DoublyLinkedListNode() = None  # End of the linked list
         self.lru: DoublyLinkedListNode() = None  # Start of the linked list
+        self.sweep_cursor: DoublyLinkedListNode() = None  # Next node to check
+        self.sweeping = ttl is not None  # Set once any entry can expire
+        self.write_back = write_back
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.dirty = {}  # key -> latest value not yet written to store
+        self.last_flush = self.clock()
+        self.stats = CacheStats() if stats else None
+        self.on_evict = on_evict
 
     def __str__(self):
         # Prints linked list representation
@@ -38,86 +91,248 @@ class LruCache:
         return string
 
     def get_value(self, key):
-        """Returns value at key if key is in cache or database, else -1.
+        """Returns value at key if key is in cache or store, else -1.
         Upserts cache during execution.
         Evicts LRU cache item if cache is full.
         (Read-through)
         """
-        cached_node = self.cache_map.get(key, None)
+        self._sweep()
+        cached_node = self._cache_lookup(key)
         # Case 1: Value is in cache -> Update cache
         if cached_node:
+            if self.stats is not None:
+                self.stats.hits += 1
             return self._cache_update(cached_node)
 
-        value_db = DATABASE.get(key, None)
+        if self.stats is not None:
+            self.stats.misses += 1
+        if key in self.dirty:
+            value_db = self.dirty[key]
+        elif self.stats is not None:
+            start = perf_counter()
+            value_db = self.store.get(key)
+            self.stats.record_load(perf_counter() - start)
+        else:
+            value_db = self.store.get(key)
         # Case 2: Value is neither in cache nor in db
-        if not value_db:
-            print(f'Key "{key}" is not in database')
+        if value_db is None:
             return -1
         # Case 3: Value is in db but not in cache --> Insert node into cache
         else:
             return self._cache_insert(key, value_db)
 
-    def set_value(self, key, value):
-        """Upserts key:value into database and upserts cache.
+    def get_many(self, keys) -> list:
+        """Returns a list with the value of each key (-1 if key is neither
+        in cache nor in store). Cache hits are served from the cache, all
+        misses are fetched from the store in a single bulk call.
+        (Batched read-through)
+        """
+        self._sweep()
+        keys = list(keys)
+        values = {}
+        misses = []
+        hits = 0
+        for key in keys:
+            cached_node = self._cache_lookup(key)
+            if cached_node:
+                hits += 1
+                values[key] = self._cache_update(cached_node)
+            elif key not in values:
+                values[key] = -1
+                misses.append(key)
+        if self.stats is not None:
+            self.stats.hits += hits
+            self.stats.misses += len(keys) - hits
+
+        if misses:
+            start = perf_counter() if self.stats is not None else None
+            found = self.store.get_many([key for key in misses
+                                         if key not in self.dirty])
+            if self.stats is not None:
+                self.stats.record_load(perf_counter() - start)
+            found.update((key, self.dirty[key]) for key in misses
+                         if key in self.dirty)
+            for key, value_db in found.items():
+                if value_db is not None:
+                    values[key] = self._cache_insert(key, value_db)
+        return [values[key] for key in keys]
+
+    def set_value(self, key, value, ttl=None):
+        """Upserts key:value into store and upserts cache.
+        The cached entry expires after ttl (or the default ttl) seconds.
         Evicts LRU item from cache if cache is full.
-        (Write-through)
+        (Write-through, or write-behind if write_back)
         """
+        self._sweep()
+        self._cache_upsert(key, value, ttl)
+        if self.write_back:
+            self.dirty[key] = value
+            self._flush_if_due()
+        else:
+            self.store.put(key, value)
+        return
+
+    def set_many(self, items: dict, ttl=None):
+        """Upserts all key:value pairs of items into store (in a single bulk
+        call) and into cache.
+        (Batched write-through, or write-behind if write_back)
+        """
+        self._sweep()
+        for key, value in items.items():
+            self._cache_upsert(key, value, ttl)
+        if self.write_back:
+            self.dirty.update(items)
+            self._flush_if_due()
+        else:
+            self.store.put_many(items)
+        return
+
+    def get_stats(self) -> dict:
+        """Returns the stats counters plus current load and weight"""
+        stats = self.stats.as_dict() if self.stats is not None else {}
+        stats.update({'load': self.load, 'weight': self.weight})
+        return stats
+
+    def flush(self):
+        """Writes all dirty key:value pairs to store in a single bulk call"""
+        if self.dirty:
+            dirty, self.dirty = self.dirty, {}
+            self.store.put_many(dirty)
+        self.last_flush = self.clock()
+
+    def _flush_if_due(self):
+        # Flushes if the size or interval threshold has been reached
+        if ((self.flush_size is not None
+             and len(self.dirty) >= self.flush_size)
+                or (self.flush_interval is not None
+                    and self.clock() - self.last_flush
+                    >= self.flush_interval)):
+            self.flush()
+
+    def _cache_lookup(self, key) -> DoublyLinkedListNode or None:
+        # Returns the cached node of key, lazily purging it if expired
         cached_node = self.cache_map.get(key, None)
+        if (cached_node and cached_node.expires_at is not None
+                and cached_node.expires_at <= self.clock()):
+            self._cache_evict(cached_node, expired=True)
+            return None
+        return cached_node
+
+    def _cache_upsert(self, key, value, ttl=None):
+        # Updates value, expiry and position of key if cached, else inserts it
+        cached_node = self._cache_lookup(key)
         # Case 1: Value is in cache -> Update cache
-        if cached_node:
+        if cached_node and self.capacity is None:
+            cached_node.value = value
+            cached_node.expires_at = self._expires_at(ttl)
             self._cache_update(cached_node)
-            DATABASE[key] = value
-        # Case 2: Value is not yet in cache -> Insert node into cache
+        # Case 2: Value is in cache, but its weight may change -> Reinsert
+        elif cached_node:
+            self._cache_remove(cached_node)
+            self._cache_insert(key, value, ttl)
+        # Case 3: Value is not yet in cache -> Insert node into cache
         else:
-            self._cache_insert(key, value)
-            DATABASE[key] = value
-        return
+            self._cache_insert(key, value, ttl)
 
-    def _cache_insert(self, key, value):
-        # Inserts key:value into cache
-        # 1: Special case for first node in empty cache
-        if self.load == 0:
-            new_cache_node = DoublyLinkedListNode(key, value)
-            self.lru = new_cache_node
-            self.mru = new_cache_node
-            self.cache_map[key] = new_cache_node
-            self.load += 1
-            return value
-
-        # 2: Evict lru if necessary
-        if self.load == self.size:
-            del self.cache_map[self.lru.key]
-            new_lru = self.lru.next
-            self.lru.next = None
-            self.lru = new_lru
-            new_lru.prev = None
-            self.load -= 1
-
-        # 3: Insert new node at the head of the linked list & in hash map
-        new_cache_node = DoublyLinkedListNode(key, value,
-                                              prev=self.mru, next=None)
-        if self.mru:
-            self.mru.next = new_cache_node
-            new_cache_node.prev = self.mru
-        self.mru = new_cache_node
+    def _cache_insert(self, key, value, ttl=None):
+        # Inserts key:value into cache, evicting lru items if necessary.
+        # Items heavier than the whole capacity are not cached at all.
+        weight = 0
+        if self.capacity is not None:
+            weight = self.weigher(key, value)
+            if weight > self.capacity:
+                return value
+            while self.weight + weight > self.capacity:
+                self._cache_evict(self.lru)
+        if self.load >= self.size:
+            self._cache_evict(self.lru)
+        new_cache_node = DoublyLinkedListNode(
+            key, value, expires_at=self._expires_at(ttl), weight=weight)
+        self.weight += weight
+        self._cache_append(new_cache_node)
         self.cache_map[key] = new_cache_node
         self.load += 1
-
         return value
 
     def _cache_update(self, cached_node: DoublyLinkedListNode):
         # updates position of cached_node in linked list
+        if cached_node is not self.mru:
+            self._cache_unlink(cached_node)
+            self._cache_append(cached_node)
+        return cached_node.value
+
+    def _cache_evict(self, cached_node: DoublyLinkedListNode, expired=False):
+        # Removes cached_node to make room or because it expired, first
+        # flushing pending writes if it is dirty
+        if cached_node.key in self.dirty:
+            self.flush()
+        self._cache_remove(cached_node)
+        if self.stats is not None:
+            if expired:
+                self.stats.expirations += 1
+            else:
+                self.stats.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(cached_node.key, cached_node.value)
+
+    def _cache_remove(self, cached_node: DoublyLinkedListNode):
+        # Removes cached_node from linked list and hash map
+        self._cache_unlink(cached_node)
+        del self.cache_map[cached_node.key]
+        self.load -= 1
+        self.weight -= cached_node.weight
+
+    def _cache_append(self, cached_node: DoublyLinkedListNode):
+        # Links cached_node in at the mru end of the linked list
+        cached_node.prev = self.mru
+        cached_node.next = None
+        if self.mru:
+            self.mru.next = cached_node
+        else:
+            self.lru = cached_node
+        self.mru = cached_node
+
+    def _cache_unlink(self, cached_node: DoublyLinkedListNode):
+        # Unlinks cached_node from the linked list, fixing lru/mru pointers
+        # and moving the sweep cursor past it
+        if cached_node is self.sweep_cursor:
+            self.sweep_cursor = cached_node.next
         if cached_node.prev:
             cached_node.prev.next = cached_node.next
+        else:
+            self.lru = cached_node.next
         if cached_node.next:
             cached_node.next.prev = cached_node.prev
-            if self.lru == cached_node:
-                self.lru = cached_node.next
-        cached_node.next = None
-        cached_node.prev = self.mru
-        self.mru.next = cached_node
-        self.mru = cached_node
-        return cached_node.value
+        else:
+            self.mru = cached_node.prev
+        cached_node.prev = cached_node.next = None
+
+    def _expires_at(self, ttl=None) -> float or None:
+        # Returns the expiry timestamp for ttl, falling back to default ttl
+        ttl = ttl if ttl is not None else self.ttl
+        if ttl is None:
+            return None
+        self.sweeping = True
+        return self.clock() + ttl
+
+    def _sweep(self):
+        # Checks the next SWEEP_STEPS nodes (wrapping around from mru to lru)
+        # and purges the expired ones, amortizing expiry over operations
+        if not self.sweeping:
+            return
+        now = self.clock()
+        for _ in range(self.SWEEP_STEPS):
+            node = self.sweep_cursor or self.lru
+            if node is None:
+                return
+            self.sweep_cursor = node.next
+            if node.expires_at is not None and node.expires_at <= now:
+                self._cache_evict(node, expired=True)
+
+
+def _default_weigher(key, value) -> int:
+    # Shallow size in bytes of key and value
+    return sys.getsizeof(key) + sys.getsizeof(value)
 
 
 if __name__ == '__main__':
@@ -181,3 +396,210 @@ if __name__ == '__main__':
         print(LRU)
         print('*************************')
         print(DATABASE)
+
+    # Getting the MRU item again should not break the linked list
+    LRU.get_value('test12')
+    LRU.get_value('test12')
+    assert LRU.mru.key == 'test12'
+    assert LRU.lru.prev is None and LRU.mru.next is None
+    assert len(str(LRU).split(' <-> ')) - 1 == size
+
+    # Setting a cached key should update its cached value
+    LRU.set_value('test12', 'updated')
+    assert LRU.get_value('test12') == 'updated'
+
+    # .get_many() should serve hits from cache and misses in one bulk call
+    class CountingStore(DictStore):
+        def __init__(self, data):
+            super().__init__(data)
+            self.get_calls = self.get_many_calls = 0
+
+        def get(self, key):
+            self.get_calls += 1
+            return super().get(key)
+
+        def get_many(self, keys):
+            self.get_many_calls += 1
+            return super().get_many(keys)
+
+    store = CountingStore({f'key{i}': i for i in range(10)})
+    LRU2 = LruCache(size=5, store=store)
+    LRU2.get_value('key0')
+    keys = ['key0', 'key1', 'key2', 'key1', 'missing']
+    assert LRU2.get_many(keys) == [0, 1, 2, 1, -1]
+    assert store.get_calls == 1 and store.get_many_calls == 1
+    assert LRU2.mru.key in keys
+    assert LRU2.load == 3
+
+    # .set_many() should write through to the store and upsert the cache
+    LRU2.set_many({'key1': 'one', 'key9': 'nine'})
+    assert store.data['key1'] == 'one' and store.data['key9'] == 'nine'
+    assert LRU2.get_many(['key1', 'key9']) == ['one', 'nine']
+    assert store.get_many_calls == 1
+
+    # Eviction should work with a cache of size 1
+    LRU3 = LruCache(size=1, store=store)
+    for i in range(3):
+        assert LRU3.get_value(f'key{i}') == store.data[f'key{i}']
+        assert LRU3.lru is LRU3.mru and LRU3.load == 1
+
+    # Expired entries should be purged lazily on access
+    now = [0]
+    LRU4 = LruCache(size=3, store=DictStore({'a': 1, 'b': 2}), ttl=10)
+    LRU4.clock = lambda: now[0]
+    assert LRU4.get_value('a') == 1
+    LRU4.set_value('c', 3, ttl=100)  # Per-entry ttl overrides default ttl
+    LRU4.store.data['a'] = 'reloaded'
+    now[0] = 10
+    assert LRU4.cache_map['a'].expires_at == 10
+    assert LRU4._cache_lookup('a') is None
+    assert 'a' not in LRU4.cache_map and LRU4.load == 1
+    assert LRU4.get_value('a') == 'reloaded'  # Read through again
+    assert LRU4.cache_map['a'].expires_at == 20
+    assert LRU4.get_value('c') == 3
+
+    # Setting should refresh the expiry of a cached entry
+    now[0] = 15
+    LRU4.set_value('a', 'refreshed')
+    assert LRU4.cache_map['a'].expires_at == 25
+
+    # The sweep should purge expired entries without them being accessed
+    LRU5 = LruCache(size=100, store=DictStore({}), ttl=5)
+    LRU5.clock = lambda: now[0]
+    for i in range(50):
+        LRU5.set_value(i, i, ttl=None if i % 2 else 1000)
+    now[0] = 100
+    LRU5.set_value('x', 'x')
+    assert LRU5.load == 50  # At most SWEEP_STEPS nodes are checked per op
+    for i in range(50):
+        LRU5.set_value('x', 'x')
+    assert LRU5.load == 26  # 25 long-lived entries + 'x'
+    assert all(k == 'x' or k % 2 == 0 for k in LRU5.cache_map)
+    node, count = LRU5.lru, 0
+    while node is not None:
+        node, count = node.next, count + 1
+    assert count == LRU5.load
+
+    # Entries without ttl should never expire
+    LRU6 = LruCache(size=2, store=DictStore({'a': 1}))
+    LRU6.clock = lambda: now[0]
+    LRU6.get_value('a')
+    now[0] = 10 ** 9
+    assert LRU6._cache_lookup('a') is not None and LRU6.sweeping is False
+
+    # Size-aware caches should evict LRU items until a new item fits
+    LRU7 = LruCache(size=None, store=DictStore({}), capacity=100,
+                    weigher=lambda key, value: len(value))
+    LRU7.set_value('a', 'x' * 40)
+    LRU7.set_value('b', 'x' * 40)
+    assert LRU7.weight == 80 and LRU7.load == 2
+    LRU7.set_value('c', 'x' * 30)
+    assert 'a' not in LRU7.cache_map
+    assert LRU7.weight == 70 and LRU7.load == 2
+
+    # Updating an item should update its weight, evicting if needed
+    LRU7.set_value('b', 'x' * 80)
+    assert 'c' not in LRU7.cache_map
+    assert LRU7.weight == 80 and LRU7.mru.key == 'b'
+    LRU7.set_value('b', 'x')
+    assert LRU7.weight == 1
+
+    # Items heavier than the capacity should not be cached
+    LRU7.set_value('huge', 'x' * 101)
+    assert 'huge' not in LRU7.cache_map and LRU7.weight == 1
+    assert LRU7.store.data['huge'] == 'x' * 101
+    assert LRU7.get_value('huge') == 'x' * 101
+
+    # The default weigher should use sys.getsizeof
+    LRU8 = LruCache(size=None, capacity=10 ** 6)
+    LRU8.get_value('test3')
+    assert LRU8.weight == sys.getsizeof('test3') + sys.getsizeof([7, '8', 9])
+    LRU8.get_value('test1')
+    LRU8._cache_remove(LRU8.cache_map['test3'])
+    assert LRU8.weight == sys.getsizeof('test1') + sys.getsizeof(123)
+
+    # Write-behind should coalesce writes and flush them in batches
+    class RecordingStore(DictStore):
+        def __init__(self, data):
+            super().__init__(data)
+            self.batches = []
+
+        def put(self, key, value):
+            self.batches.append({key: value})
+            super().put(key, value)
+
+        def put_many(self, items):
+            self.batches.append(dict(items))
+            super().put_many(items)
+
+    store = RecordingStore({'a': 0})
+    LRU9 = LruCache(size=2, store=store, write_back=True)
+    for i in range(5):
+        LRU9.set_value('a', i)
+    LRU9.set_value('b', 'b')
+    assert store.batches == [] and store.data == {'a': 0}
+    assert LRU9.get_value('a') == 4
+    LRU9.flush()
+    assert store.batches == [{'a': 4, 'b': 'b'}]
+    assert LRU9.dirty == {}
+
+    # Evicting a dirty item should flush all dirty items in one batch
+    LRU9.set_value('a', 5)
+    LRU9.set_value('b', 6)
+    LRU9.set_many({'c': 7})
+    assert store.batches[1] == {'a': 5, 'b': 6}
+    assert 'a' not in LRU9.cache_map and LRU9.dirty == {'c': 7}
+    assert LRU9.get_value('a') == 5
+
+    # Reads of dirty items should never see stale store values
+    LRU10 = LruCache(size=10, store=store, write_back=True, capacity=10,
+                     weigher=lambda key, value: len(str(value)))
+    LRU10.set_value('a', 'x' * 20)  # Too heavy to be cached
+    assert 'a' not in LRU10.cache_map
+    assert LRU10.get_value('a') == 'x' * 20
+    assert LRU10.get_many(['a', 'b']) == ['x' * 20, 6]
+
+    # Flushing should happen on the size threshold
+    store = RecordingStore({})
+    LRU11 = LruCache(size=10, store=store, write_back=True, flush_size=3)
+    for i in range(7):
+        LRU11.set_value(i % 4, i)
+    assert store.batches == [{0: 0, 1: 1, 2: 2}, {3: 3, 0: 4, 1: 5}]
+
+    # Flushing should happen on the interval threshold
+    now = [0]
+    LRU12 = LruCache(size=10, store=store, write_back=True,
+                     flush_interval=5)
+    LRU12.clock = lambda: now[0]
+    LRU12.last_flush = 0
+    LRU12.set_value('x', 1)
+    assert LRU12.dirty == {'x': 1}
+    now[0] = 5
+    LRU12.set_value('y', 2)
+    assert store.batches[-1] == {'x': 1, 'y': 2} and LRU12.dirty == {}
+
+    # Stats should count hits, misses, evictions, expirations and loads
+    evicted = []
+    LRU13 = LruCache(size=2, store=DictStore({i: i for i in range(10)}),
+                     ttl=10, stats=True,
+                     on_evict=lambda key, value: evicted.append(key))
+    LRU13.clock = lambda: now[0]
+    now[0] = 0
+    LRU13.get_value(0)
+    LRU13.get_value(0)
+    LRU13.get_value(1)
+    LRU13.get_value(2)  # Evicts 0
+    LRU13.get_value(-1)
+    assert LRU13.get_many([1, 2, 3, 3]) == [1, 2, 3, 3]  # Evicts 1
+    assert evicted == [0, 1]
+    now[0] = 10
+    assert LRU13.get_value(3) == 3  # Expired, reloaded
+    stats = LRU13.get_stats()
+    assert stats['hits'] == 3 and stats['misses'] == 7
+    assert stats['evictions'] == 2 and stats['expirations'] >= 1
+    assert stats['load'] == LRU13.load
+    assert sum(stats['load_latency_us'].values()) == 6
+    assert 3 in evicted
+
+    # Stats should be off by default
+    assert LRU.stats is None and set(LRU.get_stats()) == {'load', 'weight'}
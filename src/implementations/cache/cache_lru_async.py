@@ -0,0 +1,183 @@
+import asyncio
+
+from src.implementations.cache.backing_store import DictStore
+from src.implementations.cache.cache_lru import LruCache
+
+
+class AsyncLruCache:
+    """LRU cache for asyncio with a coroutine loader. Wraps an in-memory
+    LruCache (self.cache), reusing its doubly-linked-list/hash-map core
+    (get() and set() are O(1) on cache hits) but none of its store I/O:
+    the wrapped cache's store is never called, all reads go through
+    loader and all writes through writer.
+    Concurrent misses for the same key are coalesced: they all await one
+    in-flight load, so a cold key costs a single loader call.
+    loader(key) must return the value of key, or None if key does not exist.
+    The optional writer(key, value) coroutine makes set_value() and
+    set_many() write-through.
+    """
+    def __init__(self, loader, size=10, writer=None, ttl=None):
+        self.cache = LruCache(size=size, store=DictStore(), ttl=ttl)
+        self.loader = loader
+        self.writer = writer
+        self.in_flight = {}  # key -> task of the pending load of key
+
+    def __str__(self):
+        return str(self.cache)
+
+    @property
+    def load(self) -> int:
+        return self.cache.load
+
+    async def get_value(self, key):
+        """Returns value at key if key is in cache or loader, else -1.
+        (Read-through with request coalescing)
+        """
+        cache = self.cache
+        cache._sweep()
+        cached_node = cache._cache_lookup(key)
+        # Case 1: Value is in cache -> Update cache
+        if cached_node:
+            return cache._cache_update(cached_node)
+
+        # Case 2: Value is not in cache -> Join or start the load of key.
+        # Shielding keeps the shared load alive if one waiter is cancelled.
+        load = self.in_flight.get(key, None)
+        if load is None:
+            load = asyncio.ensure_future(self._load(key))
+            self.in_flight[key] = load
+        return await asyncio.shield(load)
+
+    async def get_many(self, keys) -> list:
+        """Returns a list with the value of each key (-1 if missing),
+        loading all misses concurrently
+        """
+        return list(await asyncio.gather(*[self.get_value(key)
+                                           for key in keys]))
+
+    async def set_value(self, key, value, ttl=None):
+        """Upserts key:value into cache and, if there is a writer, awaits
+        writing it through
+        """
+        self.cache._sweep()
+        self.cache._cache_upsert(key, value, ttl)
+        if self.writer is not None:
+            await self.writer(key, value)
+
+    async def set_many(self, items: dict, ttl=None):
+        """Upserts all key:value pairs of items into cache and, if there is
+        a writer, awaits writing them through concurrently
+        """
+        self.cache._sweep()
+        for key, value in items.items():
+            self.cache._cache_upsert(key, value, ttl)
+        if self.writer is not None:
+            await asyncio.gather(*[self.writer(key, value)
+                                   for key, value in items.items()])
+
+    async def _load(self, key):
+        # Awaits loader and inserts its result into cache
+        try:
+            value = await self.loader(key)
+        finally:
+            del self.in_flight[key]
+        cached_node = self.cache._cache_lookup(key)
+        # A set_value() that ran while loading wins over the loaded value
+        if cached_node:
+            return self.cache._cache_update(cached_node)
+        if value is None:
+            return -1
+        return self.cache._cache_insert(key, value)
+
+
+if __name__ == '__main__':
+    from src.implementations.cache.cache_lru import DATABASE
+
+    database = {f'key{i}': i for i in range(10)}
+    loader_calls = []
+
+    async def loader(key):
+        loader_calls.append(key)
+        await asyncio.sleep(0.01)
+        return database.get(key, None)
+
+    async def failing_loader(key):
+        await asyncio.sleep(0.01)
+        raise KeyError(key)
+
+    async def writer(key, value):
+        database[key] = value
+
+    async def test():
+        ALRU = AsyncLruCache(loader, size=3, writer=writer)
+
+        # Concurrent misses for the same key should share one loader call
+        values = await asyncio.gather(*[ALRU.get_value('key1')
+                                        for _ in range(100)])
+        assert values == [1] * 100
+        assert loader_calls == ['key1']
+        assert ALRU.in_flight == {}
+
+        # Hits should not call the loader
+        assert await ALRU.get_value('key1') == 1
+        assert loader_calls == ['key1']
+
+        # Missing keys should return -1 and not be cached
+        assert await ALRU.get_value('missing') == -1
+        assert 'missing' not in ALRU.cache.cache_map
+
+        # .get_many() should load distinct misses once each, concurrently
+        assert await ALRU.get_many(['key2', 'key3', 'key2']) == [2, 3, 2]
+        assert loader_calls.count('key2') == 1
+        assert ALRU.load == 3
+
+        # Loading into a full cache should evict the LRU item
+        assert await ALRU.get_value('key4') == 4
+        assert ALRU.load == 3
+        assert 'key1' not in ALRU.cache.cache_map
+
+        # .set_value() should write through and update the cache
+        await ALRU.set_value('key2', 'two')
+        assert database['key2'] == 'two'
+        assert await ALRU.get_value('key2') == 'two'
+
+        # .set_many() should write through the writer, never to DATABASE
+        await ALRU.set_many({'key8': 8, 'zzz': 'z'})
+        assert database['key8'] == 8 and database['zzz'] == 'z'
+        assert 'zzz' not in DATABASE
+        assert await ALRU.get_many(['key8', 'zzz']) == [8, 'z']
+        assert ALRU.cache.store.data == {}  # Wrapped store is never used
+        assert not isinstance(ALRU, LruCache)
+
+        # A set_value() during a pending load should win
+        pending = asyncio.ensure_future(ALRU.get_value('key5'))
+        await asyncio.sleep(0)
+        await ALRU.set_value('key5', 'five')
+        assert await pending == 'five'
+
+        # Loader errors should propagate to all waiters and not be cached
+        ALRU2 = AsyncLruCache(failing_loader)
+        results = await asyncio.gather(*[ALRU2.get_value('key1')
+                                         for _ in range(3)],
+                                       return_exceptions=True)
+        assert all(isinstance(r, KeyError) for r in results)
+        assert ALRU2.in_flight == {} and ALRU2.load == 0
+
+        # Cancelling one waiter should not cancel the shared load
+        waiters = [asyncio.ensure_future(ALRU.get_value('key6'))
+                   for _ in range(2)]
+        await asyncio.sleep(0)
+        waiters[0].cancel()
+        assert await waiters[1] == 6
+
+        # Expired entries should be loaded again
+        ALRU3 = AsyncLruCache(loader, ttl=10)
+        now = [0]
+        ALRU3.cache.clock = lambda: now[0]
+        assert await ALRU3.get_value('key7') == 7
+        now[0] = 10
+        database['key7'] = 'seven'
+        assert await ALRU3.get_value('key7') == 'seven'
+        print('Assertions successful')
+
+    asyncio.run(test())
@@ -0,0 +1,202 @@
+from array import array
+
+from src.implementations.cache.backing_store import BackingStore, DictStore
+
+NIL = -1  # Null pointer for slot indices
+
+
+class CompactLruCache:
+    """Memory-compact LRU cache with the same API as LruCache.
+    Instead of one linked list node object per item, the doubly-linked
+    list lives in preallocated parallel arrays: keys[i], values[i] and the
+    prev[i]/next[i] slot indices (C ints). Free slots are chained through
+    next[] as a free-list, so evicted slots are reused and the only
+    per-item Python objects are the key and value themselves.
+    Both get() and set() are O(1). Supports neither TTLs nor weights.
+    """
+    def __init__(self, size=10, store: BackingStore = None):
+        if size < 1:
+            raise ValueError('Size must be at least 1')
+        self.size = size
+        self.load = 0
+        self.store = store if store is not None else DictStore()
+        self.cache_map = {}  # key -> slot index
+        self.keys = [None] * size
+        self.values = [None] * size
+        self.prev = array('i', [NIL]) * size
+        self.next = array('i', range(1, size + 1))  # Free-list links
+        self.next[size - 1] = NIL
+        self.free = 0  # Head of the free-list
+        self.mru = NIL  # End of the linked list
+        self.lru = NIL  # Start of the linked list
+
+    def __str__(self):
+        # Prints linked list representation
+        string = '<-> '
+        slot = self.lru
+        while slot != NIL:
+            string += f'{self.keys[slot]} <-> '
+            slot = self.next[slot]
+        return string
+
+    def get_value(self, key):
+        """Returns value at key if key is in cache or store, else -1.
+        (Read-through)
+        """
+        slot = self.cache_map.get(key, NIL)
+        if slot != NIL:
+            self._cache_update(slot)
+            return self.values[slot]
+        value_db = self.store.get(key)
+        if value_db is None:
+            return -1
+        return self._cache_insert(key, value_db)
+
+    def get_many(self, keys) -> list:
+        """Returns a list with the value of each key (-1 if key is neither
+        in cache nor in store), fetching all misses in one bulk call.
+        (Batched read-through)
+        """
+        values = {}
+        misses = []
+        for key in keys:
+            slot = self.cache_map.get(key, NIL)
+            if slot != NIL:
+                self._cache_update(slot)
+                values[key] = self.values[slot]
+            elif key not in values:
+                values[key] = -1
+                misses.append(key)
+        if misses:
+            for key, value_db in self.store.get_many(misses).items():
+                if value_db is not None:
+                    values[key] = self._cache_insert(key, value_db)
+        return [values[key] for key in keys]
+
+    def set_value(self, key, value):
+        """Upserts key:value into store and cache.
+        (Write-through)
+        """
+        self._cache_upsert(key, value)
+        self.store.put(key, value)
+
+    def set_many(self, items: dict):
+        """Upserts all key:value pairs into store (in a single bulk call)
+        and into cache.
+        (Batched write-through)
+        """
+        for key, value in items.items():
+            self._cache_upsert(key, value)
+        self.store.put_many(items)
+
+    def _cache_upsert(self, key, value):
+        # Updates value and position of key if cached, else inserts it
+        slot = self.cache_map.get(key, NIL)
+        if slot != NIL:
+            self.values[slot] = value
+            self._cache_update(slot)
+        else:
+            self._cache_insert(key, value)
+
+    def _cache_insert(self, key, value):
+        # Inserts key:value into a free slot, evicting lru if there is none
+        if self.free == NIL:
+            self._cache_remove(self.lru)
+        slot = self.free
+        self.free = self.next[slot]
+        self.keys[slot], self.values[slot] = key, value
+        self._cache_append(slot)
+        self.cache_map[key] = slot
+        self.load += 1
+        return value
+
+    def _cache_update(self, slot: int):
+        # Moves slot to the mru end of the linked list
+        if slot != self.mru:
+            self._cache_unlink(slot)
+            self._cache_append(slot)
+
+    def _cache_remove(self, slot: int):
+        # Removes slot from linked list and hash map, pushing it onto the
+        # free-list
+        self._cache_unlink(slot)
+        del self.cache_map[self.keys[slot]]
+        self.keys[slot] = self.values[slot] = None
+        self.next[slot] = self.free
+        self.free = slot
+        self.load -= 1
+
+    def _cache_append(self, slot: int):
+        # Links slot in at the mru end of the linked list
+        self.prev[slot] = self.mru
+        self.next[slot] = NIL
+        if self.mru != NIL:
+            self.next[self.mru] = slot
+        else:
+            self.lru = slot
+        self.mru = slot
+
+    def _cache_unlink(self, slot: int):
+        # Unlinks slot from the linked list, fixing lru/mru pointers
+        prev, next = self.prev[slot], self.next[slot]
+        if prev != NIL:
+            self.next[prev] = next
+        else:
+            self.lru = next
+        if next != NIL:
+            self.prev[next] = prev
+        else:
+            self.mru = prev
+
+
+if __name__ == '__main__':
+    from random import randint
+
+    from src.implementations.cache.cache_lru import LruCache
+
+    store = DictStore({i: i * 10 for i in range(100)})
+    CLRU = CompactLruCache(size=4, store=store)
+
+    # .get_value() should work while cache is not full yet and when full
+    for key in range(8):
+        assert CLRU.get_value(key) == key * 10
+        assert CLRU.keys[CLRU.mru] == key
+        assert CLRU.load == min(key + 1, 4)
+    assert set(CLRU.cache_map) == {4, 5, 6, 7}
+    assert CLRU.get_value(-1) == -1
+    print(CLRU)
+
+    # Evicted slots should be reused instead of growing the arrays
+    assert len(CLRU.keys) == len(CLRU.next) == 4
+    assert CLRU.free == NIL
+
+    # .set_value() and .get_many() should work
+    CLRU.set_value(5, 'five')
+    assert CLRU.get_value(5) == 'five' and store.data[5] == 'five'
+    assert CLRU.get_many([5, 50, 50, -1]) == ['five', 500, 500, -1]
+
+    # Caches without slots should be rejected
+    try:
+        CompactLruCache(size=0)
+        assert False
+    except ValueError:
+        pass
+
+    # A cache of size 1 should evict on every miss
+    CLRU3 = CompactLruCache(size=1, store=store)
+    for key in range(3):
+        assert CLRU3.get_value(key) == key * 10
+        assert CLRU3.lru == CLRU3.mru and CLRU3.load == 1
+
+    # Behavior should match LruCache under random access
+    LRU = LruCache(size=16, store=store)
+    CLRU2 = CompactLruCache(size=16, store=store)
+    for _ in range(10000):
+        key = randint(0, 40)
+        if randint(0, 3):
+            assert LRU.get_value(key) == CLRU2.get_value(key)
+        else:
+            LRU.set_value(key, key)
+            CLRU2.set_value(key, key)
+        assert str(LRU) == str(CLRU2)
+    print('Assertions successful')
@@ -0,0 +1,167 @@
+from threading import Lock
+
+from src.implementations.cache.backing_store import (
+    BackingStore, DictStore, SqliteStore
+)
+from src.implementations.cache.cache_lru import LruCache
+
+
+class ConcurrentLruCache:
+    """Thread-safe LRU cache using lock striping: keys are sharded by hash
+    across independent LruCache segments, each guarded by its own lock,
+    so that operations on different shards do not contend.
+    Both get() and set() remain O(1). Recency (and thus eviction) is
+    tracked per shard, i.e. this approximates a global LRU.
+    shards=1 degrades to a single global lock. The size is spread over the
+    shards, so shards must not exceed size.
+    All shards share store, which must be thread-safe (DictStore and
+    SqliteStore are).
+    Each shard counts its own hits and misses (see stats()).
+    """
+    def __init__(self, size=10, shards=8, store: BackingStore = None,
+                 ttl=None):
+        if not 1 <= shards <= size:
+            raise ValueError('Shards must be between 1 and size')
+        self.size = size
+        self.store = store if store is not None else DictStore()
+        # The first size % shards shards hold one extra item
+        self.shards = [LruCache(size=size // shards + (i < size % shards),
+                                store=self.store, ttl=ttl, stats=True)
+                       for i in range(shards)]
+        self.locks = [Lock() for _ in range(shards)]
+
+    def __str__(self):
+        return '\n'.join(f'{i}: {shard}'
+                         for i, shard in enumerate(self.shards))
+
+    def get_value(self, key):
+        """Returns value at key if key is in cache or store, else -1.
+        (Read-through)
+        """
+        i = self._shard_index(key)
+        with self.locks[i]:
+            return self.shards[i].get_value(key)
+
+    def get_many(self, keys) -> list:
+        """Returns a list with the value of each key (-1 if missing).
+        Takes each shard lock once and fetches the misses of each shard
+        in one bulk call.
+        """
+        keys = list(keys)
+        keys_per_shard = {}
+        for key in keys:
+            keys_per_shard.setdefault(self._shard_index(key), []).append(key)
+
+        values = {}
+        for i, shard_keys in keys_per_shard.items():
+            with self.locks[i]:
+                values.update(zip(shard_keys,
+                                  self.shards[i].get_many(shard_keys)))
+        return [values[key] for key in keys]
+
+    def set_value(self, key, value, ttl=None):
+        """Upserts key:value into store and cache.
+        (Write-through)
+        """
+        i = self._shard_index(key)
+        with self.locks[i]:
+            self.shards[i].set_value(key, value, ttl)
+
+    def load(self) -> int:
+        """Returns the number of cached items across all shards"""
+        return sum(shard.load for shard in self.shards)
+
+    def stats(self) -> list:
+        """Returns a list of stats dicts (see LruCache.get_stats()),
+        one per shard
+        """
+        stats = []
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                stats.append(shard.get_stats())
+        return stats
+
+    def _shard_index(self, key) -> int:
+        # Hashing key and using modulo operator to wrap it into the shards
+        return hash(key) % len(self.shards)
+
+
+if __name__ == '__main__':
+    from concurrent.futures import ThreadPoolExecutor
+
+    store = DictStore({i: i * 10 for i in range(1000)})
+    CLRU = ConcurrentLruCache(size=64, shards=4, store=store)
+
+    # .get_value() should work, counting misses and hits per shard
+    assert CLRU.get_value(1) == 10
+    assert CLRU.get_value(1) == 10
+    assert CLRU.get_value(-1) == -1
+    shard_stats = CLRU.stats()
+    assert sum(s['hits'] for s in shard_stats) == 1
+    assert sum(s['misses'] for s in shard_stats) == 2
+    assert shard_stats[CLRU._shard_index(1)]['hits'] == 1
+
+    # .set_value() should write through
+    CLRU.set_value(1, 'one')
+    assert CLRU.get_value(1) == 'one'
+    assert store.data[1] == 'one'
+
+    # .get_many() should work across shards
+    assert CLRU.get_many([2, 3, 2, 5000]) == [20, 30, 20, -1]
+
+    # Capacity should be respected per shard
+    for i in range(1000):
+        CLRU.get_value(i)
+    assert all(shard.load <= shard.size for shard in CLRU.shards)
+    assert CLRU.load() <= 64
+
+    # Concurrent access should neither raise nor corrupt the linked lists
+    def worker(offset):
+        for i in range(2000):
+            key = (i * 7 + offset) % 300
+            assert CLRU.get_value(key) in {key * 10, 'one'}
+            if i % 10 == 0:
+                CLRU.set_value(key, key * 10)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(worker, range(8)))
+    for shard in CLRU.shards:
+        assert shard.load == len(shard.cache_map) <= shard.size
+        node, count = shard.lru, 0
+        while node is not None:
+            node, count = node.next, count + 1
+        assert count == shard.load
+    total = sum(s['hits'] + s['misses'] for s in CLRU.stats())
+    assert total == 3 + 4 + 1000 + 8 * 2000 + 1
+
+    # Shard sizes should add up to exactly size
+    for size, shards in [(4, 4), (10, 4), (64, 8), (65, 8)]:
+        shard_sizes = [shard.size for shard
+                       in ConcurrentLruCache(size, shards).shards]
+        assert sum(shard_sizes) == size
+        assert max(shard_sizes) - min(shard_sizes) <= 1
+    for shards in [0, 9]:
+        try:
+            ConcurrentLruCache(size=8, shards=shards)
+            assert False
+        except ValueError:
+            pass
+
+    # Concurrent access through a real (SQLite) store should work
+    sqlite_store = SqliteStore()
+    sqlite_store.put_many({i: i * 10 for i in range(300)})
+    CLRU2 = ConcurrentLruCache(size=64, shards=4, store=sqlite_store)
+
+    def sqlite_worker(offset):
+        for i in range(500):
+            key = (i * 7 + offset) % 300
+            assert CLRU2.get_value(key) == key * 10
+            if i % 10 == 0:
+                CLRU2.set_value(key, key * 10)
+            if i % 50 == 0:
+                assert CLRU2.get_many([key, -1]) == [key * 10, -1]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(sqlite_worker, range(8)))
+    assert CLRU2.load() <= 64
+    print('Assertions successful')
@@ -0,0 +1,78 @@
+from src.implementations.cache.backing_store import BackingStore, DictStore
+
+MISSING = object()  # Sentinel for cache misses, since None can be cached
+
+
+class CachePolicy:
+    """Common read-through/write-through interface shared by the cache
+    replacement policies (same public API as LruCache).
+    Subclasses only decide what to keep, by implementing
+    _cache_get(key) -> value or MISSING, _cache_put(key, value)
+    and the load property.
+    """
+    def __init__(self, size=10, store: BackingStore = None):
+        self.size = size
+        self.store = store if store is not None else DictStore()
+
+    @property
+    def load(self) -> int:
+        """Returns the number of cached items"""
+        raise NotImplementedError
+
+    def get_value(self, key):
+        """Returns value at key if key is in cache or store, else -1.
+        (Read-through)
+        """
+        value = self._cache_get(key)
+        if value is not MISSING:
+            return value
+        value_db = self.store.get(key)
+        if value_db is None:
+            return -1
+        self._cache_put(key, value_db)
+        return value_db
+
+    def get_many(self, keys) -> list:
+        """Returns a list with the value of each key (-1 if key is neither
+        in cache nor in store), fetching all misses in one bulk call.
+        (Batched read-through)
+        """
+        values = {}
+        misses = []
+        for key in keys:
+            if key in values:
+                continue
+            values[key] = self._cache_get(key)
+            if values[key] is MISSING:
+                values[key] = -1
+                misses.append(key)
+        if misses:
+            for key, value_db in self.store.get_many(misses).items():
+                if value_db is not None:
+                    self._cache_put(key, value_db)
+                    values[key] = value_db
+        return [values[key] for key in keys]
+
+    def set_value(self, key, value):
+        """Upserts key:value into store and cache.
+        (Write-through)
+        """
+        self._cache_put(key, value)
+        self.store.put(key, value)
+
+    def set_many(self, items: dict):
+        """Upserts all key:value pairs into store (in a single bulk call)
+        and into cache.
+        (Batched write-through)
+        """
+        for key, value in items.items():
+            self._cache_put(key, value)
+        self.store.put_many(items)
+
+    def _cache_get(self, key):
+        # Returns cached value of key (recording the hit) or MISSING
+        raise NotImplementedError
+
+    def _cache_put(self, key, value):
+        # Upserts key:value into cache, evicting according to the policy
+        raise NotImplementedError
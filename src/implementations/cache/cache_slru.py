@@ -0,0 +1,108 @@
+from collections import OrderedDict
+
+from src.implementations.cache.backing_store import BackingStore, DictStore
+from src.implementations.cache.cache_policy import CachePolicy, MISSING
+
+
+class SegmentedLruCache(CachePolicy):
+    """Implements
+    https://en.wikipedia.org/wiki/Cache_replacement_policies#Segmented_LRU_(SLRU)
+    (the 2Q idea with LRU segments): new keys enter a probationary segment
+    and only keys that are hit again get promoted to the protected segment.
+    A one-off scan therefore only churns the probationary segment and
+    cannot flush the working set.
+    Both segments are ordered dicts (LRU first, MRU last), so get() and
+    set() are O(1).
+    """
+    def __init__(self, size=10, store: BackingStore = None,
+                 protected_ratio=0.8):
+        super().__init__(size=size, store=store)
+        self.protected_size = min(size - 1, int(size * protected_ratio))
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+
+    def __str__(self):
+        return (f'probation: {list(self.probation)} | '
+                f'protected: {list(self.protected)}')
+
+    @property
+    def load(self) -> int:
+        return len(self.probation) + len(self.protected)
+
+    def _cache_get(self, key):
+        # Hits in protected move to its MRU end, hits in probation get
+        # promoted into protected
+        if key in self.protected:
+            self.protected.move_to_end(key)
+            return self.protected[key]
+        if key in self.probation:
+            value = self.probation.pop(key)
+            self._promote(key, value)
+            return value
+        return MISSING
+
+    def _cache_put(self, key, value):
+        if key in self.protected:
+            self.protected[key] = value
+            self.protected.move_to_end(key)
+        elif key in self.probation:
+            del self.probation[key]
+            self._promote(key, value)
+        else:
+            if self.load >= self.size:
+                self._evict()
+            self.probation[key] = value
+
+    def _promote(self, key, value):
+        # Inserts key into protected, demoting its LRU item to probation
+        self.protected[key] = value
+        if len(self.protected) > self.protected_size:
+            demoted_key, demoted_value = self.protected.popitem(last=False)
+            self.probation[demoted_key] = demoted_value
+
+    def _evict(self):
+        # Evicts the LRU item of probation (or protected if probation is
+        # empty, which only happens if protected_size == size)
+        if self.probation:
+            self.probation.popitem(last=False)
+        else:
+            self.protected.popitem(last=False)
+
+
+if __name__ == '__main__':
+    store = DictStore({i: i * 10 for i in range(100)})
+    SLRU = SegmentedLruCache(size=5, store=store)
+    assert SLRU.protected_size == 4
+
+    # .get_value() should read through and admit into probation
+    assert SLRU.get_value(1) == 10
+    assert 1 in SLRU.probation
+    assert SLRU.get_value(-1) == -1
+
+    # A second hit should promote into protected
+    assert SLRU.get_value(1) == 10
+    assert 1 in SLRU.protected and 1 not in SLRU.probation
+
+    # A scan should not flush the protected working set
+    for key in [2, 3, 4]:
+        SLRU.get_value(key)
+        SLRU.get_value(key)
+    for key in range(10, 60):
+        SLRU.get_value(key)
+    assert set(SLRU.protected) == {1, 2, 3, 4}
+    assert SLRU.load == 5
+    print(SLRU)
+
+    # Overflowing protected should demote its LRU item into probation
+    SLRU.get_value(59)
+    assert 59 in SLRU.protected and 1 in SLRU.probation
+
+    # .set_value() should write through and update cached values
+    SLRU.set_value(2, 'two')
+    assert SLRU.get_value(2) == 'two' and store.data[2] == 'two'
+    SLRU.set_value(200, 'new')
+    assert SLRU.get_value(200) == 'new' and SLRU.load == 5
+
+    # .get_many() should work
+    assert SLRU.get_many([2, 70, 70, -5]) == ['two', 700, 700, -1]
+    print('Assertions successful')
@@ -0,0 +1,61 @@
+class CacheStats:
+    """Counters for cache instrumentation: hits, misses, evictions,
+    expirations and a histogram of store load latencies with power-of-two
+    microsecond buckets (bucket b counts loads that took < 2^b us).
+    """
+    BUCKETS = 32  # Last bucket also collects everything >= ~36 minutes
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.load_latencies = [0 for _ in range(self.BUCKETS)]
+
+    def __str__(self):
+        return str(self.as_dict())
+
+    def hit_ratio(self) -> float:
+        """Returns hits / (hits + misses), or 0 if there were no lookups"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def record_load(self, seconds: float):
+        """Adds the duration of one store load to the latency histogram"""
+        bucket = int(seconds * 1_000_000).bit_length()
+        self.load_latencies[min(bucket, self.BUCKETS - 1)] += 1
+
+    def latency_histogram(self) -> dict:
+        """Returns {upper bound in us: count} for all non-empty buckets"""
+        return {2 ** b: count for b, count in enumerate(self.load_latencies)
+                if count}
+
+    def as_dict(self) -> dict:
+        """Returns all counters as a dict"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hit_ratio(),
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'load_latency_us': self.latency_histogram(),
+        }
+
+
+if __name__ == '__main__':
+    stats = CacheStats()
+    assert stats.hit_ratio() == 0.0
+
+    # .hit_ratio() should work
+    stats.hits, stats.misses = 3, 1
+    assert stats.hit_ratio() == 0.75
+
+    # .record_load() should bucket latencies by powers of two
+    stats.record_load(0)
+    stats.record_load(0.0000005)
+    stats.record_load(0.000003)
+    stats.record_load(0.001)
+    stats.record_load(10 ** 6)
+    assert stats.latency_histogram() == {1: 2, 4: 1, 1024: 1, 2 ** 31: 1}
+    assert stats.as_dict()['load_latency_us'] == stats.latency_histogram()
+    print(stats)
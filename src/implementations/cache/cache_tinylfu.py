@@ -0,0 +1,187 @@
+from collections import OrderedDict
+
+from src.implementations.cache.backing_store import BackingStore, DictStore
+from src.implementations.cache.cache_policy import CachePolicy, MISSING
+
+
+class CountMinSketch:
+    """Implements https://en.wikipedia.org/wiki/Count%E2%80%93min_sketch
+    with 4-bit saturating counters (one bytearray row per hash function)
+    and periodic aging: after sample_size increments all counters are
+    halved, so that the sketch tracks recent frequency.
+    """
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F,
+             0x165667B19E3779F9, 0x27D4EB2F165667C5)
+    MAX_COUNT = 15
+
+    def __init__(self, width: int, sample_size: int):
+        self.width = 1 << max(1, (width - 1).bit_length())  # Power of two
+        self.rows = [bytearray(self.width) for _ in self.SEEDS]
+        self.sample_size = sample_size
+        self.additions = 0
+
+    def estimate(self, key) -> int:
+        """Returns the estimated (never underestimated) frequency of key"""
+        return min(row[i] for row, i in zip(self.rows, self._indices(key)))
+
+    def increment(self, key):
+        """Increments the frequency of key, aging all counters if needed"""
+        for row, i in zip(self.rows, self._indices(key)):
+            if row[i] < self.MAX_COUNT:
+                row[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._age()
+
+    def _indices(self, key) -> list:
+        # One index per row, derived from one hash(key) via multiplicative
+        # hashing with a different odd seed per row
+        h = hash(key)
+        mask = self.width - 1
+        return [((h * seed) & 0xFFFFFFFFFFFFFFFF) >> 32 & mask
+                for seed in self.SEEDS]
+
+    def _age(self):
+        # Halves all counters
+        self.rows = [bytearray(count >> 1 for count in row)
+                     for row in self.rows]
+        self.additions //= 2
+
+
+class WTinyLfuCache(CachePolicy):
+    """Implements W-TinyLFU (https://arxiv.org/abs/1512.00727):
+    new keys enter a small LRU window. Keys evicted from the window are
+    only admitted into the main segmented LRU if a count-min sketch
+    estimates them to be more frequent than the main segment's victim.
+    One-off scans thus never displace frequently used keys.
+    Window and main segment split size between them, so size must be at
+    least 2. get() and set() are O(1).
+    """
+    def __init__(self, size=10, store: BackingStore = None,
+                 window_ratio=0.01, protected_ratio=0.8):
+        if size < 2:
+            raise ValueError('Size must be at least 2')
+        super().__init__(size=size, store=store)
+        self.window_size = min(max(1, int(size * window_ratio)), size - 1)
+        self.main_size = size - self.window_size
+        self.protected_size = min(self.main_size - 1,
+                                  int(self.main_size * protected_ratio))
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = CountMinSketch(width=8 * size, sample_size=10 * size)
+
+    def __str__(self):
+        return (f'window: {list(self.window)} | '
+                f'probation: {list(self.probation)} | '
+                f'protected: {list(self.protected)}')
+
+    @property
+    def load(self) -> int:
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+    def _cache_get(self, key):
+        self.sketch.increment(key)
+        if key in self.window:
+            self.window.move_to_end(key)
+            return self.window[key]
+        if key in self.protected:
+            self.protected.move_to_end(key)
+            return self.protected[key]
+        if key in self.probation:
+            value = self.probation.pop(key)
+            self._promote(key, value)
+            return value
+        return MISSING
+
+    def _cache_put(self, key, value):
+        for segment in (self.window, self.protected, self.probation):
+            if key in segment:
+                segment[key] = value
+                return
+        self.window[key] = value
+        if len(self.window) > self.window_size:
+            self._admit(*self.window.popitem(last=False))
+
+    def _promote(self, key, value):
+        # Inserts key into protected, demoting its LRU item to probation
+        self.protected[key] = value
+        if len(self.protected) > self.protected_size:
+            demoted_key, demoted_value = self.protected.popitem(last=False)
+            self.probation[demoted_key] = demoted_value
+
+    def _admit(self, key, value):
+        # Lets the window's candidate into main if there is room or if it is
+        # estimated to be more frequent than main's victim
+        if len(self.probation) + len(self.protected) < self.main_size:
+            self.probation[key] = value
+            return
+        victims = self.probation or self.protected
+        victim = next(iter(victims))
+        if self.sketch.estimate(key) > self.sketch.estimate(victim):
+            del victims[victim]
+            self.probation[key] = value
+
+
+if __name__ == '__main__':
+    from random import randint
+
+    # CountMinSketch should count, never underestimate, saturate and age
+    CMS = CountMinSketch(width=64, sample_size=1000)
+    for i in range(10):
+        for _ in range(i):
+            CMS.increment(i)
+    for i in range(10):
+        assert CMS.estimate(i) >= i
+    for _ in range(20):
+        CMS.increment('hot')
+    assert CMS.estimate('hot') == CountMinSketch.MAX_COUNT
+    for _ in range(1000):
+        CMS.increment('other')
+    assert CMS.estimate('hot') < CountMinSketch.MAX_COUNT
+
+    store = DictStore({i: i * 10 for i in range(1000)})
+    TLFU = WTinyLfuCache(size=10, store=store)
+    assert TLFU.window_size == 1 and TLFU.main_size == 9
+
+    # .get_value() should read through into the window
+    assert TLFU.get_value(1) == 10
+    assert 1 in TLFU.window
+    assert TLFU.get_value(-1) == -1
+
+    # Frequently used keys should survive a scan (that is shorter than the
+    # sketch's aging period, after which old frequencies fade out)
+    for _ in range(5):
+        for key in range(9):
+            TLFU.get_value(key)
+    for key in range(100, 150):
+        TLFU.get_value(key)
+        assert TLFU.load <= TLFU.size
+    assert all(key in TLFU.protected or key in TLFU.probation
+               for key in range(9))
+    print(TLFU)
+
+    # .set_value() and .get_many() should work
+    TLFU.set_value(1, 'one')
+    assert TLFU.get_value(1) == 'one' and store.data[1] == 'one'
+    assert TLFU.get_many([1, 500, 500, -1]) == ['one', 5000, 5000, -1]
+
+    # Segment sizes should add up to size, which is never exceeded
+    for size, window_ratio in [(2, 0.01), (3, 0.5), (10, 0.99), (50, 0.2)]:
+        TLFU2 = WTinyLfuCache(size=size, store=store,
+                              window_ratio=window_ratio)
+        assert TLFU2.window_size + TLFU2.main_size == size
+        for _ in range(500):
+            key = randint(0, 3 * size)
+            if randint(0, 3):
+                TLFU2.get_value(key)
+            else:
+                TLFU2.set_value(key, key * 10)
+            assert TLFU2.load <= size
+    for size in [0, 1]:
+        try:
+            WTinyLfuCache(size=size, store=store)
+            assert False
+        except ValueError:
+            pass
+    print('Assertions successful')
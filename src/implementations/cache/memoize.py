@@ -0,0 +1,131 @@
+from functools import wraps
+
+from src.implementations.cache.backing_store import BackingStore
+from src.implementations.cache.cache_lru import LruCache
+
+
+class FunctionStore(BackingStore):
+    """Read-only BackingStore that computes values by calling function.
+    Keys are (args, kwargs items[, types]) tuples as built by memoize().
+    Results are boxed into 1-tuples, so that None results can be cached.
+    """
+    def __init__(self, function):
+        self.function = function
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        return (self.function(*key[0], **dict(key[1])),)
+
+    def get_many(self, keys) -> dict:
+        return {key: self.get(key) for key in keys}
+
+    def put(self, key, value):
+        raise NotImplementedError('Memoized results are read-only')
+
+    def put_many(self, items: dict):
+        raise NotImplementedError('Memoized results are read-only')
+
+
+def memoize(size=128, typed=False, policy=LruCache):
+    """Decorator that memoizes a pure function in a bounded cache of the
+    given policy (LruCache or any CachePolicy), i.e. like
+    functools.lru_cache but with pluggable eviction.
+    With typed=True, arguments of different types are cached separately
+    (e.g. f(1) and f(1.0)). All arguments must be hashable.
+    The decorated function exposes cache_info() and cache_clear().
+    """
+    def decorator(function):
+        store = FunctionStore(function)
+        state = {'cache': policy(size=size, store=store), 'requests': 0}
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(kwargs.items()))
+            if typed:
+                key += (tuple(type(arg) for arg in args)
+                        + tuple(type(arg) for arg in kwargs.values()),)
+            state['requests'] += 1
+            return state['cache'].get_value(key)[0]
+
+        def cache_info() -> dict:
+            """Returns hits, misses, current load and size of the cache"""
+            return {'hits': state['requests'] - store.calls,
+                    'misses': store.calls,
+                    'load': state['cache'].load,
+                    'size': size}
+
+        def cache_clear():
+            """Empties the cache and resets its counters"""
+            state['cache'] = policy(size=size, store=store)
+            state['requests'] = store.calls = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+if __name__ == '__main__':
+    from src.implementations.cache.cache_arc import ArcCache
+
+    calls = []
+
+    @memoize(size=2)
+    def square(x, offset=0):
+        """Squares x"""
+        calls.append(x)
+        return x * x + offset
+
+    # Results should be memoized and metadata preserved
+    assert square(3) == 9 and square(3) == 9
+    assert calls == [3]
+    assert square.__name__ == 'square' and square.__doc__ == 'Squares x'
+    assert square.cache_info() == {'hits': 1, 'misses': 1, 'load': 1,
+                                   'size': 2}
+
+    # Keyword arguments should be part of the key
+    assert square(3, offset=1) == 10
+    assert calls == [3, 3]
+
+    # Capacity should be bounded, evicting the LRU result
+    square(4)
+    assert square.cache_info()['load'] == 2
+    square(3)
+    assert calls == [3, 3, 4, 3]
+
+    # Untyped keys should share results across equal values of other types
+    assert square(3.0) == 9 and calls == [3, 3, 4, 3]
+
+    @memoize(size=10, typed=True)
+    def identity(x):
+        calls.append(x)
+        return x
+
+    assert identity(1) == 1 and type(identity(1.0)) is float
+    assert identity.cache_info()['misses'] == 2
+
+    # None results should be cached
+    @memoize(size=10, policy=ArcCache)
+    def nothing(x):
+        calls.append(x)
+
+    calls.clear()
+    assert nothing('a') is None and nothing('a') is None
+    assert calls == ['a']
+
+    # .cache_clear() should empty the cache and reset counters
+    nothing.cache_clear()
+    assert nothing.cache_info() == {'hits': 0, 'misses': 0, 'load': 0,
+                                    'size': 10}
+    nothing('a')
+    assert calls == ['a', 'a']
+
+    # Recursive functions should be memoized through the decorator
+    @memoize(size=3)
+    def fib(x):
+        return x if x < 2 else fib(x - 1) + fib(x - 2)
+
+    assert fib(200) == 280571172992510140037611932413038677189525
+    assert fib.cache_info()['misses'] == 201
+    print('Assertions successful')
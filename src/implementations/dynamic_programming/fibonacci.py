@@ -1,3 +1,6 @@
+from src.implementations.cache.memoize import memoize
+
+
 def fibonacci_recursive(x: int) -> int:
     """Calculates x'th Fibnoacci number in O(2^N) time, O(2^N) space"""
     # ignoring x<=0
@@ -17,6 +20,17 @@ def fibonacci_memoized(x: int, cache: {}) -> int:
     return cache[x]
 
 
+@memoize(size=128)
+def fibonacci_lru_memoized(x: int) -> int:
+    """Calculates x'th Fibnoacci number in O(N) time, with results
+    memoized in a bounded LRU cache that persists across calls
+    """
+    # ignoring x<=0
+    if x == 1 or x == 2:
+        return 1
+    return fibonacci_lru_memoized(x-1) + fibonacci_lru_memoized(x-2)
+
+
 def fibonacci_bottom_up(x: int, cache: {}) -> int:
     """Calculates x'th Fibnoacci number in O(N) time, O(N) space"""
     # ignoring x<=0
@@ -55,6 +69,8 @@ if __name__ == '__main__':
     for (x, result) in test_cases:
         assert fibonacci_recursive(x) == result
         assert fibonacci_memoized(x, {}) == result
+        assert fibonacci_lru_memoized(x) == result
         assert fibonacci_bottom_up(x, {}) == result
         assert fibonacci_bottom_up_minified(x) == result
         print(f'fibonacci({x}) == {result} correct for all functions')
+    assert fibonacci_lru_memoized.cache_info()['load'] <= 128
@@ -2,6 +2,8 @@ from time import perf_counter
 
 from pandas import DataFrame
 
+from src.implementations.cache.memoize import memoize
+
 
 def lcs_length_recursive(a: str, b: str) -> int:
     """Calculates the length of the longest common subsequence of two strings
@@ -24,6 +26,29 @@ def _lcs_length_recursive(a: str, b: str, i: int, j: int) -> int:
                ])
 
 
+def lcs_length_memoized(a: str, b: str) -> int:
+    """Calculates the length of the longest common subsequence of two strings
+    in O(nm) where n an m are the lengths of the strings, by memoizing the
+    recursive solution in a bounded LRU cache
+    """
+    if len(a) < 1 or len(b) < 1:
+        raise Exception('Please provide two non-empty strings')
+    return _lcs_length_memoized(a, b, 0, 0)
+
+
+@memoize(size=4096)
+def _lcs_length_memoized(a: str, b: str, i: int, j: int) -> int:
+    # Same recursion as _lcs_length_recursive, but through the cache
+    if i >= len(a) or j >= len(b):
+        return 0
+    if a[i] == b[j]:
+        return 1 + _lcs_length_memoized(a, b, i+1, j+1)
+    return max([
+                _lcs_length_memoized(a, b, i+1, j),
+                _lcs_length_memoized(a, b, i, j+1)
+               ])
+
+
 def lcs_length_bottom_up(a: str, b: str) -> (int, [[int]]):
     """Calculates the length of the longest common subsequence of two strings
     in O(nm) where n an m are the lengths of the strings.
@@ -67,6 +92,12 @@ if __name__ == '__main__':
     stop = perf_counter()
     print(f'Secs: {stop - start}\n')
 
+    print('MEMOIZED IMPLEMENTATION:')
+    start = perf_counter()
+    print(lcs_length_memoized('nematode knowledge', 'empty bottle'))
+    stop = perf_counter()
+    print(f'Secs: {stop - start}\n')
+
     print('BOTTOM-UP IMPLEMENTATION:')
     start = perf_counter()
     length, cache = lcs_length_bottom_up(a, b)
@@ -76,3 +107,5 @@ if __name__ == '__main__':
     print(f'LCS: {lcs}')
     print(f'Cache:\n{DataFrame(cache)}')
     print(f'Secs: {stop - start}')
+
+    assert lcs_length_memoized(a, b) == length
@@ -1,9 +1,10 @@
-import heapq
 from math import inf
 
 from src.implementations.graphs.representations.edges import DirectedEdge
 from src.implementations.graphs.representations.graph_weighted import \
     DigraphWeighted
+from src.implementations.priority_queue.indexed_priority_queue import \
+    IndexedPriorityQueue
 
 
 class GraphShortestPath:
@@ -16,7 +17,7 @@ class GraphShortestPath:
         self.parent = [None for v in range(graph.v())]
         self.dist_to = [inf for v in range(graph.v())]
         self.dist_to[source] = 0
-        self.heap = []
+        self.pq = IndexedPriorityQueue()  # vertex -> tentative distance
         self._dijkstras_shortest_path()
 
     def source_distance_to(self, v: int) -> int:
@@ -39,15 +40,17 @@ class GraphShortestPath:
         if self.dist_to[w] > self.dist_to[v] + e.weight:
             self.parent[w] = v
             self.dist_to[w] = self.dist_to[v] + e.weight
-            # Could significantly improve performance by
-            # adding decrease-key here
-            heapq.heappush(self.heap, (self.dist_to[w], w))
+            # Decrease-key keeps at most one entry per vertex in the queue
+            if self.pq.contains(w):
+                self.pq.decrease_key(w, self.dist_to[w])
+            else:
+                self.pq.insert(w, self.dist_to[w])
 
     def _dijkstras_shortest_path(self):
         """Implements https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm"""
-        heapq.heappush(self.heap, (0, self.source))
-        while self.heap:
-            _, v = heapq.heappop(self.heap)
+        self.pq.insert(self.source, 0)
+        while not self.pq.is_empty():
+            v, _ = self.pq.del_min()
             for edge in self.graph.adj(v):
                 self._relax(edge)
 
@@ -1,21 +1,31 @@
+from operator import gt, lt
+
+
 class BinaryHeap:
     """Implements https://en.wikipedia.org/wiki/Binary_heap
-    Using positive keys -> max-heap, using negative keys -> min-heap.
-    Keys must be comparable.
+    Max-heap by default, min-heap if min_heap=True. peek() and pop() access
+    the top of the heap in either mode, max() and del_max() are their
+    max-heap names.
+    Optionally accepts a key function (like sorted()), which is computed
+    once per inserted value and stored in self.priorities alongside it.
+    Keys (or key function results) must be comparable.
     """
-    def __init__(self, keys=[]):
+    def __init__(self, keys=[], key=None, min_heap=False):
+        self.key = key
+        self.min_heap = min_heap
+        self._precedes = lt if min_heap else gt  # True if a belongs above b
         self.keys = [None]
         self.keys.extend(keys) if keys else None
+        # Without a key function, values are compared directly
+        self.priorities = ([None] + [key(value) for value in self.keys[1:]]
+                           if key else self.keys)
         self.heapify()
 
     def del_max(self):
-        """Deletes the maximum value at the top of the heap and returns it"""
-        if self.is_empty():
-            return Exception("Error: Heap is empty")
-        self._swap(1, self.size())
-        val = self.keys.pop()
-        self._sink(1)
-        return val
+        """Deletes the maximum value at the top of a max-heap and returns it
+        (same as pop())
+        """
+        return self.pop()
 
     def heapify(self):
         """Turns a given array (if provided) into a 1-indexed binary heap"""
@@ -30,6 +40,8 @@ class BinaryHeap:
     def insert(self, key):
         """Insert key while maintaining heap invariants"""
         self.keys.append(key)
+        if self.key:
+            self.priorities.append(self.key(key))
         return self._swim(self.size())
 
     def is_empty(self) -> bool:
@@ -37,9 +49,30 @@ class BinaryHeap:
         return len(self.keys) <= 1  # <=1 because keys[0] is empty
 
     def max(self):
-        """Returns the maximum value at the top of the heap if there is one"""
+        """Returns the maximum value at the top of a max-heap if there is
+        one (same as peek())
+        """
+        return self.peek()
+
+    def peek(self):
+        """Returns the value at the top of the heap (the maximum, or the
+        minimum if min_heap) if there is one
+        """
         return self.keys[1] if len(self.keys) > 1 else None
 
+    def pop(self):
+        """Deletes the value at the top of the heap (the maximum, or the
+        minimum if min_heap) and returns it
+        """
+        if self.is_empty():
+            return Exception("Error: Heap is empty")
+        self._swap(1, self.size())
+        if self.key:
+            self.priorities.pop()
+        val = self.keys.pop()
+        self._sink(1)
+        return val
+
     def size(self) -> int:
         """Returns the number of values stored in the heap"""
         return len(self.keys) - 1  # -1 because keys[0] is empty
@@ -53,30 +86,33 @@ class BinaryHeap:
         # heap invariants are restored (opposite of self._swim()).
         # Optionally accepts an index at which to stop sinking (to support
         # heapsort)
+        priorities, precedes = self.priorities, self._precedes
         stop = stop or self.size() + 1
         while 2*i < stop:
             j = 2*i
-            if j < stop - 1 and self.keys[j] < self.keys[j+1]:
-                j += 1  # Ensures that j is index of *larger* child node
-            if self.keys[i] >= self.keys[j]:
+            if j < stop - 1 and precedes(priorities[j+1], priorities[j]):
+                j += 1  # Ensures that j is index of child node to move up
+            if not precedes(priorities[j], priorities[i]):
                 break
             self._swap(i, j)
             i = j
         return i
 
     def _swap(self, i: int, j: int):
-        # Swaps two values/nodes
+        # Swaps two values/nodes (and their priorities)
         self.keys[i], self.keys[j] = self.keys[j], self.keys[i]
+        if self.key:
+            priorities = self.priorities
+            priorities[i], priorities[j] = priorities[j], priorities[i]
 
     def _swim(self, i: int):
         # Iteratively swaps a value with parent values until
         # heap invariants are restored (opposite of self._sink()).
-        parent_i = max(1, i // 2)  # parent = i//2 except for keys[1]
-        if self.keys[parent_i] >= self.keys[i]:
-            return i
-        else:
-            self._swap(parent_i, i)
-            return self._swim(parent_i)
+        priorities, precedes = self.priorities, self._precedes
+        while i > 1 and precedes(priorities[i], priorities[i // 2]):
+            self._swap(i // 2, i)
+            i //= 2
+        return i
 
 
 if __name__ == '__main__':
@@ -119,3 +155,26 @@ if __name__ == '__main__':
     assert pq_empty.max() == keys_sorted[-2]
     pq_empty.del_max()
     assert pq_empty.max() == keys_sorted[-3]
+
+    # Min-heap mode and key functions should work
+    words = ['pear', 'fig', 'banana', 'kiwi', 'apple', 'plum']
+    pq_min = BinaryHeap(keys, min_heap=True)
+    assert pq_min.peek() == keys_sorted[0]
+    assert [pq_min.pop() for _ in keys] == keys_sorted
+    assert pq_min.peek() is None
+    pq_words = BinaryHeap(words[:3], key=len, min_heap=True)
+    for word in words[3:]:
+        pq_words.insert(word)
+    assert pq_words.peek() == 'fig'
+    assert pq_words.priorities[1:] == [len(w) for w in pq_words.values()]
+    assert [len(pq_words.pop()) for _ in words] == sorted(map(len, words))
+    assert pq_words.is_empty() and pq_words.priorities == [None]
+
+    # Key functions should be called once per value
+    calls = []
+    pq_counted = BinaryHeap(key=lambda word: calls.append(word) or word)
+    for word in words:
+        pq_counted.insert(word)
+    while not pq_counted.is_empty():
+        pq_counted.pop()
+    assert calls == words
@@ -0,0 +1,128 @@
+from src.implementations.priority_queue.binary_heap import BinaryHeap
+
+
+class DAryHeap(BinaryHeap):
+    """Implements https://en.wikipedia.org/wiki/D-ary_heap
+    A 1-indexed heap like BinaryHeap (including min_heap and key), but
+    every node has up to arity children: the children of i are
+    arity*(i-1)+2 ... arity*i+1.
+    Higher arities make the heap shallower, so insert() (which swims)
+    does fewer comparisons while pop() (which sinks) does more.
+    Sifts are iterative and move a "hole" instead of swapping.
+    Keys (or key function results) must be comparable.
+    """
+    def __init__(self, keys=[], arity: int = 4, key=None, min_heap=False):
+        if arity < 2:
+            raise ValueError('Arity must be at least 2')
+        self.arity = arity
+        super().__init__(keys, key=key, min_heap=min_heap)
+
+    def heapify(self):
+        """Turns a given array (if provided) into a 1-indexed d-ary heap"""
+        i = (self.size() - 2) // self.arity + 1  # Last node with children
+        while i > 0:
+            self._sink(i)
+            i -= 1
+        return
+
+    def _sink(self, i: int, stop=False):
+        # Moves keys[i] down past its children until heap invariants
+        # are restored (opposite of self._swim()). Optionally accepts an
+        # index at which to stop sinking (to support heapsort)
+        keys, priorities, arity = self.keys, self.priorities, self.arity
+        precedes = self._precedes
+        stop = stop or len(keys)
+        if i >= stop:
+            return i
+        key, priority = keys[i], priorities[i]
+        while True:
+            first = arity * (i - 1) + 2
+            if first >= stop:
+                break
+            j = first  # Index of child node to move up
+            for child in range(first + 1, min(first + arity, stop)):
+                if precedes(priorities[child], priorities[j]):
+                    j = child
+            if not precedes(priorities[j], priority):
+                break
+            keys[i], priorities[i] = keys[j], priorities[j]
+            i = j
+        keys[i], priorities[i] = key, priority
+        return i
+
+    def _swim(self, i: int):
+        # Moves keys[i] up past its parents until heap invariants
+        # are restored (opposite of self._sink())
+        keys, priorities, arity = self.keys, self.priorities, self.arity
+        precedes = self._precedes
+        key, priority = keys[i], priorities[i]
+        while i > 1:
+            parent_i = (i - 2) // arity + 1
+            if not precedes(priority, priorities[parent_i]):
+                break
+            keys[i], priorities[i] = keys[parent_i], priorities[parent_i]
+            i = parent_i
+        keys[i], priorities[i] = key, priority
+        return i
+
+
+if __name__ == '__main__':
+    from random import randint
+
+    keys = [1, 2, 3, 10, 34, 22, 14, 21, 0]
+    keys_sorted = sorted(keys)
+
+    for arity in [2, 3, 4, 8]:
+        # Construction, .max() and .del_max() should work for all arities
+        pq_empty = DAryHeap(arity=arity)
+        pq_filled = DAryHeap(keys, arity=arity)
+        assert pq_empty.is_empty() and pq_empty.max() is None
+        assert pq_filled.size() == len(keys)
+        assert [pq_filled.del_max() for _ in keys] == keys_sorted[::-1]
+        assert pq_filled.is_empty()
+
+        # .insert() should work, including subsequent deletions
+        for key in keys:
+            pq_empty.insert(key)
+        assert pq_empty.max() == keys_sorted[-1]
+        pq_empty.del_max()
+        assert pq_empty.max() == keys_sorted[-2]
+
+        # Heap order should match a sorted reference under random operations
+        pq_random = DAryHeap([randint(0, 100) for _ in range(50)], arity)
+        reference = sorted(pq_random.values())
+        for _ in range(5000):
+            if randint(0, 2) or pq_random.is_empty():
+                key = randint(0, 100)
+                pq_random.insert(key)
+                reference.append(key)
+                reference.sort()
+            else:
+                assert pq_random.del_max() == reference.pop()
+            assert pq_random.size() == len(reference)
+            assert pq_random.max() == (reference[-1] if reference else None)
+
+        # ._sink() with a stop index should support heapsort
+        heap = DAryHeap(keys, arity)
+        for i in range(heap.size(), 0, -1):
+            heap._swap(1, i)
+            heap._sink(1, i)
+        assert heap.values() == keys_sorted
+
+    # Min-heap mode and key functions should work
+    words = ['pear', 'fig', 'banana', 'kiwi', 'apple', 'plum', 'date']
+    pq_words = DAryHeap(words, arity=3, key=len, min_heap=True)
+    assert pq_words.priorities[1:] == [len(w) for w in pq_words.values()]
+    assert [len(pq_words.pop()) for _ in words] == sorted(map(len, words))
+    pq_min = DAryHeap(arity=4, min_heap=True)
+    for key in keys:
+        pq_min.insert(key)
+    assert pq_min.peek() == keys_sorted[0]
+    assert [pq_min.pop() for _ in keys] == keys_sorted
+
+    try:
+        DAryHeap(arity=1)
+        assert False
+    except ValueError:
+        pass
+    print('Assertions successful')
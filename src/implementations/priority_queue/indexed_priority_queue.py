@@ -0,0 +1,182 @@
+class IndexedPriorityQueue:
+    """Implements an indexed (addressable) min-priority queue, i.e. a
+    https://en.wikipedia.org/wiki/Binary_heap of (item, priority) pairs
+    with a position map from each item to its heap slot, so that any item
+    can be found in O(1) and re-prioritized or deleted in O(log n).
+    Items must be hashable and unique, priorities must be comparable.
+    """
+    def __init__(self):
+        self.items = [None]  # 1-indexed like BinaryHeap
+        self.priorities = [None]
+        self.positions = {}  # item -> index in items/priorities
+
+    def contains(self, item) -> bool:
+        """Returns True if item is in queue, else False"""
+        return item in self.positions
+
+    def insert(self, item, priority):
+        """Inserts item with priority. Raises ValueError if item is in queue"""
+        if item in self.positions:
+            raise ValueError(f'Item {item} is already in queue')
+        self.items.append(item)
+        self.priorities.append(priority)
+        self.positions[item] = self.size()
+        self._swim(self.size())
+
+    def is_empty(self) -> bool:
+        """Returns True if queue is empty, else False"""
+        return len(self.items) <= 1  # <=1 because items[0] is empty
+
+    def min(self) -> tuple or None:
+        """Returns (item, priority) with the smallest priority if any"""
+        return (self.items[1], self.priorities[1]) if self.size() else None
+
+    def del_min(self) -> tuple or None:
+        """Deletes the item with the smallest priority and returns
+        (item, priority), or None if queue is empty
+        """
+        if self.is_empty():
+            return None
+        minimum = self.min()
+        self.delete(minimum[0])
+        return minimum
+
+    def priority(self, item):
+        """Returns the priority of item. Raises KeyError if not in queue"""
+        return self.priorities[self.positions[item]]
+
+    def change_key(self, item, priority):
+        """Sets the priority of item. Raises KeyError if not in queue"""
+        i = self.positions[item]
+        old_priority, self.priorities[i] = self.priorities[i], priority
+        if priority < old_priority:
+            self._swim(i)
+        else:
+            self._sink(i)
+
+    def decrease_key(self, item, priority):
+        """Lowers the priority of item. Raises KeyError if not in queue,
+        ValueError if priority is larger than the current one
+        """
+        i = self.positions[item]
+        if self.priorities[i] < priority:
+            raise ValueError(f'{priority} is larger than the priority '
+                             f'{self.priorities[i]} of item {item}')
+        self.priorities[i] = priority
+        self._swim(i)
+
+    def delete(self, item):
+        """Deletes item from queue. Raises KeyError if not in queue"""
+        i = self.positions[item]
+        last = self.size()
+        self._swap(i, last)
+        self.items.pop()
+        self.priorities.pop()
+        del self.positions[item]
+        if i < last:  # Moved item might belong above or below slot i
+            self._swim(i)
+            self._sink(i)
+
+    def size(self) -> int:
+        """Returns the number of items in the queue"""
+        return len(self.items) - 1  # -1 because items[0] is empty
+
+    def _sink(self, i: int):
+        # Iteratively swaps an item with its smaller child until
+        # heap invariants are restored (opposite of self._swim())
+        priorities, n = self.priorities, self.size()
+        while 2*i <= n:
+            j = 2*i
+            if j < n and priorities[j+1] < priorities[j]:
+                j += 1  # Ensures that j is index of *smaller* child node
+            if not priorities[j] < priorities[i]:
+                break
+            self._swap(i, j)
+            i = j
+
+    def _swap(self, i: int, j: int):
+        # Swaps two items and their priorities, updating their positions
+        items, priorities = self.items, self.priorities
+        items[i], items[j] = items[j], items[i]
+        priorities[i], priorities[j] = priorities[j], priorities[i]
+        self.positions[items[i]] = i
+        self.positions[items[j]] = j
+
+    def _swim(self, i: int):
+        # Iteratively swaps an item with its parent until
+        # heap invariants are restored (opposite of self._sink())
+        priorities = self.priorities
+        while i > 1 and priorities[i] < priorities[i // 2]:
+            self._swap(i, i // 2)
+            i //= 2
+
+
+if __name__ == '__main__':
+    from random import randint
+
+    IPQ = IndexedPriorityQueue()
+
+    # Empty queue should work
+    assert IPQ.is_empty() and IPQ.size() == 0
+    assert IPQ.min() is None and IPQ.del_min() is None
+
+    # .insert(), .min() and .del_min() should work
+    for item, priority in [('a', 5), ('b', 3), ('c', 8), ('d', 1)]:
+        IPQ.insert(item, priority)
+    assert IPQ.min() == ('d', 1) and IPQ.size() == 4
+    assert IPQ.contains('a') and not IPQ.contains('z')
+    try:
+        IPQ.insert('a', 0)
+        assert False
+    except ValueError:
+        pass
+
+    # .decrease_key(), .change_key() and .delete() should work
+    IPQ.decrease_key('c', 0)
+    assert IPQ.min() == ('c', 0)
+    try:
+        IPQ.decrease_key('a', 10)
+        assert False
+    except ValueError:
+        pass
+    IPQ.change_key('c', 10)
+    assert IPQ.min() == ('d', 1) and IPQ.priority('c') == 10
+    IPQ.delete('d')
+    assert not IPQ.contains('d')
+    assert [IPQ.del_min() for _ in range(3)] == [('b', 3), ('a', 5),
+                                                 ('c', 10)]
+    assert IPQ.is_empty()
+
+    # Behavior should match a dict under random operations
+    IPQ2 = IndexedPriorityQueue()
+    reference = {}
+    for _ in range(20000):
+        item = randint(0, 100)
+        priority = randint(0, 1000)
+        operation = randint(0, 4)
+        if operation == 0 and item not in reference:
+            IPQ2.insert(item, priority)
+            reference[item] = priority
+        elif operation == 1 and item in reference:
+            IPQ2.change_key(item, priority)
+            reference[item] = priority
+        elif operation == 2 and item in reference:
+            priority = reference[item] - randint(0, 10)
+            IPQ2.decrease_key(item, priority)
+            reference[item] = priority
+        elif operation == 3 and item in reference:
+            IPQ2.delete(item)
+            del reference[item]
+        elif operation == 4 and reference:
+            _, priority = IPQ2.del_min()
+            assert priority == min(reference.values())
+            del reference[next(key for key, value in reference.items()
+                               if value == priority
+                               and not IPQ2.contains(key))]
+        assert IPQ2.size() == len(reference)
+        assert IPQ2.contains(item) == (item in reference)
+        if reference:
+            assert IPQ2.min()[1] == min(reference.values())
+    assert all(IPQ2.positions[IPQ2.items[i]] == i
+               for i in range(1, IPQ2.size() + 1))
+    print('Assertions successful')
@@ -0,0 +1,440 @@
+from bisect import bisect_left, bisect_right
+
+from src.implementations.symbol_tables import config
+from src.implementations.symbol_tables.binary_search_tree import \
+    sorted_unique_items
+
+
+class _BPlusNode:
+    """Implements a B+-tree node. Leaves hold sorted keys with their values
+    and a link to the next leaf. Internal nodes hold sorted separator keys
+    (keys[i] is the smallest key below children[i + 1]), their children and
+    the number of keys below each child.
+    """
+    __slots__ = ['keys', 'values', 'children', 'counts', 'next']
+
+    def __init__(self, keys, values=None, children=None, counts=None):
+        self.keys = keys
+        self.values, self.next = values, None  # Leaves only
+        self.children, self.counts = children, counts  # Internal nodes only
+
+    def is_leaf(self) -> bool:
+        return self.children is None
+
+    def entries(self) -> int:
+        # Keys of a leaf, children of an internal node
+        return len(self.keys) if self.children is None else len(self.children)
+
+    def size(self) -> int:
+        # Number of keys in the subtree
+        return len(self.keys) if self.children is None else sum(self.counts)
+
+
+class BPlusTree:
+    """Implements https://en.wikipedia.org/wiki/B%2B_tree with the ordered
+    API of RedBlackTree. Every node holds up to fan_out sorted keys (leaves)
+    or children (internal nodes) in flat lists searched with bisect, so a
+    lookup touches only log_fan_out(n) nodes. Leaves are linked, so range
+    scans run along the leaf level without revisiting internal nodes.
+    Internal nodes count the keys below each child for rank and select.
+    """
+    def __init__(self, fan_out: int = config.b_plus_tree['FAN_OUT']):
+        assert fan_out >= 3
+        self.fan_out = fan_out
+        self.min_entries = (fan_out + 1) // 2  # For all nodes but the root
+        self.root = _BPlusNode([], [])
+
+    @classmethod
+    def from_items(cls, items, fan_out=config.b_plus_tree['FAN_OUT']
+                   ) -> 'BPlusTree':
+        """Returns a tree holding all key:value pairs of items (the last pair
+        wins for duplicate keys), bulk-loaded level by level.
+        O(n) for sorted items, else O(n log n)
+        """
+        tree = cls(fan_out)
+        items = sorted_unique_items(items)
+        if not items:
+            return tree
+        nodes = []
+        for chunk in tree._chunks(items):
+            leaf = _BPlusNode([key for key, _ in chunk],
+                              [value for _, value in chunk])
+            if nodes:
+                nodes[-1].next = leaf
+            nodes.append(leaf)
+        while len(nodes) > 1:
+            nodes = [_BPlusNode([tree._min_key(child) for child in chunk[1:]],
+                                children=chunk,
+                                counts=[child.size() for child in chunk])
+                     for chunk in tree._chunks(nodes)]
+        tree.root = nodes[0]
+        return tree
+
+    def get(self, key):
+        """Returns value of key if key in tree, else None"""
+        leaf = self._leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return leaf.values[i]
+        return None
+
+    def get_many(self, keys) -> list:
+        """Returns a list with the value of each key (None if not in tree)"""
+        get = self.get
+        return [get(key) for key in keys]
+
+    def put(self, key, value):
+        """Upserts key:value into tree"""
+        split = self._put(self.root, key, value)[0]
+        if split is not None:  # Grow a new root above the split old one
+            separator, right = split
+            self.root = _BPlusNode([separator], children=[self.root, right],
+                                   counts=[self.root.size(), right.size()])
+
+    def delete(self, key) -> None or False:
+        """Deletes key from tree. Returns None if successful, False if not."""
+        if not self._delete(self.root, key):
+            return False
+        if not self.root.is_leaf() and len(self.root.children) == 1:
+            self.root = self.root.children[0]  # Shrink tree by one level
+
+    def delete_min(self) -> None or False:
+        """Deletes the smallest key from the tree"""
+        if self.size() == 0:
+            return False
+        self.delete(self.min())
+
+    def delete_max(self) -> None or False:
+        """Deletes the largest key from the tree"""
+        if self.size() == 0:
+            return False
+        self.delete(self.max())
+
+    def size(self) -> int:
+        """Returns the number of keys in the tree"""
+        return self.root.size()
+
+    def min(self):
+        """Returns the smallest key, or None if tree is empty"""
+        return self.select(0)
+
+    def max(self):
+        """Returns the largest key, or None if tree is empty"""
+        return self.select(self.size() - 1)
+
+    def rank(self, key) -> int:
+        """Returns the number of keys smaller than key"""
+        node, rank = self.root, 0
+        while node.children is not None:
+            i = bisect_right(node.keys, key)
+            rank += sum(node.counts[:i])
+            node = node.children[i]
+        return rank + bisect_left(node.keys, key)
+
+    def select(self, rank: int):
+        """Returns the key with the given rank (i.e. the rank+1-th smallest
+        key), or None if rank is out of bounds
+        """
+        if not 0 <= rank < self.size():
+            return None
+        node = self.root
+        while node.children is not None:
+            for i, count in enumerate(node.counts):
+                if rank < count:
+                    break
+                rank -= count
+            node = node.children[i]
+        return node.keys[rank]
+
+    def floor(self, key):
+        """Returns the largest key <= key, or None if there is none"""
+        leaf = self._leaf(key)
+        i = bisect_right(leaf.keys, key)
+        if i > 0:
+            return leaf.keys[i - 1]
+        # Leaves are not linked backwards, so fall back to rank
+        rank = self.rank(key)
+        return self.select(rank - 1) if rank > 0 else None
+
+    def ceiling(self, key):
+        """Returns the smallest key >= key, or None if there is none"""
+        leaf = self._leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys):
+            return leaf.keys[i]
+        return leaf.next.keys[0] if leaf.next is not None else None
+
+    def range_count(self, lo, hi) -> int:
+        """Returns the number of keys in [lo, hi]"""
+        if hi < lo:
+            return 0
+        count = self.rank(hi) - self.rank(lo)
+        return count + 1 if self.ceiling(hi) == hi else count
+
+    def range_iter(self, lo, hi):
+        """Lazily yields the (key, value) pairs with keys in [lo, hi]
+        in ascending order, walking along the linked leaves
+        """
+        leaf = self._leaf(lo)
+        i = bisect_left(leaf.keys, lo)
+        while leaf is not None:
+            keys, values = leaf.keys, leaf.values
+            for j in range(i, len(keys)):
+                if hi < keys[j]:
+                    return
+                yield keys[j], values[j]
+            leaf, i = leaf.next, 0
+
+    def _leaf(self, key) -> _BPlusNode:
+        # Returns the leaf that holds key if key is in tree
+        node = self.root
+        while node.children is not None:
+            node = node.children[bisect_right(node.keys, key)]
+        return node
+
+    def _put(self, node: _BPlusNode, key, value) -> (tuple or None, bool):
+        """Recursively upserts key:value below node.
+        Returns (split, added): split is (separator, new right sibling) if
+        node overflowed and was split in half, else None; added is True if
+        key was not in tree before.
+        """
+        if node.is_leaf():
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                node.values[i] = value
+                return None, False
+            node.keys.insert(i, key)
+            node.values.insert(i, value)
+            if len(node.keys) <= self.fan_out:
+                return None, True
+            mid = len(node.keys) // 2
+            right = _BPlusNode(node.keys[mid:], node.values[mid:])
+            del node.keys[mid:], node.values[mid:]
+            right.next, node.next = node.next, right
+            return (right.keys[0], right), True
+
+        i = bisect_right(node.keys, key)
+        split, added = self._put(node.children[i], key, value)
+        node.counts[i] += added
+        if split is None:
+            return None, added
+        separator, right = split
+        node.keys.insert(i, separator)
+        node.children.insert(i + 1, right)
+        node.counts.insert(i + 1, right.size())
+        node.counts[i] -= node.counts[i + 1]
+        if len(node.children) <= self.fan_out:
+            return None, added
+        mid = len(node.children) // 2
+        separator = node.keys[mid - 1]  # Moves up instead of being copied
+        right = _BPlusNode(node.keys[mid:], children=node.children[mid:],
+                           counts=node.counts[mid:])
+        del node.keys[mid - 1:], node.children[mid:], node.counts[mid:]
+        return (separator, right), added
+
+    def _delete(self, node: _BPlusNode, key) -> bool:
+        """Recursively deletes key below node. Returns True if key was in
+        tree. Children left with less than min_entries entries borrow an
+        entry from or are merged with a sibling.
+        """
+        if node.is_leaf():
+            i = bisect_left(node.keys, key)
+            if i == len(node.keys) or node.keys[i] != key:
+                return False
+            del node.keys[i], node.values[i]
+            return True
+
+        i = bisect_right(node.keys, key)
+        if not self._delete(node.children[i], key):
+            return False
+        node.counts[i] -= 1
+        if node.children[i].entries() < self.min_entries:
+            self._fix_underflow(node, i)
+        return True
+
+    def _fix_underflow(self, parent: _BPlusNode, i: int):
+        # Refills children[i] of parent from a sibling that can spare an
+        # entry, else merges it with a sibling
+        children = parent.children
+        if i > 0 and children[i - 1].entries() > self.min_entries:
+            self._borrow_from_left(parent, i)
+        elif (i + 1 < len(children)
+                and children[i + 1].entries() > self.min_entries):
+            self._borrow_from_right(parent, i)
+        elif i > 0:
+            self._merge(parent, i - 1)
+        else:
+            self._merge(parent, i)
+
+    def _borrow_from_left(self, parent: _BPlusNode, i: int):
+        # Moves the last entry of children[i - 1] to the front of children[i]
+        left, node = parent.children[i - 1], parent.children[i]
+        if node.is_leaf():
+            node.keys.insert(0, left.keys.pop())
+            node.values.insert(0, left.values.pop())
+            parent.keys[i - 1] = node.keys[0]
+            moved = 1
+        else:
+            node.keys.insert(0, parent.keys[i - 1])
+            parent.keys[i - 1] = left.keys.pop()
+            node.children.insert(0, left.children.pop())
+            moved = left.counts.pop()
+            node.counts.insert(0, moved)
+        parent.counts[i - 1] -= moved
+        parent.counts[i] += moved
+
+    def _borrow_from_right(self, parent: _BPlusNode, i: int):
+        # Moves the first entry of children[i + 1] to the end of children[i]
+        node, right = parent.children[i], parent.children[i + 1]
+        if node.is_leaf():
+            node.keys.append(right.keys.pop(0))
+            node.values.append(right.values.pop(0))
+            parent.keys[i] = right.keys[0]
+            moved = 1
+        else:
+            node.keys.append(parent.keys[i])
+            parent.keys[i] = right.keys.pop(0)
+            node.children.append(right.children.pop(0))
+            moved = right.counts.pop(0)
+            node.counts.append(moved)
+        parent.counts[i + 1] -= moved
+        parent.counts[i] += moved
+
+    def _merge(self, parent: _BPlusNode, i: int):
+        # Merges children[i + 1] into children[i]
+        node, right = parent.children[i], parent.children[i + 1]
+        if node.is_leaf():
+            node.keys += right.keys
+            node.values += right.values
+            node.next = right.next
+        else:
+            node.keys += [parent.keys[i]] + right.keys
+            node.children += right.children
+            node.counts += right.counts
+        del parent.keys[i], parent.children[i + 1]
+        parent.counts[i] += parent.counts.pop(i + 1)
+
+    def _chunks(self, entries: list) -> list:
+        # Splits entries into as few chunks of at most fan_out entries as
+        # possible, with sizes differing by at most one
+        chunks = -(-len(entries) // self.fan_out)
+        size, extra = divmod(len(entries), chunks)
+        bounds = [i * size + min(i, extra) for i in range(chunks + 1)]
+        return [entries[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+
+    def _min_key(self, node: _BPlusNode):
+        # Returns the smallest key below node
+        while node.children is not None:
+            node = node.children[0]
+        return node.keys[0]
+
+
+if __name__ == '__main__':
+    from random import randint
+
+    def check(tree: BPlusTree):
+        # Asserts all B+-tree invariants and returns the keys in order
+        leaves = []
+
+        def walk(node, lo, hi, depth, is_root):
+            assert node.keys == sorted(node.keys)
+            assert all((lo is None or lo <= k) and (hi is None or k < hi)
+                       for k in node.keys)
+            assert node.entries() <= tree.fan_out
+            assert is_root or node.entries() >= tree.min_entries
+            if node.is_leaf():
+                leaves.append((node, depth))
+                return
+            assert len(node.children) == len(node.keys) + 1
+            bounds = [lo] + node.keys + [hi]
+            for i, child in enumerate(node.children):
+                assert node.counts[i] == child.size()
+                walk(child, bounds[i], bounds[i + 1], depth + 1, False)
+
+        walk(tree.root, None, None, 0, True)
+        assert len({depth for _, depth in leaves}) == 1  # Perfect balance
+        for (leaf, _), (next_leaf, _) in zip(leaves, leaves[1:]):
+            assert leaf.next is next_leaf
+        assert leaves[-1][0].next is None
+        return [k for leaf, _ in leaves for k in leaf.keys]
+
+    BPT = BPlusTree(fan_out=4)
+    test_items = [
+        [1, 1],
+        [2, 2],
+        [3, 3],
+        [4, 4],
+        [5, 5],
+        [12, 12]
+    ]
+
+    # .get() should work if tree is empty
+    for key, _ in test_items:
+        assert BPT.get(key) is None
+    assert BPT.size() == 0 and BPT.min() is None and BPT.delete(1) is False
+
+    # .put() should work, .get() should work if tree has items
+    for key, value in test_items:
+        assert BPT.get(key) is None
+        BPT.put(key, value)
+        assert BPT.get(key) == value
+    assert not BPT.root.is_leaf()
+    assert check(BPT) == [1, 2, 3, 4, 5, 12]
+
+    # subsequent puts should override previous puts
+    BPT.put(1, 1)
+    BPT.put(1, 2)
+    assert BPT.get(1) == 2 and BPT.size() == 6
+
+    # .delete_min(), .delete_max() and .delete() should work
+    BPT.delete_min()
+    BPT.delete_max()
+    assert check(BPT) == [2, 3, 4, 5]
+    for key in [3, 2, 5, 4]:
+        assert BPT.delete(key) is None
+        check(BPT)
+    assert BPT.root.is_leaf() and BPT.size() == 0
+    assert BPT.delete_max() is False
+
+    # .from_items() should bulk-load a valid tree for any size
+    for n in range(100):
+        BPT2 = BPlusTree.from_items([(key, -key) for key in range(n)], 3)
+        assert check(BPT2) == list(range(n))
+        BPT2.put(n, -n)
+        assert check(BPT2) == list(range(n + 1))
+
+    # All operations should match a sorted reference under random churn
+    from bisect import bisect_left as bl, bisect_right as br
+    for fan_out in [3, 4, 5, 16]:
+        BPT3 = BPlusTree.from_items([(key, key) for key in range(0, 300, 3)],
+                                    fan_out)
+        reference = {key: key for key in range(0, 300, 3)}
+        for step in range(5000):
+            key = randint(0, 300)
+            if randint(0, 1):
+                BPT3.put(key, -key)
+                reference[key] = -key
+            else:
+                assert (BPT3.delete(key) is None) == (key in reference)
+                reference.pop(key, None)
+            assert BPT3.get(key) == reference.get(key)
+            if step % 100 == 0:
+                keys = sorted(reference)
+                assert check(BPT3) == keys
+                for key in range(-1, 302):
+                    assert BPT3.rank(key) == bl(keys, key)
+                    i = br(keys, key)
+                    assert BPT3.floor(key) == (keys[i - 1] if i else None)
+                    i = bl(keys, key)
+                    assert BPT3.ceiling(key) == (keys[i] if i < len(keys)
+                                                 else None)
+                for rank in range(len(keys)):
+                    assert BPT3.select(rank) == keys[rank]
+                lo, hi = randint(-5, 305), randint(-5, 305)
+                expected = [key for key in keys if lo <= key <= hi]
+                assert BPT3.range_count(lo, hi) == len(expected)
+                assert list(BPT3.range_iter(lo, hi)) == [
+                    (key, reference[key]) for key in expected]
+        assert BPT3.get_many(range(301)) == [reference.get(key)
+                                             for key in range(301)]
+    print('Assertions successful')
@@ -1,5 +1,23 @@
+from operator import itemgetter
+
+
+def sorted_unique_items(items) -> list:
+    """Returns key:value pairs of items sorted by key, keeping only the
+    last pair of duplicate keys. O(n) if items are already sorted
+    """
+    unique = []
+    for item in sorted(items, key=itemgetter(0)):  # Stable sort
+        if unique and unique[-1][0] == item[0]:
+            unique[-1] = item
+        else:
+            unique.append(item)
+    return unique
+
+
 class BinaryNode:
     """Implements a binary tree node"""
+    __slots__ = ['key', 'value', 'left', 'right']
+
     def __init__(self, key, value,
                  left=None,
                  right=None):
@@ -8,7 +26,10 @@ class BinaryNode:
 
 
 class BinarySearchTree:
-    """Implements https://en.wikipedia.org/wiki/Binary_search_tree"""
+    """Implements https://en.wikipedia.org/wiki/Binary_search_tree.
+    All operations are iterative, so that degenerate trees (e.g. built from
+    sorted keys) do not hit Python's recursion limit.
+    """
     def __init__(self):
         self.root = None
         self.upserted_node = None
@@ -16,27 +37,75 @@ class BinarySearchTree:
     def __str__(self):
         return str(self.keys())
 
+    @classmethod
+    def from_items(cls, items) -> 'BinarySearchTree':
+        """Returns a perfectly balanced tree holding all key:value pairs
+        of items (the last pair wins for duplicate keys).
+        O(n) for sorted items, else O(n log n)
+        """
+        tree = cls()
+        items = sorted_unique_items(items)
+        tree.root = tree._build(items, 0, len(items))
+        return tree
+
     def get(self, key):
         """Returns value of key if key is in tree, else None"""
         node = self._get(key)
         return node.value if node else None
 
+    def get_many(self, keys) -> list:
+        """Returns a list with the value of each key (None if not in tree)"""
+        get = self._get
+        return [node.value if node else None for node in map(get, keys)]
+
     def put(self, key, value) -> BinaryNode:
         """Inserts key:value into tree, returns pointer to upserted node"""
-        self.root = self._put(self.root, key, value)
+        parent, node = None, self.root
+        while node is not None:
+            if key == node.key:
+                node.value = value
+                self.upserted_node = node
+                return node
+            parent = node
+            node = node.right if key > node.key else node.left
+        self.upserted_node = BinaryNode(key, value)
+        if parent is None:
+            self.root = self.upserted_node
+        elif key > parent.key:
+            parent.right = self.upserted_node
+        else:
+            parent.left = self.upserted_node
         return self.upserted_node
 
     def delete(self, key) -> None or False:
-        """Deletes key from tree. Returns None if successful, False if not."""
-        if self.root is None:
+        """Deletes key from tree. Returns None if successful, False if not.
+        Implements https://en.wikipedia.org/wiki/Binary_search_tree#Deletion
+        """
+        parent, node = None, self.root
+        while node is not None and key != node.key:
+            parent = node
+            node = node.right if key > node.key else node.left
+        if node is None:
             return False
-        self.root = self._delete(self.root, key)
+        if node.left is not None and node.right is not None:
+            # Replace key:value with those of the successor,
+            # then delete the successor instead (it has no left child)
+            parent, successor = node, node.right
+            while successor.left is not None:
+                parent, successor = successor, successor.left
+            node.key, node.value = successor.key, successor.value
+            node = successor
+        self._replace_child(parent, node,
+                            node.left if node.left is not None else node.right)
 
     def del_min(self):
         """Deletes the smallest key from the tree"""
         if self.root is None:
             return False
-        self.root = self._del_min(self.root)
+        parent, node = None, self.root
+        while node.left is not None:
+            parent, node = node, node.left
+        self._replace_child(parent, node, node.right)
 
     def min(self, node=None) -> BinaryNode or None:
         """Return node with smallest key, leveraging symmetric order of tree"""
@@ -66,18 +135,34 @@ class BinarySearchTree:
         self.traverse(self.root, q, 'inorder')
         return q
 
+    def iter_keys(self, order='inorder', start=None):
+        """Lazily yields the keys of the tree in pre-, in-, or postorder.
+        With start, iteration resumes at start instead of at the beginning:
+        inorder at the smallest key >= start, pre- and postorder at start
+        itself, which must then be in the tree (else raises KeyError).
+        Each step takes O(1) amortized time, resuming O(height).
+        """
+        for node in self._iter_nodes(self.root, order, start):
+            yield node.key
+
+    def __iter__(self):
+        return self.iter_keys()
+
     def traverse(self, node: BinaryNode, queue: [], order: str):
         """Traverses the tree in pre-, in-, or postorder
         and stores value in queue
         """
-        assert order in {'preorder', 'inorder', 'postorder'}
-        if node is None:
-            return
-        queue.append(node.key) if order == 'preorder' else None
-        self.traverse(node.left, queue, order)
-        queue.append(node.key) if order == 'inorder' else None
-        self.traverse(node.right, queue, order)
-        queue.append(node.key) if order == 'postorder' else None
+        queue.extend(n.key for n in self._iter_nodes(node, order))
+
+    def _build(self, items: list, lo: int, hi: int) -> BinaryNode or None:
+        # Recursively builds a balanced subtree from sorted items[lo:hi]
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        key, value = items[mid]
+        return BinaryNode(key, value,
+                          self._build(items, lo, mid),
+                          self._build(items, mid + 1, hi))
 
     def _get(self, key) -> BinaryNode or False:
         # Iteratively search for key in tree
@@ -91,50 +176,95 @@ class BinarySearchTree:
                 node = node.left
         return False
 
-    def _put(self, node: BinaryNode, key, value) -> BinaryNode:
-        # Recursively put key:value pair into tree
-        if node is None:
-            self.upserted_node = BinaryNode(key, value)
-            return self.upserted_node
-        if key > node.key:
-            node.right = self._put(node.right, key, value)
-        elif key < node.key:
-            node.left = self._put(node.left, key, value)
-        elif key == node.key:
-            node.value = value
-            self.upserted_node = node
-        return node
-
-    def _delete(self, node: BinaryNode, key) -> BinaryNode or None:
-        """Implements
-        https://en.wikipedia.org/wiki/Binary_search_tree#Deletion
-        """
-        if node is None:
-            return None
-        if key == node.key:
-            if node.left is None and node.right is None:
-                return None
-            elif node.left is None and node.right is not None:
-                return node.right
-            elif node.left is not None and node.right is None:
-                return node.left
-            elif node.left is not None and node.right is not None:
-                min_node = self.min(node.right)
-                new_key, new_value = min_node.key, min_node.value
-                node.right = self._del_min(node.right)
-                node.key, node.value = new_key, new_value
-        elif key > node.key:
-            node.right = self._delete(node.right, key)
-        elif key < node.key:
-            node.left = self._delete(node.left, key)
-        return node
-
-    def _del_min(self, node: BinaryNode) -> BinaryNode:
-        # Traverses tree to the left until leaf node is reached
-        if node.left is None:
-            return node.right
-        node.left = self._del_min(node.left)
-        return node
+    def _replace_child(self, parent: BinaryNode or None, node: BinaryNode,
+                       child: BinaryNode or None):
+        # Replaces node by child below parent (or as root if parent is None)
+        if parent is None:
+            self.root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+
+    def _iter_nodes(self, node: BinaryNode, order: str, start=None):
+        # Dispatches to the generator implementing order
+        assert order in {'preorder', 'inorder', 'postorder'}
+        if order == 'inorder':
+            return self._inorder(node, start)
+        elif order == 'preorder':
+            return self._preorder(node, start)
+        return self._postorder(node, start)
+
+    def _path_to(self, node: BinaryNode, key) -> list:
+        # Returns the nodes from node down to the node holding key
+        path = []
+        while node is not None:
+            path.append(node)
+            if key == node.key:
+                return path
+            node = node.right if key > node.key else node.left
+        raise KeyError(key)
+
+    def _inorder(self, node: BinaryNode, start=None):
+        # Iterative inorder traversal with an explicit stack of the
+        # ancestors whose key is yet to be yielded
+        stack = []
+        while node is not None:  # Seek the smallest key >= start
+            if start is None or not node.key < start:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+        while stack:
+            node = stack.pop()
+            yield node
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def _preorder(self, node: BinaryNode, start=None):
+        # Iterative preorder traversal with an explicit stack of the
+        # subtrees that are yet to be traversed
+        stack = [node] if node is not None else []
+        if start is not None:
+            # Pending right subtrees of all ancestors that were left via
+            # their left child, just like after reaching start from node
+            path = self._path_to(node, start)
+            stack = [parent.right for parent, child in zip(path, path[1:])
+                     if child is parent.left and parent.right is not None]
+            stack.append(path[-1])
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+
+    def _postorder(self, node: BinaryNode, start=None):
+        # Iterative postorder traversal with an explicit stack of
+        # (node, expanded) pairs. Expanded nodes are yielded when popped,
+        # other nodes are expanded into their subtrees first
+        stack = [(node, False)] if node is not None else []
+        if start is not None:
+            path = self._path_to(node, start)
+            stack = []
+            for parent, child in zip(path, path[1:]):
+                stack.append((parent, True))
+                if child is parent.left and parent.right is not None:
+                    stack.append((parent.right, False))
+            stack.append((path[-1], True))
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                yield node
+                continue
+            stack.append((node, True))
+            if node.right is not None:
+                stack.append((node.right, False))
+            if node.left is not None:
+                stack.append((node.left, False))
 
 
 if __name__ == '__main__':
@@ -191,3 +321,77 @@ if __name__ == '__main__':
     for key, value in test_items:
         BST.put(key, value)
     assert BST.keys() == test_key_sorted
+
+    # .from_items() should build a balanced tree and let later pairs win
+    def height(node):
+        return 0 if node is None else 1 + max(height(node.left),
+                                              height(node.right))
+
+    BST2 = BinarySearchTree.from_items([(key, key) for key in range(1000)]
+                                       + [(5, 'five')])
+    assert BST2.keys() == list(range(1000))
+    assert height(BST2.root) == 10
+    assert BST2.get(5) == 'five'
+    BST3 = BinarySearchTree.from_items([(3, 'c'), (1, 'a'), (2, 'b')])
+    assert BST3.root.key == 2 and BST3.keys() == [1, 2, 3]
+    assert BinarySearchTree.from_items([]).root is None
+
+    # .get_many() should match .get()
+    assert BST3.get_many([0, 1, 2, 3, 4]) == [None, 'a', 'b', 'c', None]
+
+    # Iterators should match the recursive definition of each order
+    def recursive_keys(node, order):
+        if node is None:
+            return []
+        left = recursive_keys(node.left, order)
+        right = recursive_keys(node.right, order)
+        return {'preorder': [node.key] + left + right,
+                'inorder': left + [node.key] + right,
+                'postorder': left + right + [node.key]}[order]
+
+    from random import sample
+    BST4 = BinarySearchTree()
+    for key in sample(range(200), 150):
+        BST4.put(key, key)
+    for order in ['preorder', 'inorder', 'postorder']:
+        expected = recursive_keys(BST4.root, order)
+        assert list(BST4.iter_keys(order)) == expected
+        q = []
+        BST4.traverse(BST4.root, q, order)
+        assert q == expected
+        # Resuming from any key should yield the rest of the traversal
+        for i, key in enumerate(expected):
+            assert list(BST4.iter_keys(order, start=key)) == expected[i:]
+    assert list(BST4.iter_keys(start=199.5)) == []
+    assert list(BST4) == sorted(BST4.keys())
+    try:
+        next(BST4.iter_keys('preorder', start=-1))
+        assert False
+    except KeyError:
+        pass
+
+    # Iterators should support early termination
+    keys = BST4.iter_keys()
+    assert [next(keys) for _ in range(3)] == BST4.keys()[:3]
+
+    # Iterative .delete() should match a dict under random operations
+    reference = {key: key for key in BST4.keys()}
+    for key in sample(range(200), 200):
+        assert (BST4.delete(key) is None) == (key in reference)
+        reference.pop(key, None)
+        assert BST4.keys() == sorted(reference)
+    assert BST4.root is None
+
+    # Sorted keys (a degenerate tree) should not hit the recursion limit
+    BST5 = BinarySearchTree()
+    n = 20000
+    for key in range(n):
+        BST5.put(key, key)
+    assert BST5.get(n - 1) == n - 1
+    assert BST5.keys() == list(range(n))
+    assert list(BST5.iter_keys('preorder', start=n - 10)) == \
+        list(range(n - 10, n))
+    assert next(BST5.iter_keys('postorder')) == n - 1
+    BST5.del_min()
+    BST5.delete(n - 1)
+    assert BST5.min().key == 1 and BST5.max().key == n - 2
@@ -2,12 +2,37 @@ chaining = {
     'LOAD_FACTOR_MIN': 0.25,
     'LOAD_FACTOR_MAX': 1,
     'DOWNSIZE_FACTOR': 0.5,
-    'UPSIZE_FACTOR': 2
+    'UPSIZE_FACTOR': 2,
+    'REHASH_STEPS': 4  # Buckets migrated per operation when incremental
 }
 
 probing = {
     'LOAD_FACTOR_MIN': 0.25,
     'LOAD_FACTOR_MAX': 0.75,
     'DOWNSIZE_FACTOR': 0.5,
+    'UPSIZE_FACTOR': 2,
+    'REHASH_STEPS': 8  # Slots migrated per operation when incremental
+}
+
+robin_hood = {
+    'LOAD_FACTOR_MIN': 0.25,
+    'LOAD_FACTOR_MAX': 0.9,
+    'DOWNSIZE_FACTOR': 0.5,
     'UPSIZE_FACTOR': 2
 }
+
+swiss = {
+    'LOAD_FACTOR_MIN': 0.25,
+    'LOAD_FACTOR_MAX': 0.875,  # Counting tombstones
+    'DOWNSIZE_FACTOR': 0.5,
+    'UPSIZE_FACTOR': 2,
+    'GROUP_WIDTH': 16  # Control bytes scanned at once
+}
+
+b_plus_tree = {
+    'FAN_OUT': 64  # Max. keys per leaf and max. children per internal node
+}
+
+mmap_index = {
+    'LOAD_FACTOR': 0.5  # Slots are sized once per build, never resized
+}
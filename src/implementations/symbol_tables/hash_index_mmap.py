@@ -0,0 +1,227 @@
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from hashlib import blake2b
+
+from src.implementations.symbol_tables import config
+
+HEADER = struct.Struct('<4sIQQ')  # magic, version, slot count, load
+SLOT = struct.Struct('<QQ')  # key hash (0 marks an empty slot), value
+MAGIC, VERSION = b'HIDX', 1
+
+
+def stable_hash(key) -> int:
+    """Returns a non-zero 64-bit hash of key (str, bytes or int) that, unlike
+    hash(), is the same in every process
+    """
+    if isinstance(key, str):
+        data = b's' + key.encode()
+    elif isinstance(key, bytes):
+        data = b'b' + key
+    elif isinstance(key, int):
+        data = b'i' + str(key).encode()
+    else:
+        raise TypeError(f'Unsupported key type {type(key).__name__}')
+    h = int.from_bytes(blake2b(data, digest_size=8).digest(), 'little')
+    return h or 1
+
+
+class MmapHashIndex:
+    """Read-only, file-backed hash index mapping keys to unsigned 64-bit
+    values (e.g. offsets into a data file). The file is a fixed-size header
+    followed by fixed-width slots of (stable 64-bit key hash, value), using
+    https://en.wikipedia.org/wiki/Linear_probing like HashSet. Opening it
+    only maps the file via mmap (O(1), no load phase), and lookups unpack
+    just the slots they probe, so the table may be far larger than RAM.
+    Keys themselves are not stored: two keys with equal 64-bit hashes (odds
+    of about n^2 / 2^65) are treated as the same key.
+    Build or atomically rebuild the file with MmapHashIndex.build().
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size < HEADER.size:
+                raise ValueError(f'{path} is not a version {VERSION} '
+                                 f'hash index')
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.load = HEADER.unpack_from(self.mmap)
+        if magic != MAGIC or version != VERSION:
+            self.mmap.close()
+            raise ValueError(f'{path} is not a version {VERSION} hash index')
+        if len(self.mmap) != HEADER.size + self.size * SLOT.size:
+            self.mmap.close()
+            raise ValueError(f'{path} is truncated')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @classmethod
+    def build(cls, path: str, items, count: int = None,
+              load_factor: float = config.mmap_index['LOAD_FACTOR']
+              ) -> 'MmapHashIndex':
+        """Writes all key:value pairs of items (the last pair wins for
+        duplicate keys) into a new index file at path and opens it.
+        With count (an upper bound of the number of items), items are
+        streamed straight into the file, else only their hashes and values
+        are buffered (16 bytes per item) to size the table first.
+        Raises ValueError as soon as there are more distinct keys than
+        count, i.e. before the load factor is exceeded.
+        The file is written under a temporary name and then renamed over
+        path, so readers see either the complete old or the complete new
+        index, and readers that already opened the old one keep using it.
+        """
+        if count is None:
+            buffered = array('Q')
+            for key, value in items:
+                buffered.extend((stable_hash(key), value))
+            count = len(buffered) // 2
+            items = zip(buffered[::2], buffered[1::2])
+            hashed = True
+        else:
+            hashed = False
+        size = max(1, int(count / load_factor) + 1)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'r+b') as file:
+                file.truncate(HEADER.size + size * SLOT.size)  # Zeroed
+                with mmap.mmap(file.fileno(), 0) as table:
+                    load = cls._fill(table, size, items, hashed, count)
+                    HEADER.pack_into(table, 0, MAGIC, VERSION, size, load)
+                    table.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return cls(path)
+
+    def get(self, key):
+        """Returns value of key if key in index, else None"""
+        return self._get(stable_hash(key))
+
+    def get_many(self, keys) -> list:
+        """Returns a list with the value of each key (None if not in index)"""
+        get = self._get
+        return [get(stable_hash(key)) for key in keys]
+
+    def contains(self, key) -> bool:
+        """Returns True if key is in index, else False"""
+        return self._get(stable_hash(key)) is not None
+
+    def close(self):
+        """Unmaps the index file"""
+        self.mmap.close()
+
+    def _get(self, h: int):
+        # Linear probing from the home slot of h until h or an empty slot
+        table, size, unpack_from = self.mmap, self.size, SLOT.unpack_from
+        index = h % size
+        while True:
+            slot_hash, value = unpack_from(table, HEADER.size
+                                           + index * SLOT.size)
+            if slot_hash == h:
+                return value
+            if slot_hash == 0:
+                return None
+            index = index + 1 if index + 1 < size else 0
+
+    @staticmethod
+    def _fill(table: mmap.mmap, size: int, items, hashed: bool,
+              count: int) -> int:
+        # Inserts all items into the zeroed slots of table, returns load.
+        # size > count, so checking count also keeps one slot empty
+        load = 0
+        for key, value in items:
+            h = key if hashed else stable_hash(key)
+            index = h % size
+            while True:
+                offset = HEADER.size + index * SLOT.size
+                slot_hash = SLOT.unpack_from(table, offset)[0]
+                if slot_hash == 0 or slot_hash == h:
+                    break
+                index = index + 1 if index + 1 < size else 0
+            if slot_hash == 0:
+                load += 1
+                if load > count:
+                    raise ValueError(f'More than {count} items')
+            SLOT.pack_into(table, offset, h, value)
+        return load
+
+
+if __name__ == '__main__':
+    import subprocess
+    import sys
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'index.bin')
+
+    # Hashes should be stable across processes, unlike hash()
+    script = ('from src.implementations.symbol_tables.hash_index_mmap '
+              'import stable_hash; print(stable_hash("key"))')
+    output = subprocess.check_output([sys.executable, '-c', script])
+    assert int(output) == stable_hash('key')
+    assert len({stable_hash(key) for key in ['1', b'1', 1]}) == 3
+
+    # .build() should work from an iterator, with and without count
+    items = ((f'key{i}', i * 10) for i in range(1000))
+    with MmapHashIndex.build(path, items) as index:
+        assert index.load == 1000 and index.size == 2001
+        assert all(index.get(f'key{i}') == i * 10 for i in range(1000))
+        assert index.get('key1000') is None and not index.contains(b'key1')
+    items = [(i, i) for i in range(100)] + [(5, 0)]
+    with MmapHashIndex.build(path, iter(items), count=len(items)) as index:
+        assert index.load == 100 and index.get(5) == 0
+        assert index.get_many([1, 99, 100]) == [1, 99, None]
+
+    # Reopening should need no load phase and give the same results
+    index = MmapHashIndex(path)
+    assert index.get(42) == 42 and index.load == 100
+
+    # Rebuilding should replace the file atomically, while readers of the
+    # old file keep a consistent view
+    with MmapHashIndex.build(path, [(42, 4242)]) as new_index:
+        assert new_index.get(42) == 4242 and new_index.get(1) is None
+    assert index.get(42) == 42 and index.get(1) == 1
+    index.close()
+    assert os.listdir(directory) == ['index.bin']  # No temporary files left
+
+    # Overflowing count should fail without touching the existing file
+    try:
+        MmapHashIndex.build(path, [(i, i) for i in range(10)], count=1)
+        assert False
+    except ValueError:
+        pass
+    try:  # Fits physically (21 slots), but would exceed the load factor
+        MmapHashIndex.build(path, [(i, i) for i in range(18)], count=10)
+        assert False
+    except ValueError:
+        pass
+    assert MmapHashIndex(path).get(42) == 4242
+    assert os.listdir(directory) == ['index.bin']
+
+    # Other files should be rejected
+    with open(path, 'wb') as file:
+        file.write(b'not an index' * 10)
+    try:
+        MmapHashIndex(path)
+        assert False
+    except ValueError:
+        pass
+    for content in [b'', MAGIC]:  # Shorter than the header
+        with open(path, 'wb') as file:
+            file.write(content)
+        try:
+            MmapHashIndex(path)
+            assert False
+        except ValueError:
+            pass
+    os.remove(path)
+    os.rmdir(directory)
+    print('Assertions successful')
@@ -0,0 +1,193 @@
+from src.implementations.symbol_tables import config
+
+
+class RobinHoodHashMap:
+    """Implements https://en.wikipedia.org/wiki/Hash_table#Associative_arrays,
+    using open addressing with
+    https://en.wikipedia.org/wiki/Hash_table#Robin_Hood_hashing
+    for collision resolution and backward-shift deletion (no tombstones).
+    Keys, values and cached hashes live in flat parallel lists, so neither
+    put() nor get() allocates per-entry containers.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.keys = [None] * size
+        self.values = [None] * size
+        self.hashes = [None] * size  # None marks an empty slot
+        self.load = 0
+
+    def __str__(self):
+        items = [(k, v) for h, k, v in zip(self.hashes, self.keys, self.values)
+                 if h is not None]
+        return f'{items} | size: {self.size} | load: {self.load}'
+
+    def get(self, key):
+        """Returns value of key in hash map if key in hash map, else None"""
+        i = self._find(key)
+        return self.values[i] if i >= 0 else None
+
+    def put(self, key, value):
+        """Puts key:value into hash map, resizing underlying table if needed"""
+        if self._insert(hash(key), key, value):
+            self.load += 1
+            if self.load / self.size >= config.robin_hood['LOAD_FACTOR_MAX']:
+                self._upsize()
+        return
+
+    def delete(self, key) -> bool:
+        """Deletes key from hash map. Returns True if successful, else False"""
+        i = self._find(key)
+        if i < 0:
+            return False
+        # Shifting subsequent displaced entries back by one slot, which
+        # keeps every probe sequence intact without tombstones
+        size, hashes, keys, values = (self.size, self.hashes,
+                                      self.keys, self.values)
+        j = (i + 1) % size
+        while hashes[j] is not None and (j - hashes[j]) % size != 0:
+            hashes[i], keys[i], values[i] = hashes[j], keys[j], values[j]
+            i, j = j, (j + 1) % size
+        hashes[i] = keys[i] = values[i] = None
+        self.load -= 1
+        if self.load / self.size <= config.robin_hood['LOAD_FACTOR_MIN']:
+            self._downsize()
+        return True
+
+    def _find(self, key) -> int:
+        # Returns the slot index of key, or -1 if key is not in hash map.
+        # Stops early at the first entry that is closer to its home slot
+        # than key would be, as Robin Hood insertion would have put key there
+        h = hash(key)
+        size, hashes, keys = self.size, self.hashes, self.keys
+        i = h % size
+        dist = 0
+        while True:
+            slot_hash = hashes[i]
+            if slot_hash is None or (i - slot_hash) % size < dist:
+                return -1
+            if slot_hash == h and keys[i] == key:
+                return i
+            i = (i + 1) % size
+            dist += 1
+
+    def _insert(self, h: int, key, value) -> bool:
+        # Robin Hood insertion: walks the probe sequence and swaps with any
+        # entry that is closer to its home slot ("richer") than the entry
+        # being inserted. Returns True if a new key was added.
+        size, hashes, keys, values = (self.size, self.hashes,
+                                      self.keys, self.values)
+        i = h % size
+        dist = 0
+        while True:
+            slot_hash = hashes[i]
+            if slot_hash is None:
+                hashes[i], keys[i], values[i] = h, key, value
+                return True
+            if slot_hash == h and keys[i] == key:
+                values[i] = value
+                return False
+            slot_dist = (i - slot_hash) % size
+            if slot_dist < dist:
+                hashes[i], h = h, slot_hash
+                keys[i], key = key, keys[i]
+                values[i], value = value, values[i]
+                dist = slot_dist
+            i = (i + 1) % size
+            dist += 1
+
+    def _downsize(self):
+        # Downsize underlying arrays (allocate less memory)
+        return self._resize(config.robin_hood['DOWNSIZE_FACTOR'])
+
+    def _upsize(self):
+        # Upsize underlying arrays (allocate more memory)
+        return self._resize(config.robin_hood['UPSIZE_FACTOR'])
+
+    def _resize(self, factor: float):
+        # Resize underlying arrays by factor:float, reusing cached hashes
+        new_size = max(1, int(self.size * factor))
+        if new_size <= self.load:
+            return
+        entries = [(h, k, v) for h, k, v
+                   in zip(self.hashes, self.keys, self.values)
+                   if h is not None]
+        self.size = new_size
+        self.keys = [None] * new_size
+        self.values = [None] * new_size
+        self.hashes = [None] * new_size
+        for h, k, v in entries:
+            self._insert(h, k, v)
+        return
+
+
+if __name__ == '__main__':
+    from random import randint
+
+    initial_size = 5
+    RH = RobinHoodHashMap(initial_size)
+    test_items = [
+        [1, 1],
+        [2, 2],
+        [3, 3],
+        [4, 4],
+        [5, 5],
+        [12, 12]
+    ]
+
+    # .get() should work if RH is empty
+    for key, _ in test_items:
+        assert RH.get(key) is None
+
+    # .put() and, .get() should work if RH has items
+    for key, value in test_items:
+        assert RH.get(key) is None
+        RH.put(key, value)
+        assert RH.get(key) == value
+    print(f'RH AFTER PUTS:\n{RH}\n*********************')
+
+    # delete() should work, .get() should work after items have been deleted
+    for key, value in test_items:
+        assert RH.get(key) == value
+        assert RH.delete(key) is True
+        assert RH.get(key) is None
+    assert RH.delete(1) is False
+
+    # subsequent puts should override previous puts
+    RH.put(1, 1)
+    RH.put(1, 2)
+    assert RH.get(1) == 2 and RH.load == 1
+
+    # upsize should work
+    RH2 = RobinHoodHashMap(initial_size)
+    for key, value in test_items:
+        RH2.put(key, value)
+    assert RH2.size == initial_size * config.robin_hood['UPSIZE_FACTOR']
+    assert RH2.size == len(RH2.keys) == len(RH2.hashes)
+
+    # Colliding keys (same home slot) should all be found, before and
+    # after backward-shift deletions
+    RH3 = RobinHoodHashMap(64)
+    colliding = [i * 64 for i in range(20)]
+    for key in colliding:
+        RH3.put(key, str(key))
+    for key in colliding[::2]:
+        assert RH3.delete(key) is True
+    for key in colliding:
+        assert RH3.get(key) == (None if key in colliding[::2] else str(key))
+
+    # Behavior should match a dict under random operations
+    RH4 = RobinHoodHashMap(2)
+    reference = {}
+    for _ in range(20000):
+        key = randint(0, 500)
+        operation = randint(0, 2)
+        if operation == 0:
+            RH4.put(key, key * 2)
+            reference[key] = key * 2
+        elif operation == 1:
+            assert RH4.delete(key) == (reference.pop(key, None) is not None)
+        assert RH4.get(key) == reference.get(key)
+        assert RH4.load == len(reference)
+    for key in range(501):
+        assert RH4.get(key) == reference.get(key)
+    print('Assertions successful')
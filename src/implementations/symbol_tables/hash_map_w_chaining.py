@@ -1,26 +1,58 @@
+from collections import Counter
+from time import perf_counter
+
 from pandas import DataFrame
 
 from src.implementations.symbol_tables import config
+from src.implementations.symbol_tables.hash_stats import HashStats
 
 
 class HashMap:
     """Implements https://en.wikipedia.org/wiki/Hash_table#Associative_arrays,
     using https://en.wikipedia.org/wiki/Hash_table#Separate_chaining
-    for collision resolution
+    for collision resolution.
+    With incremental=True, resizing is amortized like in Redis: the old and
+    new table coexist and every operation migrates at most REHASH_STEPS
+    buckets of the old table, instead of rehashing everything at once.
+    With stats=True, chain lengths per get/put and resizes are recorded in
+    self.stats (a HashStats), see get_stats().
     """
 
-    def __init__(self, size: int):
-        # List of lists implements chaining
+    def __init__(self, size: int, incremental=False, stats=False):
+        # List of lists implements chaining. Buckets stay None until their
+        # first entry, so allocating a table is a single C-level fill
         self.size = size
-        self.table = [[] for i in range(size)]
+        self.table = [None] * size
         self.load = 0
+        self.incremental = incremental
+        self.old_table = None  # Only set while incrementally resizing
+        self.rehash_index = 0  # Next bucket of old_table to migrate
+        self.stats = HashStats() if stats else None
 
     def __str__(self):
         return f'{self.table} | size: {self.size} | load: {self.load}'
 
+    @classmethod
+    def from_items(cls, items, incremental=False) -> 'HashMap':
+        """Returns a hash map holding all key:value pairs of items (the
+        last pair wins for duplicate keys), presized so that bulk-loading
+        them triggers no resize
+        """
+        items = dict(items)
+        hash_map = cls(int(len(items) / config.chaining['LOAD_FACTOR_MAX'])
+                       + 1, incremental)
+        for key, value in items.items():
+            hash_map._append(hash_map.table, [key, value])
+        hash_map.load = len(items)
+        return hash_map
+
     def get(self, key):
         """Returns value of key in hash map if key in hash map, else None"""
-        row = self.table[self._modular_hash(key)]
+        if self.old_table is not None:
+            self._rehash_step()
+        row = self._row(key)
+        if self.stats is not None:
+            self._record_probe(row, key)
         if len(row) < 0:
             print(f'\nKey {key} not in table')
             return None
@@ -28,14 +60,35 @@ class HashMap:
             if tup[0] == key:
                 return tup[1]
 
+    def get_many(self, keys) -> list:
+        """Returns a list with the value of each key (None if not in hash
+        map), binding the table once for the whole batch
+        """
+        if self.old_table is not None:
+            return [self.get(key) for key in keys]
+        table, size = self.table, self.size
+        values = []
+        for key in keys:
+            for k, v in table[hash(key) % size] or ():
+                if k == key:
+                    values.append(v)
+                    break
+            else:
+                values.append(None)
+        return values
+
     def put(self, key, value):
         """Puts key:value into hash map, resizing underlying table if needed"""
-        row = self.table[self._modular_hash(key)]
+        if self.old_table is not None:
+            self._rehash_step()
+        row = self._row(key)
+        if self.stats is not None:
+            self._record_probe(row, key)
         for tup in row:
             if tup[0] == key:
                 tup[1] = value
                 return
-        row.append([key, value])
+        self._append(self.table, [key, value])
         self.load += 1
         if self.load / self.size >= config.chaining['LOAD_FACTOR_MAX']:
             self._upsize()
@@ -43,7 +96,9 @@ class HashMap:
 
     def delete(self, key):
         """Deletes key from hash map. Returns True if successful, else False"""
-        row = self.table[self._modular_hash(key)]
+        if self.old_table is not None:
+            self._rehash_step()
+        row = self._row(key)
         if len(row) <= 0:
             print(f'Key {key} not in table')
             return False
@@ -56,10 +111,53 @@ class HashMap:
                 print(f'Deleted key {key} from table')
                 return True
 
+    def get_stats(self) -> dict:
+        """Returns the stats counters plus current size, load, load factor
+        and distribution of keys per bucket ({chain length: buckets})
+        """
+        stats = self.stats.as_dict() if self.stats is not None else {}
+        stats.update({
+            'size': self.size,
+            'load': self.load,
+            'load_factor': self.load / self.size,
+            'keys_per_bucket': dict(sorted(Counter(
+                len(row) if row else 0 for row in self.table).items())),
+        })
+        return stats
+
+    def _record_probe(self, row: list, key):
+        # Records the number of entries of row compared to find key
+        for i, tup in enumerate(row):
+            if tup[0] == key:
+                return self.stats.record_probe(i + 1)
+        self.stats.record_probe(len(row))
+
+    def _append(self, table: list, entry: list):
+        # Appends [key, value] entry to its bucket of table, creating the
+        # bucket on first insert
+        index = hash(entry[0]) % len(table)
+        row = table[index]
+        if row is None:
+            table[index] = [entry]
+        else:
+            row.append(entry)
+
     def _modular_hash(self, key) -> int:
         # Hashing key and using modulo operator to wrap it into self.size
         return hash(key) % self.size
 
+    def _row(self, key) -> list or tuple:
+        # Returns the bucket holding key (an empty tuple for buckets that
+        # were never used), which is in old_table if key has not been
+        # migrated yet (migrated buckets of old_table are None)
+        if self.old_table is not None:
+            old_row = self.old_table[hash(key) % len(self.old_table)]
+            if old_row:
+                for tup in old_row:
+                    if tup[0] == key:
+                        return old_row
+        return self.table[self._modular_hash(key)] or ()
+
     def _downsize(self):
         # Downsize underlying array (allocate less memory)
         return self._resize(config.chaining['DOWNSIZE_FACTOR'])
@@ -70,16 +168,49 @@ class HashMap:
 
     def _resize(self, factor: float):
         # Resize underlying array by factor:float
-        self.size = int(self.size * factor)
-        aux_table = [[] for i in range(self.size)]
-        for row in self.table:
-            for k, v in row:
-                aux_table[self._modular_hash(k)].append([k, v])
-        self.table = aux_table
+        if self.old_table is not None:
+            self._rehash_step(len(self.old_table))  # Finish pending resize
+        start = perf_counter()
+        self.size = max(1, int(self.size * factor))
+        aux_table = [None] * self.size
+        if self.incremental:
+            self.old_table, self.table = self.table, aux_table
+            self.rehash_index = 0
+        else:
+            for row in self.table:
+                for tup in row or ():
+                    self._append(aux_table, tup)
+            self.table = aux_table
+        if self.stats is not None:
+            self.stats.record_resize(perf_counter() - start)
+        return
+
+    def _rehash_step(self, steps=config.chaining['REHASH_STEPS']):
+        # Migrates up to steps buckets from old_table into table
+        # Inlines self._append(), as this runs on every operation
+        old_table, table, size = self.old_table, self.table, self.size
+        stop = min(self.rehash_index + steps, len(old_table))
+        for i in range(self.rehash_index, stop):
+            row = old_table[i]
+            if row:
+                for tup in row:
+                    index = hash(tup[0]) % size
+                    if table[index] is None:
+                        table[index] = [tup]
+                    else:
+                        table[index].append(tup)
+                old_table[i] = None
+        self.rehash_index = stop
+        if stop == len(old_table):
+            self.old_table = None
         return
 
 
 if __name__ == '__main__':
+    def buckets(hash_map: HashMap) -> DataFrame:
+        # Tabulates the buckets, showing unused (None) buckets as empty
+        return DataFrame([row or [] for row in hash_map.table])
+
     initial_size = 5
     HM = HashMap(initial_size)
     test_items = [
@@ -90,7 +221,7 @@ if __name__ == '__main__':
         [5, 5],
         [12, 12]
     ]
-    print(f'INITIAL EMPTY HM:\n{DataFrame(HM.table)}\n*********************')
+    print(f'INITIAL EMPTY HM:\n{buckets(HM)}\n*********************')
 
     # .get() should work if HM is empty
     for key, _ in test_items:
@@ -101,14 +232,14 @@ if __name__ == '__main__':
         assert HM.get(key) is None
         HM.put(key, value)
         assert HM.get(key) == value
-    print(f'HM AFTER PUTS:\n{DataFrame(HM.table)}\n*********************')
+    print(f'HM AFTER PUTS:\n{buckets(HM)}\n*********************')
 
     # delete() should work, .get() should work after items have been deleted
     for key, value in test_items:
         assert HM.get(key) == value
         HM.delete(key)
         assert HM.get(key) is None
-    print(f'HM AFTER DELETES:\n{DataFrame(HM.table)}\n*********************')
+    print(f'HM AFTER DELETES:\n{buckets(HM)}\n*********************')
 
     # subsequent puts should override previous puts
     HM.put(1, 1)
@@ -127,7 +258,7 @@ if __name__ == '__main__':
         HM2.put(key, value)
         added_items_counter += 1
 
-    print(f'HM2 AFTER UPSIZING:\n{DataFrame(HM2.table)}\n********************')
+    print(f'HM2 AFTER UPSIZING:\n{buckets(HM2)}\n********************')
     assert HM2.load == added_items_counter
     assert HM2.size == len(HM2.table)
     assert HM2.size == initial_size * config.chaining['UPSIZE_FACTOR']
@@ -141,7 +272,55 @@ if __name__ == '__main__':
         HM2.delete(key)
         deleted_items_counter += 1
 
-    print(f'HM2 AFTER DOWNSIZING:\n{DataFrame(HM2.table)}\n******************')
+    print(f'HM2 AFTER DOWNSIZING:\n{buckets(HM2)}\n******************')
     assert HM2.load == old_load - deleted_items_counter
     assert HM2.size == len(HM2.table)
     assert HM2.size == old_size * config.chaining['DOWNSIZE_FACTOR']
+
+    # Incremental resizing should keep all items reachable during migration
+    from random import randint
+    HM3 = HashMap(2, incremental=True)
+    reference = {}
+    migrations = 0
+    for _ in range(20000):
+        key = randint(0, 1000)
+        if randint(0, 2):
+            HM3.put(key, key * 2)
+            reference[key] = key * 2
+        elif key in reference:
+            HM3.delete(key)
+            del reference[key]
+        migrations += HM3.old_table is not None
+        assert HM3.get(key) == reference.get(key)
+        assert HM3.load == len(reference)
+        if HM3.old_table is not None:
+            assert HM3.rehash_index < len(HM3.old_table)
+    assert migrations > 0
+    for key in range(1001):
+        assert HM3.get(key) == reference.get(key)
+
+    # .from_items() should presize, bulk-load and let later pairs win
+    HM4 = HashMap.from_items([(key, key) for key in range(100)] + [(1, 'one')])
+    assert HM4.load == 100 and HM4.size == len(HM4.table) == 101
+    assert HM4.get(1) == 'one' and HM4.get(99) == 99
+    assert HM4.load / HM4.size < config.chaining['LOAD_FACTOR_MAX']
+
+    # .get_many() should match .get(), also while incrementally resizing
+    keys = list(range(-5, 105))
+    assert HM4.get_many(keys) == [HM4.get(key) for key in keys]
+    assert HM3.get_many(keys) == [reference.get(key) for key in keys]
+
+    # Stats should record chain lengths, resizes and keys per bucket
+    HM5 = HashMap(4, stats=True)
+    for key in [0, 4, 8]:  # Same bucket of a table of size 4
+        HM5.put(key, key)
+    assert HM5.get(8) == 8 and HM5.get(12) is None
+    stats = HM5.get_stats()
+    assert stats['probe_lengths'] == {0: 1, 1: 1, 2: 1, 3: 2}
+    assert stats['resizes'] == 0 and stats['keys_per_bucket'] == {0: 3, 3: 1}
+    HM5.put(1, 1)
+    stats = HM5.get_stats()
+    assert stats['resizes'] == 1 and stats['resize_seconds'] > 0
+    assert stats['size'] == 8 and stats['load_factor'] == 0.5
+    assert sum(k * n for k, n in stats['keys_per_bucket'].items()) == 4
+    assert 'resizes' not in HM4.get_stats()
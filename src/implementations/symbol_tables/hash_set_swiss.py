@@ -0,0 +1,195 @@
+from src.implementations.symbol_tables import config
+
+EMPTY = 0x80  # Control byte of a slot that was never used
+DELETED = 0xFE  # Control byte of a tombstone
+GROUP_WIDTH = config.swiss['GROUP_WIDTH']
+MULTIPLIER = 0x9E3779B97F4A7C15  # 2^64 / golden ratio, for Fibonacci hashing
+MASK_64 = (1 << 64) - 1
+
+
+class SwissHashSet:
+    """Implements https://en.wikipedia.org/wiki/Hash_table#Sets in the
+    style of https://abseil.io/about/design/swisstables.
+    Python hashes ints to themselves, so hash(key) is first scrambled via
+    https://en.wikipedia.org/wiki/Hash_function#Fibonacci_hashing: the top
+    bits of the result (h1) pick the first slot, while its low 7 bits (h2)
+    go into the control byte of the slot, which is otherwise EMPTY or
+    DELETED.
+    Lookups scan a whole group of GROUP_WIDTH control bytes at once with
+    bytearray.find (a C loop standing in for SIMD) and only compare keys
+    whose h2 and cached full hash match, which avoids nearly all __eq__
+    calls. The first GROUP_WIDTH - 1 control bytes are mirrored past the
+    end of the array, so groups never wrap around.
+    Size is always a power of two and at least GROUP_WIDTH.
+    """
+    def __init__(self, size=GROUP_WIDTH):
+        self.size = self._capacity(size)
+        self.shift = 64 - self.size.bit_length() + 1  # Top bits are h1
+        self.ctrl = bytearray([EMPTY]) * (self.size + GROUP_WIDTH - 1)
+        self.keys = [None] * self.size
+        self.hashes = [None] * self.size  # Cached full hashes
+        self.load = 0
+        self.deleted = 0  # Number of tombstones
+
+    def __str__(self):
+        keys = [k for k, h in zip(self.keys, self.hashes) if h is not None]
+        return f'{keys} | size: {self.size} | load: {self.load}'
+
+    def contains(self, key) -> bool:
+        """Returns True if key is in hash set, else False"""
+        return self._find(key, hash(key)) >= 0
+
+    def put(self, key):
+        """Inserts key into hash set"""
+        h = hash(key)
+        if self._find(key, h) >= 0:
+            return f'Insertion error: Key {key} is already in hash set'
+        self._insert(h, key)
+        self.load += 1
+        if ((self.load + self.deleted) / self.size
+                >= config.swiss['LOAD_FACTOR_MAX']):
+            # Purging tombstones suffices if they take up most used slots
+            self._resize(1 if self.deleted > self.load
+                         else config.swiss['UPSIZE_FACTOR'])
+        return
+
+    def delete(self, key):
+        """Deletes key from hash set"""
+        i = self._find(key, hash(key))
+        if i < 0:
+            return f'Deletion error: Key {key} is NOT part of this hash set'
+        # A tombstone keeps probe sequences that passed slot i intact
+        self._set_ctrl(i, DELETED)
+        self.keys[i] = self.hashes[i] = None
+        self.load -= 1
+        self.deleted += 1
+        if (self.load / self.size < config.swiss['LOAD_FACTOR_MIN']
+                and self.size > GROUP_WIDTH):
+            self._resize(config.swiss['DOWNSIZE_FACTOR'])
+        return
+
+    def _find(self, key, h: int) -> int:
+        # Returns the slot index of key, or -1 if key is not in hash set.
+        # Probes group after group until a group contains an EMPTY slot
+        ctrl, hashes, keys = self.ctrl, self.hashes, self.keys
+        mask = self.size - 1
+        scrambled = (h * MULTIPLIER) & MASK_64
+        h2 = scrambled & 0x7F
+        pos = scrambled >> self.shift
+        for _ in range(0, self.size, GROUP_WIDTH):
+            end = pos + GROUP_WIDTH
+            match = ctrl.find(h2, pos, end)
+            while match >= 0:
+                i = match & mask
+                if hashes[i] == h and keys[i] == key:
+                    return i
+                match = ctrl.find(h2, match + 1, end)
+            if ctrl.find(EMPTY, pos, end) >= 0:
+                return -1
+            pos = end & mask
+        return -1
+
+    def _insert(self, h: int, key):
+        # Puts key into the first EMPTY or DELETED slot of its probe
+        # sequence. Assumes that key is not in hash set yet
+        ctrl, mask = self.ctrl, self.size - 1
+        scrambled = (h * MULTIPLIER) & MASK_64
+        pos = scrambled >> self.shift
+        while True:
+            end = pos + GROUP_WIDTH
+            free = [i for i in (ctrl.find(EMPTY, pos, end),
+                                ctrl.find(DELETED, pos, end)) if i >= 0]
+            if free:
+                i = min(free) & mask
+                if ctrl[i] == DELETED:
+                    self.deleted -= 1
+                self._set_ctrl(i, scrambled & 0x7F)
+                self.keys[i], self.hashes[i] = key, h
+                return
+            pos = end & mask
+
+    def _set_ctrl(self, i: int, byte: int):
+        # Sets control byte of slot i and of its mirror past the end
+        self.ctrl[i] = byte
+        if i < GROUP_WIDTH - 1:
+            self.ctrl[self.size + i] = byte
+
+    def _capacity(self, size: int) -> int:
+        # Rounds size up to a power of two of at least GROUP_WIDTH
+        return max(GROUP_WIDTH, 1 << (size - 1).bit_length())
+
+    def _resize(self, factor: float):
+        # Resize underlying arrays by factor:float, reusing cached hashes
+        # and dropping all tombstones
+        entries = [(h, k) for h, k in zip(self.hashes, self.keys)
+                   if h is not None]
+        self.size = self._capacity(int(self.size * factor))
+        self.shift = 64 - self.size.bit_length() + 1
+        self.ctrl = bytearray([EMPTY]) * (self.size + GROUP_WIDTH - 1)
+        self.keys = [None] * self.size
+        self.hashes = [None] * self.size
+        self.deleted = 0
+        for h, k in entries:
+            self._insert(h, k)
+        return
+
+
+if __name__ == '__main__':
+    from random import randint
+
+    SHS = SwissHashSet(5)
+    test_keys = [1, 2, 3, 4, 5, 12, 'a', (1, 2), -1, -2]
+
+    # Size should be rounded up to a power of two of at least GROUP_WIDTH
+    assert SHS.size == GROUP_WIDTH
+    assert len(SHS.ctrl) == SHS.size + GROUP_WIDTH - 1
+
+    # .put() and .contains() should work
+    for key in test_keys:
+        assert not SHS.contains(key)
+        SHS.put(key)
+        assert SHS.contains(key)
+    assert SHS.put(1) == 'Insertion error: Key 1 is already in hash set'
+    assert SHS.load == len(test_keys)
+    print(SHS)
+
+    # .delete() should leave tombstones that are reused by later puts
+    for key in test_keys[:4]:
+        SHS.delete(key)
+        assert not SHS.contains(key)
+    assert SHS.deleted == 4 and SHS.ctrl.count(DELETED) >= 4
+    assert SHS.delete(1).startswith('Deletion error')
+    for key in test_keys[5:]:
+        assert SHS.contains(key)
+
+    # Keys with equal hashes should still be told apart
+    SHS2 = SwissHashSet()
+    colliding = [-1, -2] + [i * (2 ** 61 - 1) for i in range(27)]
+    assert hash(-1) == hash(-2) and len({hash(k) for k in colliding}) == 2
+    for key in colliding:
+        SHS2.put(key)
+    assert all(SHS2.contains(key) for key in colliding)
+    assert SHS2.size == 64
+
+    # Mirrored control bytes should match their originals
+    for i in range(GROUP_WIDTH - 1):
+        assert SHS2.ctrl[i] == SHS2.ctrl[SHS2.size + i]
+
+    # Behavior should match a set under random operations
+    SHS3 = SwissHashSet(2)
+    reference = set()
+    for _ in range(20000):
+        key = randint(0, 1000)
+        if randint(0, 2):
+            SHS3.put(key)
+            reference.add(key)
+        else:
+            SHS3.delete(key)
+            reference.discard(key)
+        assert SHS3.contains(key) == (key in reference)
+        assert SHS3.load == len(reference)
+    for key in range(1001):
+        assert SHS3.contains(key) == (key in reference)
+    for i in range(GROUP_WIDTH - 1):
+        assert SHS3.ctrl[i] == SHS3.ctrl[SHS3.size + i]
+    print('Assertions successful')
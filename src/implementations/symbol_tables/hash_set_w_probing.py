@@ -1,23 +1,85 @@
+from collections import Counter
+from time import perf_counter
+
 from src.implementations.symbol_tables import config
+from src.implementations.symbol_tables.hash_stats import HashStats
+
+_DELETED = object()  # Marks keys deleted from old_set while resizing
 
 
 class HashSet:
     """Implements https://en.wikipedia.org/wiki/Hash_table#Sets,
     using https://en.wikipedia.org/wiki/Linear_probing
-    for collision resolution
+    for collision resolution.
+    With incremental=True, resizing is amortized like in Redis: the old and
+    new array coexist and every operation migrates at most REHASH_STEPS
+    slots of the old array, instead of rehashing everything at once.
+    Migrated slots stay in old_set (clearing them would break its probe
+    sequences); keys found in old_set below rehash_index are ignored.
+    With stats=True, probe lengths per contains/put and resizes are
+    recorded in self.stats (a HashStats), see get_stats().
     """
-    def __init__(self, size):
+    def __init__(self, size, incremental=False, stats=False):
         self.size = size
-        self.set = [None for i in range(size)]
+        self.set = [None] * size
         self.load = 0
+        self.incremental = incremental
+        self.old_set = None  # Only set while incrementally resizing
+        self.rehash_index = 0  # Next slot of old_set to migrate
+        self.stats = HashStats() if stats else None
+
+    @classmethod
+    def from_items(cls, keys, incremental=False) -> 'HashSet':
+        """Returns a hash set holding all keys, presized so that
+        bulk-loading them triggers no resize
+        """
+        keys = dict.fromkeys(keys)  # Drops duplicates, keeps order
+        hash_set = cls(int(len(keys) / config.probing['LOAD_FACTOR_MAX'])
+                       + 1, incremental)
+        for key in keys:
+            _, index = hash_set._linear_probing(key)
+            hash_set.set[index] = key
+        hash_set.load = len(keys)
+        return hash_set
 
     def contains(self, key) -> bool:
         """Returns True if key is in hash set, else False"""
-        return self._linear_probing(key)[0]
+        if self.old_set is not None:
+            self._rehash_step()
+            if self._old_index(key) >= 0:
+                return True
+        key_in_set, index = self._linear_probing(key)
+        if self.stats is not None:
+            self._record_probe(key, index)
+        return key_in_set
+
+    def contains_many(self, keys) -> list:
+        """Returns a list with True for each key in hash set, else False,
+        binding the underlying array once for the whole batch
+        """
+        if self.old_set is not None:
+            return [self.contains(key) for key in keys]
+        set_, size = self.set, self.size
+        found = []
+        for key in keys:
+            index = hash(key) % size
+            while True:
+                slot = set_[index]
+                if slot is None or slot == key:
+                    found.append(slot is not None)
+                    break
+                index = index + 1 if index + 1 < size else 0
+        return found
 
     def put(self, key):
         """Inserts key into hash set"""
+        if self.old_set is not None:
+            self._rehash_step()
+            if self._old_index(key) >= 0:
+                return f'Insertion error: Key {key} is already in hash set'
         key_in_set, index = self._linear_probing(key)
+        if self.stats is not None:
+            self._record_probe(key, index)
         if key_in_set:
             return f'Insertion error: Key {key} is already in hash set'
         self.set[index] = key
@@ -28,35 +90,70 @@ class HashSet:
 
     def delete(self, key):
         """Deletes key from hash set"""
-        key_in_set, i = self._linear_probing(key)
-        if not key_in_set:
-            return f'Deletion error: Key {key} is NOT part of this hash set'
-        self.set[i] = None
+        old_index = -1
+        if self.old_set is not None:
+            self._rehash_step()
+            old_index = self._old_index(key)
+        if old_index >= 0:
+            self.old_set[old_index] = _DELETED
+        else:
+            key_in_set, i = self._linear_probing(key)
+            if not key_in_set:
+                return (f'Deletion error: Key {key} '
+                        f'is NOT part of this hash set')
+            self._shift_backwards(i)
         self.load -= 1
 
-        # Moving subsequent items backwards to not break linear probing
-        if not self.set[(i + len(self.set) - 1) % len(self.set)] is None:
-            next = i + 1
-            while self.set[next % self.size] is not None:  # Wrap around
-                self.set[i], self.set[next] = self.set[next], self.set[i]
-                i += 1
-                next += 1
-
         if self.load / self.size < config.probing['LOAD_FACTOR_MIN']:
             self._downsize()
         return
 
+    def get_stats(self) -> dict:
+        """Returns the stats counters plus current size, load, load factor,
+        distribution of displacements ({distance from home slot: keys}) and
+        of clusters ({run length of occupied slots: runs})
+        """
+        stats = self.stats.as_dict() if self.stats is not None else {}
+        displacements = Counter(
+            (i - self._modular_hash(key)) % self.size
+            for i, key in enumerate(self.set) if key is not None)
+        clusters = Counter()
+        if None in self.set:  # Start at a free slot to count wrapped runs
+            start = self.set.index(None)
+            run = 0
+            for key in self.set[start:] + self.set[:start] + [None]:
+                if key is not None:
+                    run += 1
+                elif run:
+                    clusters[run] += 1
+                    run = 0
+        stats.update({
+            'size': self.size,
+            'load': self.load,
+            'load_factor': self.load / self.size,
+            'displacements': dict(sorted(displacements.items())),
+            'clusters': dict(sorted(clusters.items())),
+        })
+        return stats
+
+    def _record_probe(self, key, index: int):
+        # Records the number of slots probed from key's home slot to index
+        self.stats.record_probe((index - self._modular_hash(key)) % self.size
+                                + 1)
+
     def _linear_probing(self, key, set_=None) -> bool or int:
         """Linear probing for key through hash set.
         Returns tuple:
         (True, index) for search hits at index,
         (False, index) for search misses;
-        where index is the final index checked/first index with key==None
+        where index is the final index checked/first index with key==None.
+        Gives up after one lap, as a resized old_set may have no free slot
         """
         set_ = set_ or self.set
-        index = self._modular_hash(key)  # Entry point for linear probing
-        while True:
-            if index >= self.size:  # Wrap around
+        size = len(set_)
+        index = hash(key) % size  # Entry point for linear probing
+        for _ in range(size):
+            if index >= size:  # Wrap around
                 index = 0
             if set_[index] is None:
                 break
@@ -69,6 +166,31 @@ class HashSet:
         # Hashing key and using modulo operator to wrap it into self.size
         return hash(key) % self.size
 
+    def _shift_backwards(self, i: int):
+        # Empties slot i, then moves subsequent keys of the cluster back
+        # into the gap unless that would move them before their home slot
+        # (https://en.wikipedia.org/wiki/Linear_probing#Deletion)
+        set_, size = self.set, self.size
+        set_[i] = None
+        j = i
+        while True:
+            j = (j + 1) % size
+            if set_[j] is None:
+                return
+            home = self._modular_hash(set_[j])
+            if (i < home <= j) if i <= j else (home > i or home <= j):
+                continue  # Key at j is still reachable from its home slot
+            set_[i], set_[j] = set_[j], None
+            i = j
+
+    def _old_index(self, key) -> int:
+        # Returns index of key in old_set if key has not been migrated yet
+        # (and was not deleted since), else -1
+        if self.old_set is None:
+            return -1
+        key_in_set, index = self._linear_probing(key, self.old_set)
+        return index if key_in_set and index >= self.rehash_index else -1
+
     def _downsize(self):
         # Downsize underlying array (allocate less memory)
         return self._resize(config.probing['DOWNSIZE_FACTOR'])
@@ -79,16 +201,43 @@ class HashSet:
 
     def _resize(self, factor: float):
         # Resize underlying array by factor:float
-        self.size = int(self.size * factor)
-        new_set = [None for i in range(self.size)]
-        for key in self.set:
-            if key is None:
-                continue
-            key_in_set, index = self._linear_probing(key, new_set)
-            if key_in_set:
-                return 'Syntax Error while resizing'
-            new_set[index] = key
-        self.set = new_set
+        if self.old_set is not None:
+            self._rehash_step(len(self.old_set))  # Finish pending resize
+        start = perf_counter()
+        self.size = max(1, int(self.size * factor))
+        new_set = [None] * self.size  # C-level fill, no Python loop
+        if self.incremental:
+            self.old_set, self.set = self.set, new_set
+            self.rehash_index = 0
+        else:
+            for key in self.set:
+                if key is None:
+                    continue
+                key_in_set, index = self._linear_probing(key, new_set)
+                if key_in_set:
+                    return 'Syntax Error while resizing'
+                new_set[index] = key
+            self.set = new_set
+        if self.stats is not None:
+            self.stats.record_resize(perf_counter() - start)
+        return
+
+    def _rehash_step(self, steps=config.probing['REHASH_STEPS']):
+        # Migrates the keys of up to steps slots from old_set into set
+        # Keys of old_set are never in set yet, so this only needs to probe
+        # for the first free slot (inlined, as it runs on every operation)
+        old_set, set_, size = self.old_set, self.set, self.size
+        stop = min(self.rehash_index + steps, len(old_set))
+        for i in range(self.rehash_index, stop):
+            key = old_set[i]
+            if key is not None and key is not _DELETED:
+                index = hash(key) % size
+                while set_[index] is not None:
+                    index = index + 1 if index + 1 < size else 0
+                set_[index] = key
+        self.rehash_index = stop
+        if stop == len(old_set):
+            self.old_set = None
         return
 
 
@@ -146,3 +295,49 @@ if __name__ == '__main__':
     assert HS2.load == old_load - deleted_items_counter
     assert HS2.size == len(HS2.set)
     assert HS2.size == old_size * config.probing['DOWNSIZE_FACTOR']
+
+    # Deletion should keep all remaining keys reachable
+    from random import randint
+    for incremental in [False, True]:
+        HS3 = HashSet(2, incremental=incremental)
+        reference = set()
+        for _ in range(20000):
+            key = randint(0, 1000)
+            if randint(0, 2):
+                HS3.put(key)
+                reference.add(key)
+            else:
+                HS3.delete(key)
+                reference.discard(key)
+            assert HS3.contains(key) == (key in reference)
+            assert HS3.load == len(reference)
+        for key in range(1001):
+            assert HS3.contains(key) == (key in reference)
+
+    # .from_items() should presize and bulk-load
+    HS4 = HashSet.from_items(list(range(30)) + [1, 2, 3])
+    assert HS4.load == 30 and HS4.size == len(HS4.set) == 41
+    assert HS4.load / HS4.size < config.probing['LOAD_FACTOR_MAX']
+
+    # .contains_many() should match .contains()
+    keys = list(range(-5, 50))
+    assert HS4.contains_many(keys) == [HS4.contains(key) for key in keys]
+    HS5 = HashSet(64, incremental=True)
+    for key in range(48):
+        HS5.put(key)
+    assert HS5.old_set is not None
+    assert HS5.contains_many(keys) == [0 <= key < 48 for key in keys]
+
+    # Stats should record probe lengths, resizes, displacements and clusters
+    HS6 = HashSet(8, stats=True)
+    for key in [0, 8, 16, 3]:  # 0, 8 and 16 share home slot 0
+        HS6.put(key)
+    assert HS6.contains(16) and not HS6.contains(24)
+    stats = HS6.get_stats()
+    assert stats['probe_lengths'] == {1: 2, 2: 1, 3: 2, 5: 1}
+    assert stats['displacements'] == {0: 2, 1: 1, 2: 1}
+    assert stats['clusters'] == {4: 1} and stats['resizes'] == 0
+    for key in [5, 6]:
+        HS6.put(key)
+    assert HS6.get_stats()['resizes'] == 1 and HS6.size == 16
+    assert sum(HS6.get_stats()['displacements'].values()) == HS6.load
@@ -0,0 +1,75 @@
+from collections import Counter
+
+
+class HashStats:
+    """Counters for hash table instrumentation: a histogram of probe
+    lengths (entries compared per lookup, i.e. chain positions for
+    separate chaining and slots for linear probing), plus the number and
+    total duration of resizes
+    """
+    def __init__(self):
+        self.probe_lengths = Counter()
+        self.resizes = 0
+        self.resize_seconds = 0.0
+
+    def __str__(self):
+        return str(self.as_dict())
+
+    def record_probe(self, length: int):
+        """Adds the probe length of one lookup to the histogram"""
+        self.probe_lengths[length] += 1
+
+    def record_resize(self, seconds: float):
+        """Counts one resize that took seconds"""
+        self.resizes += 1
+        self.resize_seconds += seconds
+
+    def mean_probe_length(self) -> float:
+        """Returns the mean probe length, or 0 if there were no lookups"""
+        lookups = sum(self.probe_lengths.values())
+        return (sum(length * count
+                    for length, count in self.probe_lengths.items())
+                / lookups if lookups else 0.0)
+
+    def percentile_probe_length(self, percentile: float) -> int:
+        """Returns the smallest probe length that at least percentile % of
+        all lookups did not exceed, or 0 if there were no lookups
+        """
+        rank = sum(self.probe_lengths.values()) * percentile / 100
+        seen = 0
+        for length in sorted(self.probe_lengths):
+            seen += self.probe_lengths[length]
+            if seen >= rank:
+                return length
+        return 0
+
+    def as_dict(self) -> dict:
+        """Returns all counters as a dict"""
+        return {
+            'probe_lengths': dict(sorted(self.probe_lengths.items())),
+            'mean_probe_length': self.mean_probe_length(),
+            'p99_probe_length': self.percentile_probe_length(99),
+            'resizes': self.resizes,
+            'resize_seconds': self.resize_seconds,
+        }
+
+
+if __name__ == '__main__':
+    stats = HashStats()
+    assert stats.mean_probe_length() == 0.0
+    assert stats.percentile_probe_length(99) == 0
+
+    # Probe lengths should be counted and summarized
+    for length in [1, 1, 1, 2, 5]:
+        stats.record_probe(length)
+    assert stats.as_dict()['probe_lengths'] == {1: 3, 2: 1, 5: 1}
+    assert stats.mean_probe_length() == 2.0
+    assert stats.percentile_probe_length(50) == 1
+    assert stats.percentile_probe_length(80) == 2
+    assert stats.percentile_probe_length(99) == 5
+
+    # Resizes should be counted and timed
+    stats.record_resize(0.5)
+    stats.record_resize(0.25)
+    assert stats.resizes == 2 and stats.resize_seconds == 0.75
+    print(stats)
@@ -0,0 +1,176 @@
+from src.implementations.symbol_tables.red_black_bst import \
+    RedBlackTree, _RBNode
+
+
+class PersistentRedBlackTree(RedBlackTree):
+    """Implements a https://en.wikipedia.org/wiki/Persistent_data_structure
+    variant of RedBlackTree via path copying: updates never modify a node
+    that existed before, but copy every node they would change (the search
+    path plus O(1) siblings touched by rotations and color flips), so each
+    update allocates O(log n) nodes and all untouched subtrees are shared.
+    Hence, snapshot() is O(1) and snapshots stay consistent forever, while
+    readers of a snapshot never block (or even notice) the writer.
+    """
+    def __init__(self):
+        super().__init__()
+        self._fresh = {}  # id -> node copied during the current update
+
+    def snapshot(self) -> 'PersistentRedBlackTree':
+        """Returns a point-in-time copy of the tree in O(1). Both trees can
+        be read and updated independently afterwards.
+        """
+        snapshot = PersistentRedBlackTree()
+        snapshot.root = self.root
+        return snapshot
+
+    def put(self, key, value):
+        """Upserts key:value into tree"""
+        return self._path_copying(super().put, key, value)
+
+    def delete(self, key) -> None or False:
+        """Deletes key from tree. Returns None if successful, False if not."""
+        return self._path_copying(super().delete, key)
+
+    def delete_min(self) -> None or False:
+        """Deletes the smallest key from the tree"""
+        return self._path_copying(super().delete_min)
+
+    def delete_max(self) -> None or False:
+        """Deletes the largest key from the tree"""
+        return self._path_copying(super().delete_max)
+
+    def _path_copying(self, update, *args):
+        # Runs update, tracking the nodes it copies, so that every node is
+        # copied at most once per update
+        self._fresh = {}
+        try:
+            return update(*args)
+        finally:
+            self._fresh = {}
+
+    def _copy(self, node: _RBNode) -> _RBNode:
+        # Returns a mutable copy of node, which is node itself if it was
+        # already copied during the current update
+        if self._fresh.get(id(node)) is node:
+            return node
+        copy = _RBNode(node.key, node.value, node.isRed, node.left, node.right)
+        self._fresh[id(copy)] = copy
+        return copy
+
+    # All methods below copy each node before the inherited implementation
+    # modifies it
+
+    def _put(self, node: _RBNode, key, value) -> _RBNode:
+        return super()._put(node and self._copy(node), key, value)
+
+    def _delete(self, node: _RBNode, key) -> _RBNode or None:
+        return super()._delete(self._copy(node), key)
+
+    def _delete_min(self, node: _RBNode) -> _RBNode or None:
+        return super()._delete_min(self._copy(node))
+
+    def _delete_max(self, node: _RBNode) -> _RBNode or None:
+        return super()._delete_max(self._copy(node))
+
+    def _redden_root(self):
+        self.root = self._copy(self.root)
+        super()._redden_root()
+
+    def _blacken_root(self):
+        if self.root is not None:
+            self.root = self._copy(self.root)
+        super()._blacken_root()
+
+    def _rotate_left(self, parent: _RBNode) -> _RBNode:
+        parent = self._copy(parent)
+        parent.right = self._copy(parent.right)
+        return super()._rotate_left(parent)
+
+    def _rotate_right(self, parent: _RBNode) -> _RBNode:
+        parent = self._copy(parent)
+        parent.left = self._copy(parent.left)
+        return super()._rotate_right(parent)
+
+    def _flip_colors(self, parent: _RBNode):
+        assert self._fresh.get(id(parent)) is parent
+        parent.left = self._copy(parent.left)
+        parent.right = self._copy(parent.right)
+        super()._flip_colors(parent)
+
+
+if __name__ == '__main__':
+    from random import randint
+
+    def nodes(node) -> list:
+        # Returns all nodes below node, asserting red-black invariants
+        if node is None:
+            return []
+        assert node.right is None or not node.right.isRed
+        assert not (node.isRed and node.left and node.left.isRed)
+        below = nodes(node.left) + nodes(node.right)
+        assert node.size == len(below) + 1
+        return [node] + below
+
+    PRBT = PersistentRedBlackTree()
+    test_items = [
+        [1, 1],
+        [2, 2],
+        [3, 3],
+        [4, 4],
+        [5, 5],
+        [12, 12]
+    ]
+
+    # .put() and .get() should work like in RedBlackTree
+    for key, value in test_items:
+        assert PRBT.get(key) is None
+        PRBT.put(key, value)
+        assert PRBT.get(key) == value
+
+    # Snapshots should not see later updates, and vice versa
+    snapshot = PRBT.snapshot()
+    PRBT.put(1, 'one')
+    PRBT.delete(2)
+    PRBT.delete_max()
+    assert snapshot.get(1) == 1 and snapshot.get(2) == 2
+    assert snapshot.get(12) == 12 and snapshot.size() == 6
+    assert PRBT.get(1) == 'one' and PRBT.get(2) is None
+    assert PRBT.get(12) is None and PRBT.size() == 4
+    snapshot.delete_min()
+    assert PRBT.get(1) == 'one'
+
+    # Each update should copy O(log n) nodes and share all others
+    PRBT2 = PersistentRedBlackTree.from_items([(k, k) for k in range(1024)])
+    for update, args in [('put', (2048, 0)), ('put', (512, 'x')),
+                         ('delete', (100,)), ('delete_min', ()),
+                         ('delete_max', ())]:
+        old_ids = {id(node) for node in nodes(PRBT2.root)}
+        getattr(PRBT2, update)(*args)
+        copied = [node for node in nodes(PRBT2.root)
+                  if id(node) not in old_ids]
+        assert 0 < len(copied) <= 3 * 2 * 11, (update, len(copied))
+
+    # Every snapshot should stay intact under random updates
+    PRBT3 = PersistentRedBlackTree()
+    reference = {}
+    versions = []
+    for step in range(3000):
+        key = randint(0, 200)
+        operation = randint(0, 3)
+        if operation < 2:
+            PRBT3.put(key, step)
+            reference[key] = step
+        elif operation == 2:
+            assert (PRBT3.delete(key) is None) == (key in reference)
+            reference.pop(key, None)
+        elif reference:
+            PRBT3.delete_min()
+            del reference[min(reference)]
+        if step % 100 == 0:
+            versions.append((PRBT3.snapshot(), dict(reference)))
+    for snapshot, expected in versions + [(PRBT3, reference)]:
+        nodes(snapshot.root)
+        assert snapshot.size() == len(expected)
+        assert snapshot.get_many(range(201)) == [expected.get(key)
+                                                 for key in range(201)]
+    print('Assertions successful')
@@ -1,9 +1,19 @@
+from src.implementations.symbol_tables.binary_search_tree import \
+    sorted_unique_items
+
+
 class _RBNode:
-    """Implements a Binary Node with additional color bit"""
+    """Implements a Binary Node with additional color bit
+    and the number of nodes in its subtree
+    """
+    __slots__ = ['key', 'value', 'left', 'right', 'isRed', 'size']
+
     def __init__(self, key, value, isRed, left=None, right=None):
         self.key, self.value = key, value
         self.left, self.right = left, right
         self.isRed = isRed
+        self.size = (1 + (left.size if left else 0)
+                     + (right.size if right else 0))
 
 
 class RedBlackTree:
@@ -11,19 +21,178 @@ class RedBlackTree:
     def __init__(self):
         self.root = None
 
+    @classmethod
+    def from_items(cls, items) -> 'RedBlackTree':
+        """Returns a balanced tree holding all key:value pairs of items
+        (the last pair wins for duplicate keys), without any rotations.
+        O(n) for sorted items, else O(n log n)
+        """
+        tree = cls()
+        items = sorted_unique_items(items)
+        height = (len(items) + 1).bit_length() - 1
+        tree.root = tree._build(items, 0, len(items), height)
+        return tree
+
     def get(self, key):
         """Returns value of key if key in tree, else False"""
         node = self._get(self.root, key)
         return (node.value if node else None)
 
+    def get_many(self, keys) -> list:
+        """Returns a list with the value of each key (None if not in tree)"""
+        root, get = self.root, self._get
+        return [node.value if node else None
+                for node in (get(root, key) for key in keys)]
+
     def put(self, key, value):
         """Upserts key:value into tree"""
         self.root = self._put(self.root, key, value)
         self.root.isRed = False
 
-    def delete(self, key):
-        """Currently not implemented"""
-        pass
+    def size(self) -> int:
+        """Returns the number of keys in the tree"""
+        return self._size(self.root)
+
+    def min(self):
+        """Returns the smallest key, or None if tree is empty"""
+        return self.select(0)
+
+    def max(self):
+        """Returns the largest key, or None if tree is empty"""
+        return self.select(self.size() - 1)
+
+    def rank(self, key) -> int:
+        """Returns the number of keys smaller than key"""
+        node, rank = self.root, 0
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                rank += self._size(node.left) + 1
+                node = node.right
+            else:
+                return rank + self._size(node.left)
+        return rank
+
+    def select(self, rank: int):
+        """Returns the key with the given rank (i.e. the rank+1-th smallest
+        key), or None if rank is out of bounds
+        """
+        if not 0 <= rank < self.size():
+            return None
+        node = self.root
+        while True:
+            left_size = self._size(node.left)
+            if rank < left_size:
+                node = node.left
+            elif rank > left_size:
+                rank -= left_size + 1
+                node = node.right
+            else:
+                return node.key
+
+    def floor(self, key):
+        """Returns the largest key <= key, or None if there is none"""
+        node, floor = self.root, None
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                floor, node = node.key, node.right
+            else:
+                return node.key
+        return floor
+
+    def ceiling(self, key):
+        """Returns the smallest key >= key, or None if there is none"""
+        node, ceiling = self.root, None
+        while node is not None:
+            if key > node.key:
+                node = node.right
+            elif key < node.key:
+                ceiling, node = node.key, node.left
+            else:
+                return node.key
+        return ceiling
+
+    def range_count(self, lo, hi) -> int:
+        """Returns the number of keys in [lo, hi]"""
+        if hi < lo:
+            return 0
+        count = self.rank(hi) - self.rank(lo)
+        return count + 1 if self._get(self.root, hi) else count
+
+    def range_iter(self, lo, hi):
+        """Lazily yields the (key, value) pairs with keys in [lo, hi]
+        in ascending order, skipping all subtrees outside of the range
+        """
+        stack, node = [], self.root
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left if lo < node.key else None
+            else:
+                node = stack.pop()
+                if hi < node.key:
+                    return
+                if lo <= node.key:
+                    yield node.key, node.value
+                node = node.right
+
+    def delete(self, key) -> None or False:
+        """Deletes key from tree. Returns None if successful, False if not.
+        Implements left-leaning red-black deletion: on the way down, red
+        links are pushed into the search path, so that the node finally
+        removed is never a 2-node. The way back up restores the invariants.
+        """
+        if self._get(self.root, key) is None:
+            return False
+        self._redden_root()
+        self.root = self._delete(self.root, key)
+        self._blacken_root()
+
+    def delete_min(self) -> None or False:
+        """Deletes the smallest key from the tree"""
+        if self.root is None:
+            return False
+        self._redden_root()
+        self.root = self._delete_min(self.root)
+        self._blacken_root()
+
+    def delete_max(self) -> None or False:
+        """Deletes the largest key from the tree"""
+        if self.root is None:
+            return False
+        self._redden_root()
+        self.root = self._delete_max(self.root)
+        self._blacken_root()
+
+    def _build(self, items: list, lo: int, hi: int,
+               height: int) -> _RBNode or None:
+        """Recursively builds a 2-3 tree of the given height from sorted
+        items[lo:hi], with 3-nodes encoded as a black node with a red left
+        child. A 2-3 tree of height h holds between 2^h - 1 and 3^h - 1
+        keys, so items are split as evenly as possible into 2 subtrees
+        (2-node) while they fit, else into 3 subtrees (3-node).
+        """
+        if height == 0:
+            return None
+        count = hi - lo
+        if count <= 2 * 3 ** (height - 1) - 1:  # 2-node
+            mid = lo + (count - 1) // 2
+            key, value = items[mid]
+            return _RBNode(key, value, False,
+                           self._build(items, lo, mid, height - 1),
+                           self._build(items, mid + 1, hi, height - 1))
+        small = lo + (count - 2) // 3  # 3-node
+        large = small + 1 + (hi - small - 2) // 2
+        key, value = items[small]
+        left = _RBNode(key, value, True,
+                       self._build(items, lo, small, height - 1),
+                       self._build(items, small + 1, large, height - 1))
+        key, value = items[large]
+        return _RBNode(key, value, False, left,
+                       self._build(items, large + 1, hi, height - 1))
 
     def _get(self, node: _RBNode, key) -> _RBNode or None:
         # Iteratively traverse tree in search of key
@@ -48,32 +217,117 @@ class RedBlackTree:
             node.left = self._put(node.left, key, value)
         elif key > node.key:
             node.right = self._put(node.right, key, value)
+        return self._balance(node)
+
+    def _delete(self, node: _RBNode, key) -> _RBNode or None:
+        """Recursively deletes key, which must be in the tree,
+        while maintaining Red-black RBT invariants.
+        """
+        if key < node.key:
+            if (not self._is_red(node.left)
+                    and not self._is_red(node.left.left)):
+                node = self._move_red_left(node)
+            node.left = self._delete(node.left, key)
+        else:
+            if self._is_red(node.left):
+                node = self._rotate_right(node)
+            if key == node.key and node.right is None:
+                return None
+            if (not self._is_red(node.right)
+                    and not self._is_red(node.right.left)):
+                node = self._move_red_right(node)
+            if key == node.key:  # Replace node with its successor
+                successor = node.right
+                while successor.left is not None:
+                    successor = successor.left
+                node.key, node.value = successor.key, successor.value
+                node.right = self._delete_min(node.right)
+            else:
+                node.right = self._delete(node.right, key)
+        return self._balance(node)
+
+    def _delete_min(self, node: _RBNode) -> _RBNode or None:
+        # Recursively deletes the smallest key below node
+        if node.left is None:
+            return None
+        if not self._is_red(node.left) and not self._is_red(node.left.left):
+            node = self._move_red_left(node)
+        node.left = self._delete_min(node.left)
+        return self._balance(node)
+
+    def _delete_max(self, node: _RBNode) -> _RBNode or None:
+        # Recursively deletes the largest key below node
+        if self._is_red(node.left):
+            node = self._rotate_right(node)
+        if node.right is None:
+            return None
+        if not self._is_red(node.right) and not self._is_red(node.right.left):
+            node = self._move_red_right(node)
+        node.right = self._delete_max(node.right)
+        return self._balance(node)
 
+    def _balance(self, node: _RBNode) -> _RBNode:
         # Maintaining invariants:
         # 1. Rotate left if node has a right-leaning red link
-        if (node.right and node.right.isRed
-                and (node.left is None or node.left.isRed is False)):
+        if self._is_red(node.right) and not self._is_red(node.left):
             node = self._rotate_left(node)
         # 2. Rotate right if node has red child link and a red grandchild link
-        if (node.left and node.left.left
-                and node.left.isRed and node.left.left.isRed):
+        if self._is_red(node.left) and self._is_red(node.left.left):
             node = self._rotate_right(node)
         # 3. Color-flip if node has two red children links
-        if (node.left and node.left.isRed
-                and node.right and node.right.isRed):
+        if self._is_red(node.left) and self._is_red(node.right):
+            self._flip_colors(node)
+        node.size = 1 + self._size(node.left) + self._size(node.right)
+        return node
+
+    def _move_red_left(self, node: _RBNode) -> _RBNode:
+        # Makes node.left or one of its children red, borrowing from the
+        # right sibling if it is a 3-node
+        self._flip_colors(node)
+        if self._is_red(node.right.left):
+            node.right = self._rotate_right(node.right)
+            node = self._rotate_left(node)
+            self._flip_colors(node)
+        return node
+
+    def _move_red_right(self, node: _RBNode) -> _RBNode:
+        # Makes node.right or one of its children red, borrowing from the
+        # left sibling if it is a 3-node
+        self._flip_colors(node)
+        if self._is_red(node.left.left):
+            node = self._rotate_right(node)
             self._flip_colors(node)
         return node
 
+    def _size(self, node: _RBNode or None) -> int:
+        # Null links have size 0
+        return node.size if node is not None else 0
+
+    def _is_red(self, node: _RBNode or None) -> bool:
+        # Null links are black
+        return node is not None and node.isRed
+
+    def _redden_root(self):
+        # Lets deletion treat the root like any node on a red link
+        if (not self._is_red(self.root.left)
+                and not self._is_red(self.root.right)):
+            self.root.isRed = True
+
+    def _blacken_root(self):
+        if self.root is not None:
+            self.root.isRed = False
+
     def _rotate_left(self, parent: _RBNode) -> _RBNode:
         # Fixes right-leaning red link to maintain the following invariant:
         # No right-leaning red links
         assert parent.right.isRed is True
-        assert parent.left is None or parent.left.isRed is False
         new_parent = parent.right
         parent.right = new_parent.left
         new_parent.left = parent
         new_parent.isRed = parent.isRed
         parent.isRed = True
+        new_parent.size = parent.size
+        parent.size = 1 + self._size(parent.left) + self._size(parent.right)
         return new_parent
 
     def _rotate_right(self, parent: _RBNode) -> _RBNode:
@@ -85,14 +339,18 @@ class RedBlackTree:
         new_parent.right = parent
         new_parent.isRed = parent.isRed
         parent.isRed = True
+        new_parent.size = parent.size
+        parent.size = 1 + self._size(parent.left) + self._size(parent.right)
         return new_parent
 
     def _flip_colors(self, parent: _RBNode):
         # Fixes parent with two red child links to maintain the invariant:
-        # Not more than two keys per (implicit) 2-3 node
-        assert parent.left.isRed == parent.right.isRed is True
-        parent.left.isRed = parent.right.isRed = False
-        parent.isRed = True
+        # Not more than two keys per (implicit) 2-3 node.
+        # Deletion uses the inverse flip to merge parent into its children
+        assert parent.left.isRed == parent.right.isRed != parent.isRed
+        parent.left.isRed = not parent.left.isRed
+        parent.right.isRed = not parent.right.isRed
+        parent.isRed = not parent.isRed
         return
 
 
@@ -121,3 +379,106 @@ if __name__ == '__main__':
     RBT.put(1, 1)
     RBT.put(1, 2)
     assert RBT.get(1) == 2
+
+    # .from_items() should build a valid red-black tree for any size
+    def black_height(node, lo=None, hi=None) -> int:
+        # Returns black height of node, asserting all invariants below it
+        if node is None:
+            return 0
+        assert (lo is None or lo < node.key) and (hi is None or node.key < hi)
+        assert node.right is None or not node.right.isRed
+        assert not (node.isRed and node.left and node.left.isRed)
+        left = black_height(node.left, lo, node.key)
+        assert left == black_height(node.right, node.key, hi)
+        return left + (not node.isRed)
+
+    for n in range(200):
+        RBT2 = RedBlackTree.from_items([(key, -key) for key in range(n)])
+        black_height(RBT2.root)
+        assert RBT2.root is None or not RBT2.root.isRed
+        assert all(RBT2.get(key) == -key for key in range(n))
+        RBT2.put(n, -n)  # Should still work after bulk-loading
+        black_height(RBT2.root)
+    RBT3 = RedBlackTree.from_items([(2, 'b'), (1, 'a'), (1, 'A')])
+    assert RBT3.get(1) == 'A'
+
+    # .get_many() should match .get()
+    assert RBT3.get_many([0, 1, 2, 3]) == [None, 'A', 'b', None]
+
+    # .delete(), .delete_min() and .delete_max() should keep invariants
+    from random import randint
+    RBT4 = RedBlackTree()
+    assert RBT4.delete(1) is False and RBT4.delete_min() is False
+    for key, value in test_items:
+        RBT4.put(key, value)
+    RBT4.delete_min()
+    RBT4.delete_max()
+    assert RBT4.get(1) is None and RBT4.get(12) is None
+    assert RBT4.get_many([2, 3, 4, 5]) == [2, 3, 4, 5]
+    assert RBT4.delete(1) is False
+    for key in [3, 2, 5, 4]:
+        assert RBT4.delete(key) is None
+        black_height(RBT4.root)
+    assert RBT4.root is None
+
+    RBT5 = RedBlackTree.from_items([(key, key) for key in range(0, 500, 2)])
+    reference = {key: key for key in range(0, 500, 2)}
+    for _ in range(20000):
+        key = randint(0, 500)
+        operation = randint(0, 3)
+        if operation == 0:
+            RBT5.put(key, key)
+            reference[key] = key
+        elif operation == 1:
+            assert (RBT5.delete(key) is None) == (key in reference)
+            reference.pop(key, None)
+        elif operation == 2 and reference:
+            RBT5.delete_min()
+            del reference[min(reference)]
+        elif operation == 3 and reference:
+            RBT5.delete_max()
+            del reference[max(reference)]
+        assert RBT5.get(key) == reference.get(key)
+        black_height(RBT5.root)
+        assert RBT5.root is None or not RBT5.root.isRed
+    assert RBT5.get_many(range(501)) == [reference.get(key)
+                                         for key in range(501)]
+
+    # Ordered operations should match a sorted list of the keys
+    def check_sizes(node) -> int:
+        if node is None:
+            return 0
+        assert node.size == (check_sizes(node.left)
+                             + check_sizes(node.right) + 1)
+        return node.size
+
+    for key in range(1, 500, 3):  # Churn above may have emptied RBT5
+        RBT5.put(key, key)
+        reference[key] = key
+    check_sizes(RBT5.root)
+    keys = sorted(reference)
+    assert RBT5.size() == len(keys)
+    assert RBT5.min() == keys[0] and RBT5.max() == keys[-1]
+    from bisect import bisect_left, bisect_right
+    for key in range(-1, 502):
+        assert RBT5.rank(key) == bisect_left(keys, key)
+        i = bisect_right(keys, key)
+        assert RBT5.floor(key) == (keys[i - 1] if i else None)
+        i = bisect_left(keys, key)
+        assert RBT5.ceiling(key) == (keys[i] if i < len(keys) else None)
+    for rank in range(-1, len(keys) + 1):
+        assert RBT5.select(rank) == (keys[rank] if 0 <= rank < len(keys)
+                                     else None)
+    for _ in range(1000):
+        lo, hi = randint(-10, 510), randint(-10, 510)
+        expected = [key for key in keys if lo <= key <= hi]
+        assert RBT5.range_count(lo, hi) == len(expected)
+        assert list(RBT5.range_iter(lo, hi)) == [(key, reference[key])
+                                                  for key in expected]
+
+    # .range_iter() should be lazy
+    window = RBT5.range_iter(keys[0], keys[-1])
+    assert next(window) == (keys[0], reference[keys[0]])
+    RBT6 = RedBlackTree()
+    assert RBT6.size() == 0 and RBT6.min() is None and RBT6.max() is None
+    assert RBT6.floor(1) is None and list(RBT6.range_iter(0, 1)) == []
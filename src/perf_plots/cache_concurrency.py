@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+from random import randint
+from time import sleep
+
+import perfplot
+
+from src.implementations.cache.backing_store import DictStore
+from src.implementations.cache.cache_lru_concurrent import \
+    ConcurrentLruCache
+from src.perf_plots.config import SAMPLE_SIZES
+
+SAMPLE_SIZE = SAMPLE_SIZES['CACHE_CONCURRENCY']
+KEY_SPACE = 2000
+REQUESTS_PER_THREAD = 200
+
+
+class SlowStore(DictStore):
+    """DictStore that simulates the round trip to a remote store"""
+    def get(self, key):
+        sleep(0.0001)
+        return super().get(key)
+
+
+def get_request_batches(n_threads: int) -> [[int]]:
+    return [[randint(0, KEY_SPACE - 1) for _ in range(REQUESTS_PER_THREAD)]
+            for _ in range(n_threads)]
+
+
+def serve_requests(batches: [[int]], shards: int):
+    store = SlowStore({i: i for i in range(KEY_SPACE)})
+    cache = ConcurrentLruCache(size=KEY_SPACE // 4, shards=shards,
+                               store=store)
+    with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+        list(executor.map(lambda batch: [cache.get_value(key)
+                                         for key in batch],
+                          batches))
+
+
+if __name__ == '__main__':
+    output = perfplot.bench(
+        setup=lambda n: get_request_batches(n),
+        kernels=[
+            lambda batches: serve_requests(batches, shards=1),
+            lambda batches: serve_requests(batches, shards=4),
+            lambda batches: serve_requests(batches, shards=16),
+        ],
+        labels=['Single global lock', '4 lock stripes', '16 lock stripes'],
+        xlabel=f'N threads serving {REQUESTS_PER_THREAD} requests each',
+        title='Concurrent LRU cache throughput',
+        n_range=range(1, SAMPLE_SIZE + 1),
+        equality_check=None
+    )
+
+    output.save(f'output/cache-concurrency_sample-size-{SAMPLE_SIZE}.png',
+                transparent=False,
+                bbox_inches="tight")
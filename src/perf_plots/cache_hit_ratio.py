@@ -0,0 +1,68 @@
+from itertools import accumulate
+from random import choices, seed
+
+from pandas import DataFrame
+
+from src.implementations.cache.backing_store import BackingStore
+from src.implementations.cache.cache_factory import CACHE_POLICIES, make_cache
+from src.perf_plots.config import SAMPLE_SIZES
+
+SAMPLE_SIZE = SAMPLE_SIZES['CACHE_HIT_RATIO']
+KEY_SPACE = 10000
+CACHE_SIZE = 500
+
+
+class CountingStore(BackingStore):
+    """Store that knows every key and counts how often it is read,
+    i.e. how often the cache missed
+    """
+    def __init__(self):
+        self.loads = 0
+
+    def get(self, key):
+        self.loads += 1
+        return key
+
+    def put(self, key, value):
+        pass
+
+
+def zipfian_trace(n: int, exponent=0.99) -> list:
+    cum_weights = list(accumulate(1 / (rank ** exponent)
+                                  for rank in range(1, KEY_SPACE + 1)))
+    return choices(range(KEY_SPACE), cum_weights=cum_weights, k=n)
+
+
+def scan_heavy_trace(n: int, scan_length=2 * CACHE_SIZE) -> list:
+    # Zipfian requests interrupted by sequential scans over keys that are
+    # never requested again
+    trace = []
+    zipfian = zipfian_trace(n)
+    next_scan_key = KEY_SPACE
+    for i in range(0, n, 2 * scan_length):
+        trace.extend(zipfian[i:i + scan_length])
+        trace.extend(range(next_scan_key, next_scan_key + scan_length))
+        next_scan_key += scan_length
+    return trace[:n]
+
+
+def hit_ratio(policy: str, trace: list) -> float:
+    store = CountingStore()
+    cache = make_cache(policy, size=CACHE_SIZE, store=store)
+    for key in trace:
+        cache.get_value(key)
+    return 1 - store.loads / len(trace)
+
+
+if __name__ == '__main__':
+    seed(0)
+    traces = {
+        'Zipfian': zipfian_trace(SAMPLE_SIZE),
+        'Zipfian + scans': scan_heavy_trace(SAMPLE_SIZE),
+    }
+    hit_ratios = DataFrame(
+        {workload: {policy: hit_ratio(policy, trace)
+                    for policy in CACHE_POLICIES}
+         for workload, trace in traces.items()})
+    print(f'Hit ratio per policy, cache size {CACHE_SIZE}, '
+          f'key space {KEY_SPACE}, {SAMPLE_SIZE} requests:\n{hit_ratios}')
@@ -0,0 +1,34 @@
+import tracemalloc
+
+from pandas import DataFrame
+
+from src.implementations.cache.backing_store import DictStore
+from src.implementations.cache.cache_lru import LruCache
+from src.implementations.cache.cache_lru_compact import CompactLruCache
+from src.perf_plots.config import SAMPLE_SIZES
+
+SAMPLE_SIZE = SAMPLE_SIZES['CACHE_MEMORY']
+
+
+def bytes_per_entry(cache_class, n: int) -> float:
+    # Keys and values already live in the store, so only the memory
+    # allocated by the cache's own bookkeeping is measured
+    store = DictStore({i: i for i in range(n)})
+    tracemalloc.start()
+    cache = cache_class(size=n, store=store)
+    for key in range(n):
+        cache.get_value(key)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert cache.load == n
+    return allocated / n
+
+
+if __name__ == '__main__':
+    sizes = [10 ** exponent for exponent in range(3, SAMPLE_SIZE + 1)]
+    memory = DataFrame(
+        {cache_class.__name__: {n: bytes_per_entry(cache_class, n)
+                                for n in sizes}
+         for cache_class in [LruCache, CompactLruCache]})
+    memory.index.name = 'entries'
+    print(f'Bytes per cached entry (excluding keys and values):\n{memory}')
@@ -1,8 +1,17 @@
 SAMPLE_SIZES = {
+  'CACHE_CONCURRENCY': 16,
+  'CACHE_HIT_RATIO': 100000,
+  'CACHE_MEMORY': 6,  # up to 10^6 entries
   'FIBONACCI': 11,
   'GRAPH_SEARCH': 100,  # min. 20
+  'HASH_LOAD_FACTORS': 5000,  # adversarial keys take O(n^2)
+  'HASH_RESIZE_LATENCY': 200000,
+  'HASH_SET_PROBING': 2 ** 16,  # slots, must be a power of two
   'KNAPSACK': 10,
-  'PRIORITY_QUEUE': 500,
+  'ORDERED_SYMBOL_TABLES': 1000000,
+  'PRIORITY_QUEUE': 7,  # 10^5 up to 10^7 items
+  'RED_BLACK_CHURN': 1000000,  # delete+put pairs
   'SORTING_INTEGERS': 500,
-  'SEARCHING_INTEGERS': 500
+  'SEARCHING_INTEGERS': 500,
+  'SYMBOL_TABLE_MEMORY': 6  # up to 10^6 keys
 }
@@ -1,7 +1,7 @@
 import perfplot
 
 from src.implementations.dynamic_programming.fibonacci import (
-    fibonacci_recursive, fibonacci_memoized,
+    fibonacci_recursive, fibonacci_memoized, fibonacci_lru_memoized,
     fibonacci_bottom_up, fibonacci_bottom_up_minified
 )
 from src.perf_plots.config import SAMPLE_SIZES
@@ -9,16 +9,24 @@ from src.perf_plots.config import SAMPLE_SIZES
 SAMPLE_SIZE = SAMPLE_SIZES['FIBONACCI']
 
 
+def fibonacci_lru_memoized_cold(n: int) -> int:
+    # Clears the cache first, as it would otherwise persist across runs
+    fibonacci_lru_memoized.cache_clear()
+    return fibonacci_lru_memoized(n)
+
+
 if __name__ == '__main__':
     output = perfplot.bench(
         setup=lambda n: n,
         kernels=[
             lambda n: fibonacci_recursive(n),
             lambda n: fibonacci_memoized(n, {}),
+            lambda n: fibonacci_lru_memoized_cold(n),
             lambda n: fibonacci_bottom_up(n, {}),
             lambda n: fibonacci_bottom_up_minified(n)
         ],
-        labels=['recursive', 'memoized', 'bottom_up', 'bottom_up_minified'],
+        labels=['recursive', 'memoized', 'lru_memoized', 'bottom_up',
+                'bottom_up_minified'],
         xlabel="n'th Fibonacci number",
         title='Calculating the n\'th Fibonacci number',
         n_range=range(1, SAMPLE_SIZE),
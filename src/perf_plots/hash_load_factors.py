@@ -0,0 +1,64 @@
+from random import sample
+from time import perf_counter
+
+from pandas import DataFrame
+
+from src.implementations.symbol_tables import config
+from src.implementations.symbol_tables.hash_map_w_chaining import HashMap
+from src.implementations.symbol_tables.hash_set_w_probing import HashSet
+from src.perf_plots.config import SAMPLE_SIZES
+
+SAMPLE_SIZE = SAMPLE_SIZES['HASH_LOAD_FACTORS']
+MAX_LOAD_FACTORS = {
+    HashMap: (config.chaining, [0.5, 1, 2, 4]),
+    HashSet: (config.probing, [0.5, 0.6, 0.7, 0.8, 0.9]),
+}
+
+
+def key_sets(n: int) -> dict:
+    # Keys i * 2^20 all share the bucket of every power-of-two table size
+    # up to 2^20, since Python hashes ints to themselves
+    return {'random': sample(range(2 ** 60), n),
+            'sequential': list(range(n)),
+            'adversarial': [i * 2 ** 20 for i in range(n)]}
+
+
+def profile(table_class, keys: list) -> dict:
+    # Inserts keys, then looks each of them up once, timing both phases
+    table = table_class(2, stats=True)
+    insert = table.put if table_class is HashSet else \
+        (lambda key: table.put(key, key))
+    lookup = table.contains if table_class is HashSet else table.get
+    start = perf_counter()
+    for key in keys:
+        insert(key)
+    middle = perf_counter()
+    for key in keys:
+        lookup(key)
+    end = perf_counter()
+    stats = table.get_stats()
+    return {
+        'put us': (middle - start) / len(keys) * 1e6,
+        'lookup us': (end - middle) / len(keys) * 1e6,
+        'mean probe': stats['mean_probe_length'],
+        'p99 probe': stats['p99_probe_length'],
+        'resizes': stats['resizes'],
+        'resize ms': stats['resize_seconds'] * 1e3,
+        'final load factor': stats['load_factor'],
+    }
+
+
+if __name__ == '__main__':
+    rows = {}
+    for key_set, keys in key_sets(SAMPLE_SIZE).items():
+        for table_class, (settings, load_factors) in MAX_LOAD_FACTORS.items():
+            default = settings['LOAD_FACTOR_MAX']
+            for load_factor in load_factors:
+                settings['LOAD_FACTOR_MAX'] = load_factor
+                rows[key_set, table_class.__name__, load_factor] = \
+                    profile(table_class, keys)
+            settings['LOAD_FACTOR_MAX'] = default
+    results = DataFrame(rows).T
+    results.index.names = ['keys', 'table', 'LOAD_FACTOR_MAX']
+    print(f'Profile of {SAMPLE_SIZE} puts and lookups:\n'
+          f'{results.round(3).to_string()}')
@@ -0,0 +1,53 @@
+import gc
+from time import perf_counter
+
+from pandas import DataFrame
+
+from src.implementations.symbol_tables.hash_map_w_chaining import HashMap
+from src.implementations.symbol_tables.hash_set_w_probing import HashSet
+from src.perf_plots.config import SAMPLE_SIZES
+
+SAMPLE_SIZE = SAMPLE_SIZES['HASH_RESIZE_LATENCY']
+
+
+def put_latencies(table, keys) -> (list, list):
+    # Times every single put, so that resize pauses show up in the tail.
+    # Returns the sorted latencies of all puts and of the resizing puts.
+    # Like timeit, disables the garbage collector while timing, as its
+    # full collections would otherwise dominate the tail
+    latencies, resize_latencies = [], []
+    gc.disable()
+    try:
+        for key in keys:
+            size = table.size
+            start = perf_counter()
+            if isinstance(table, HashMap):
+                table.put(key, key)
+            else:
+                table.put(key)
+            latency = perf_counter() - start
+            latencies.append(latency)
+            if table.size != size:
+                resize_latencies.append(latency)
+    finally:
+        gc.enable()
+    return sorted(latencies), sorted(resize_latencies)
+
+
+def percentiles_us(latencies: list, resize_latencies: list) -> dict:
+    n = len(latencies)
+    return {'p50': latencies[n // 2] * 1e6,
+            'p99': latencies[int(n * 0.99)] * 1e6,
+            'max': latencies[-1] * 1e6,
+            'max_resize': resize_latencies[-1] * 1e6}
+
+
+if __name__ == '__main__':
+    keys = list(range(SAMPLE_SIZE))
+    latencies = DataFrame({
+        f'{table_class.__name__}(incremental={incremental})':
+            percentiles_us(*put_latencies(
+                table_class(1, incremental=incremental), keys))
+        for table_class in [HashMap, HashSet]
+        for incremental in [False, True]}).T
+    print(f'Put latency in us for {SAMPLE_SIZE} puts:\n{latencies}')
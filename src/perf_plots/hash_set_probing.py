@@ -0,0 +1,66 @@
+from random import sample
+from time import perf_counter
+
+from pandas import DataFrame
+
+from src.implementations.symbol_tables import config
+from src.implementations.symbol_tables.hash_set_swiss import SwissHashSet
+from src.implementations.symbol_tables.hash_set_w_probing import HashSet
+from src.perf_plots.config import SAMPLE_SIZES
+
+SAMPLE_SIZE = SAMPLE_SIZES['HASH_SET_PROBING']
+LOAD_FACTORS = [0.5, 0.6, 0.7, 0.8, 0.9]
+
+
+class Key:
+    """Key with a Python-level __eq__, i.e. an expensive comparison"""
+    __slots__ = ['value']
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def ns_per_lookup(hash_set, keys: list) -> float:
+    start = perf_counter()
+    for key in keys:
+        hash_set.contains(key)
+    return (perf_counter() - start) / len(keys) * 1e9
+
+
+def lookup_times(hash_set_class, load_factor: float) -> dict:
+    # Fills a set of SAMPLE_SIZE slots up to load_factor, then looks up
+    # every inserted key (hits) and as many absent keys (misses)
+    n = int(SAMPLE_SIZE * load_factor)
+    hash_set = hash_set_class(SAMPLE_SIZE)
+    values = sample(range(2 ** 60), 2 * n)  # Sequential ints would cluster
+    hits = [Key(value) for value in values[:n]]
+    misses = [Key(value) for value in values[n:]]
+    for key in hits:
+        hash_set.put(key)
+    assert hash_set.size == SAMPLE_SIZE
+    return {'hit': ns_per_lookup(hash_set, hits),
+            'miss': ns_per_lookup(hash_set, misses)}
+
+
+if __name__ == '__main__':
+    # Upsizing is disabled so that every load factor can be measured
+    config.probing['LOAD_FACTOR_MAX'] = config.swiss['LOAD_FACTOR_MAX'] = 1
+    hash_set_classes = [HashSet, SwissHashSet]
+    results = {(hash_set_class, load_factor):
+               lookup_times(hash_set_class, load_factor)
+               for hash_set_class in hash_set_classes
+               for load_factor in LOAD_FACTORS}
+    times = DataFrame({
+        (hash_set_class.__name__, lookup): {
+            load_factor: results[hash_set_class, load_factor][lookup]
+            for load_factor in LOAD_FACTORS}
+        for hash_set_class in hash_set_classes
+        for lookup in ['hit', 'miss']})
+    times.index.name = 'load factor'
+    print(f'ns per lookup in a set of {SAMPLE_SIZE} slots:\n{times}')
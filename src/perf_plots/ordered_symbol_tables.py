@@ -0,0 +1,49 @@
+from random import randrange, sample
+from time import perf_counter
+
+from pandas import DataFrame
+
+from src.implementations.symbol_tables.b_plus_tree import BPlusTree
+from src.implementations.symbol_tables.red_black_bst import RedBlackTree
+from src.perf_plots.config import SAMPLE_SIZES
+
+SAMPLE_SIZE = SAMPLE_SIZES['ORDERED_SYMBOL_TABLES']
+LOOKUPS = 100000
+SCANS = 1000
+SCAN_LENGTH = 1000
+
+
+def seconds(function, *args) -> float:
+    start = perf_counter()
+    function(*args)
+    return perf_counter() - start
+
+
+def lookups(tree, keys: list):
+    get = tree.get
+    for key in keys:
+        get(key)
+
+
+def range_scans(tree, starts: list):
+    # Consumes SCAN_LENGTH consecutive keys from every start
+    for lo in starts:
+        for _ in tree.range_iter(lo, lo + SCAN_LENGTH - 1):
+            pass
+
+
+def benchmark(tree) -> dict:
+    keys = [randrange(SAMPLE_SIZE) for _ in range(LOOKUPS)]
+    starts = [randrange(SAMPLE_SIZE - SCAN_LENGTH) for _ in range(SCANS)]
+    return {f'{LOOKUPS} lookups': seconds(lookups, tree, keys),
+            f'{SCANS} range scans of {SCAN_LENGTH} keys':
+                seconds(range_scans, tree, starts)}
+
+
+if __name__ == '__main__':
+    items = [(key, key) for key in sample(range(SAMPLE_SIZE), SAMPLE_SIZE)]
+    trees = {'RedBlackTree': RedBlackTree.from_items(items)}
+    for fan_out in [16, 64, 256]:
+        trees[f'BPlusTree({fan_out})'] = BPlusTree.from_items(items, fan_out)
+    times = DataFrame({name: benchmark(tree) for name, tree in trees.items()})
+    print(f'Seconds on {SAMPLE_SIZE} keys:\n{times.T}')
@@ -3,34 +3,65 @@ from random import randint
 import perfplot
 
 from src.implementations.priority_queue.binary_heap import BinaryHeap
+from src.implementations.priority_queue.d_ary_heap import DAryHeap
 from src.perf_plots.config import SAMPLE_SIZES
 
 SAMPLE_SIZE = SAMPLE_SIZES['PRIORITY_QUEUE']
+ARITIES = [2, 4, 8]
 
 
 def get_n_random_items(n):
     return [randint(0, n) for _ in range(n)]
 
 
-def insert_n_items_into_binary_heap(n_items):
+def insert_n_items_into_binary_heap(n_items) -> BinaryHeap:
     PQ = BinaryHeap()
     for item in n_items:
         PQ.insert(item)
+    return PQ
+
+
+def insert_n_items_into_d_ary_heap(n_items, arity) -> DAryHeap:
+    PQ = DAryHeap(arity=arity)
+    for item in n_items:
+        PQ.insert(item)
+    return PQ
+
+
+def drain(PQ: BinaryHeap):
+    # Pops every item, i.e. sinks n times (where higher arities cost more)
+    while not PQ.is_empty():
+        PQ.pop()
 
 
 if __name__ == '__main__':
-    output = perfplot.bench(
-        setup=lambda n: get_n_random_items(n),
-        kernels=[
-            lambda n_items: insert_n_items_into_binary_heap(n_items)
-        ],
-        labels=['Binary heap'],
-        xlabel="Inserting n items into a priority queue",
-        title='Priority Queue',
-        n_range=range(1, SAMPLE_SIZE + 1),
-        equality_check=None
-    )
-
-    output.save(f'output/priority-queue_sample-size-{SAMPLE_SIZE}.png',
-                transparent=False,
-                bbox_inches="tight")
+    labels = ['Binary heap'] + [f'{arity}-ary heap' for arity in ARITIES]
+    benchmarks = {
+        'priority-queue': (
+            'Inserting n items into a priority queue',
+            [lambda n_items: insert_n_items_into_binary_heap(n_items)] + [
+                lambda n_items, arity=arity:
+                    insert_n_items_into_d_ary_heap(n_items, arity)
+                for arity in ARITIES]),
+        'priority-queue-drain': (
+            'Inserting n items into a priority queue, then popping all',
+            [lambda n_items: drain(insert_n_items_into_binary_heap(n_items))]
+            + [lambda n_items, arity=arity:
+                    drain(insert_n_items_into_d_ary_heap(n_items, arity))
+               for arity in ARITIES]),
+    }
+    for name, (xlabel, kernels) in benchmarks.items():
+        output = perfplot.bench(
+            setup=lambda n: get_n_random_items(n),
+            kernels=kernels,
+            labels=labels,
+            xlabel=xlabel,
+            title='Priority Queue',
+            n_range=[10 ** exponent
+                     for exponent in range(5, SAMPLE_SIZE + 1)],
+            equality_check=None
+        )
+
+        output.save(f'output/{name}_sample-size-1e{SAMPLE_SIZE}.png',
+                    transparent=False,
+                    bbox_inches="tight")
@@ -0,0 +1,48 @@
+from random import random, randrange
+from time import perf_counter
+
+from pandas import DataFrame
+
+from src.implementations.symbol_tables.binary_search_tree import \
+    BinarySearchTree
+from src.implementations.symbol_tables.red_black_bst import RedBlackTree
+from src.perf_plots.config import SAMPLE_SIZES
+
+SAMPLE_SIZE = SAMPLE_SIZES['RED_BLACK_CHURN']
+LIVE_KEYS = 10000
+
+
+def tree_stats(node) -> (int, int):
+    # Returns (number of nodes, height) of the subtree below node
+    if node is None:
+        return 0, 0
+    left_nodes, left_height = tree_stats(node.left)
+    right_nodes, right_height = tree_stats(node.right)
+    return (left_nodes + right_nodes + 1,
+            max(left_height, right_height) + 1)
+
+
+def churn(tree, operations: int) -> dict:
+    # Replaces a random live key with a new random key per operation, so
+    # that the live set stays at LIVE_KEYS keys throughout
+    live = [random() for _ in range(LIVE_KEYS)]
+    for key in live:
+        tree.put(key, key)
+    start = perf_counter()
+    for _ in range(operations):
+        i = randrange(LIVE_KEYS)
+        tree.delete(live[i])
+        live[i] = random()
+        tree.put(live[i], live[i])
+    seconds = perf_counter() - start
+    nodes, height = tree_stats(tree.root)
+    assert nodes == LIVE_KEYS
+    return {'ops/s': 2 * operations / seconds, 'nodes': nodes,
+            'height': height}
+
+
+if __name__ == '__main__':
+    results = DataFrame({tree_class.__name__: churn(tree_class(), SAMPLE_SIZE)
+                         for tree_class in [BinarySearchTree, RedBlackTree]})
+    print(f'{SAMPLE_SIZE} delete+put pairs on {LIVE_KEYS} live keys:\n'
+          f'{results}')
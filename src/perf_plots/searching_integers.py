@@ -4,8 +4,12 @@ import perfplot
 
 from src.implementations.symbol_tables.binary_search_tree import \
     BinarySearchTree
+from src.implementations.symbol_tables.hash_map_robin_hood import \
+    RobinHoodHashMap
 from src.implementations.symbol_tables.hash_map_w_chaining import \
     HashMap
+from src.implementations.symbol_tables.hash_set_swiss import \
+    SwissHashSet
 from src.implementations.symbol_tables.hash_set_w_probing import \
     HashSet
 from src.implementations.symbol_tables.red_black_bst import \
@@ -17,20 +21,23 @@ SAMPLE_SIZE = SAMPLE_SIZES['SEARCHING_INTEGERS']
 
 def get_symbol_tables(n: int) -> {}:
     random_integer_sample = sample(range(n + 1), n + 1)
-    HM_CHAINING = HashMap(2)
-    HS_PROBING = HashSet(2)
-    BST = BinarySearchTree()
-    RBT = RedBlackTree()
+    items = [(i, i) for i in random_integer_sample]
+    HM_CHAINING = HashMap.from_items(items)
+    HS_PROBING = HashSet.from_items(random_integer_sample)
+    HM_ROBIN_HOOD = RobinHoodHashMap(2)
+    HS_SWISS = SwissHashSet()
+    BST = BinarySearchTree.from_items(items)
+    RBT = RedBlackTree.from_items(items)
 
     for i in random_integer_sample:
-        HM_CHAINING.put(i, i)
-        HS_PROBING.put(i)
-        BST.put(i, i)
-        RBT.put(i, i)
+        HM_ROBIN_HOOD.put(i, i)
+        HS_SWISS.put(i)
 
     return {
         'HM_CHAINING': HM_CHAINING,
         'HS_PROBING': HS_PROBING,
+        'HM_ROBIN_HOOD': HM_ROBIN_HOOD,
+        'HS_SWISS': HS_SWISS,
         'BST': BST,
         'RBT': RBT,
     }
@@ -51,6 +58,10 @@ if __name__ == '__main__':
                 ST['HM_CHAINING'], 1),
             lambda ST: search_for_integer_in_symbol_table(
                 ST['HS_PROBING'], 1),
+            lambda ST: search_for_integer_in_symbol_table(
+                ST['HM_ROBIN_HOOD'], 1),
+            lambda ST: search_for_integer_in_symbol_table(
+                ST['HS_SWISS'], 1),
             lambda ST: search_for_integer_in_symbol_table(
                 ST['BST'], 1),
             lambda ST: search_for_integer_in_symbol_table(
@@ -59,6 +70,8 @@ if __name__ == '__main__':
         labels=[
             'HashMap with separate chaining',
             'HashSet with linear probing',
+            'HashMap with Robin Hood probing',
+            'HashSet with Swiss table control bytes',
             'Binary Search Tree',
             'Red-Black Tree'
         ],
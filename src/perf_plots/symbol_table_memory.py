@@ -0,0 +1,33 @@
+import tracemalloc
+
+from pandas import DataFrame
+
+from src.implementations.symbol_tables.b_plus_tree import BPlusTree
+from src.implementations.symbol_tables.binary_search_tree import \
+    BinarySearchTree
+from src.implementations.symbol_tables.red_black_bst import RedBlackTree
+from src.perf_plots.config import SAMPLE_SIZES
+
+SAMPLE_SIZE = SAMPLE_SIZES['SYMBOL_TABLE_MEMORY']
+
+
+def bytes_per_key(tree_class, n: int) -> float:
+    # Keys and values are allocated up front, so only the memory
+    # allocated by the tree's own nodes is measured
+    items = [(key, key) for key in range(n)]
+    tracemalloc.start()
+    tree = tree_class.from_items(items)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert tree.get(n - 1) == n - 1
+    return allocated / n
+
+
+if __name__ == '__main__':
+    sizes = [10 ** exponent for exponent in range(3, SAMPLE_SIZE + 1)]
+    memory = DataFrame(
+        {tree_class.__name__: {n: bytes_per_key(tree_class, n)
+                               for n in sizes}
+         for tree_class in [BinarySearchTree, RedBlackTree, BPlusTree]})
+    memory.index.name = 'keys'
+    print(f'Bytes per key (excluding keys and values):\n{memory}')